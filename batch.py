@@ -0,0 +1,354 @@
+"""
+Batch entry point that researches many topics concurrently on one compiled graph.
+
+The input is a JSONL file with one object per line:
+
+    {"topic": "...", "max_analysts": 3, "max_interview_turns": 2, "feedback": ["Add in the CEO of gen ai native startup"]}
+
+Only ``topic`` is required. ``feedback`` may be a string or a list of
+strings; each entry is applied as human feedback (regenerating the
+analysts) before the analysts are approved. Every run gets its own
+thread ID derived from the job, so re-running a batch after a crash
+resumes unfinished topics from their checkpoints. Each report is saved
+as soon as its run finishes.
+
+With ``--batch-api`` the LLM calls go through a batch API instead of
+individual requests. All topics advance in lockstep: the pending calls of
+every paused task, across all topics, are submitted as one batch. The
+graphs stay checkpointed while the batch runs and resume once its results
+arrive. ``--batch-api local`` uses a local stand-in endpoint for testing.
+
+Usage:
+    python batch.py topics.jsonl --workers 4
+    RESEARCH_CHECKPOINTER=sqlite python batch.py topics.jsonl --batch-api openai
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+from langgraph.types import Command
+
+from config import settings
+from graphs.analyst.analyst_graph import main_builder_graph
+from utils.batch_api import BATCH_REQUESTS, BatchError, LocalBatchEndpoint, OpenAIBatchClient
+from utils.concurrency import set_concurrency_limit
+from utils.file_utils import save_report, save_trace, slugify
+from utils.tracing import RunTracer
+from utils.checkpointing import run_thread_id, is_resumable, adiscard_thread, aprune_thread
+
+
+BATCH_STATE_FILE = "batch_state.json"
+
+
+def load_jobs(path: str) -> List[dict]:
+    """Read and validate topic jobs from a JSONL file."""
+    jobs = []
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            job = json.loads(line)
+            if not job.get("topic"):
+                raise ValueError(f"{path}:{line_number}: missing 'topic'")
+            feedback = job.get("feedback") or []
+            job["feedback"] = [feedback] if isinstance(feedback, str) else list(feedback)
+            jobs.append(job)
+    return jobs
+
+
+def _job_inputs(job: dict) -> Tuple[dict, str]:
+    """Return the graph inputs of a job and its thread ID."""
+    inputs = {
+        "topic": job["topic"],
+        "max_analysts": job.get("max_analysts", settings.max_analysts),
+        "max_interview_turns": job.get("max_interview_turns", settings.max_interview_turns),
+    }
+    thread_id = job.get("thread_id") or run_thread_id(
+        inputs["topic"], inputs["max_analysts"], inputs["max_interview_turns"], json.dumps(job["feedback"])
+    )
+    return inputs, thread_id
+
+
+async def _drain(graph_input, thread: dict) -> None:
+    async for _ in main_builder_graph.astream(graph_input, thread, stream_mode="updates"):
+        pass
+
+
+async def _save_outputs(job: dict, thread_id: str, thread: dict, output_dir: str, tracer: Optional[RunTracer]) -> Optional[str]:
+    """Save a finished run's report (and trace), then drop its checkpoints."""
+    final_state = await main_builder_graph.aget_state(thread)
+    name = f"{slugify(job['topic'])}_{thread_id[:8]}"
+    report_path = save_report(final_state.values.get("final_report"), output_dir, filename=f"final_report_{name}.md")
+    if tracer is not None:
+        save_trace(tracer, output_dir, filename=f"trace_{name}.json")
+    if report_path:
+        await aprune_thread(thread_id)
+    return report_path
+
+
+async def run_job(job: dict, output_dir: str) -> dict:
+    """Run one topic end to end on its own thread and save its report."""
+    inputs, thread_id = _job_inputs(job)
+    tracer = RunTracer() if settings.trace_enabled else None
+    thread = {"configurable": {"thread_id": thread_id}}
+    if tracer is not None:
+        thread["callbacks"] = [tracer]
+
+    start = time.perf_counter()
+    snapshot = await main_builder_graph.aget_state(thread)
+    if not is_resumable(snapshot):
+        if snapshot.values:
+            # A finished run that was not pruned, or one stopped before approval: start over
+            await adiscard_thread(thread_id)
+        # Run until the human_feedback interrupt, then replay the scripted feedback
+        async for _ in main_builder_graph.astream(inputs, thread, stream_mode="updates"):
+            pass
+        for feedback in job["feedback"]:
+            await main_builder_graph.aupdate_state(thread, {"human_analyst_feedback": feedback}, as_node="human_feedback")
+            async for _ in main_builder_graph.astream(None, thread, stream_mode="updates"):
+                pass
+
+        # Approve the analysts
+        await main_builder_graph.aupdate_state(thread, {"human_analyst_feedback": None}, as_node="human_feedback")
+
+    # Run (or resume) the interviews and report
+    async for _ in main_builder_graph.astream(None, thread, stream_mode="updates"):
+        pass
+
+    report_path = await _save_outputs(job, thread_id, thread, output_dir, tracer)
+    result = {
+        "topic": job["topic"],
+        "thread_id": thread_id,
+        "report": report_path,
+        "elapsed_s": time.perf_counter() - start,
+    }
+    if report_path is None:
+        result["error"] = "run finished without a report"
+    return result
+
+
+async def run_batch(jobs: List[dict], workers: int, output_dir: str) -> List[dict]:
+    """Run ``jobs`` with at most ``workers`` topics in flight; failures are reported, not raised."""
+    semaphore = asyncio.Semaphore(workers)
+
+    async def worker(job: dict) -> dict:
+        async with semaphore:
+            try:
+                result = await run_job(job, output_dir)
+                if "error" in result:
+                    print(f"Failed '{job['topic']}': {result['error']}")
+                else:
+                    print(f"Finished '{job['topic']}' in {result['elapsed_s']:.1f}s")
+                return result
+            except Exception as e:
+                print(f"Failed '{job['topic']}': {e!r}")
+                return {"topic": job["topic"], "error": repr(e)}
+
+    return await asyncio.gather(*(worker(job) for job in jobs))
+
+
+def _custom_id(thread_id: str, interrupt_id: str, index: int) -> str:
+    return f"{thread_id}/{interrupt_id}/{index}"
+
+
+def _batch_requests(thread_id: str, snapshot) -> Dict[str, dict]:
+    """Collect the LLM requests a paused thread is waiting on, by batch custom ID."""
+    requests = {}
+    for pending in snapshot.interrupts:
+        if isinstance(pending.value, dict) and BATCH_REQUESTS in pending.value:
+            for index, body in enumerate(pending.value[BATCH_REQUESTS]):
+                requests[_custom_id(thread_id, pending.id, index)] = body
+    return requests
+
+
+def _load_batch_state(path: str) -> dict:
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    return {"batch_id": None, "requests": [], "feedback": {}}
+
+
+def _save_batch_state(path: str, state: dict) -> None:
+    partial = f"{path}.part"
+    with open(partial, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+    os.replace(partial, path)
+
+
+class BatchJob:
+    """One topic of a batch-API run, advanced between batch rounds."""
+
+    def __init__(self, job: dict, state: dict, state_path: str):
+        self.job = job
+        self.inputs, self.thread_id = _job_inputs(job)
+        self.thread = {"configurable": {"thread_id": self.thread_id}}
+        self._state = state
+        self._state_path = state_path
+        self.start = time.perf_counter()
+
+    async def _answer_feedback(self) -> None:
+        """Apply the next scripted feedback, or approve the analysts once all of it is applied."""
+        applied = self._state["feedback"].get(self.thread_id, 0)
+        feedback = self.job["feedback"][applied] if applied < len(self.job["feedback"]) else None
+        await main_builder_graph.aupdate_state(self.thread, {"human_analyst_feedback": feedback}, as_node="human_feedback")
+        if feedback is not None:
+            self._state["feedback"][self.thread_id] = applied + 1
+            _save_batch_state(self._state_path, self._state)
+
+    def finish(self) -> None:
+        """Forget the topic's feedback count, so a rerun on the same thread ID applies its feedback again."""
+        if self._state["feedback"].pop(self.thread_id, None) is not None:
+            _save_batch_state(self._state_path, self._state)
+
+    async def discard_finished(self) -> None:
+        """Drop the thread of an earlier finished run that was not pruned, so the topic starts over."""
+        snapshot = await main_builder_graph.aget_state(self.thread)
+        if snapshot.values and not snapshot.next:
+            await adiscard_thread(self.thread_id)
+            self.finish()
+
+    async def advance(self) -> Dict[str, dict]:
+        """Run until the topic waits on LLM responses (returned as requests) or finishes (empty)."""
+        snapshot = await main_builder_graph.aget_state(self.thread)
+        if not snapshot.values:
+            await _drain(self.inputs, self.thread)
+            snapshot = await main_builder_graph.aget_state(self.thread)
+        while snapshot.next:
+            requests = _batch_requests(self.thread_id, snapshot)
+            if requests:
+                return requests
+            if "human_feedback" in snapshot.next:
+                await self._answer_feedback()
+            await _drain(None, self.thread)
+            snapshot = await main_builder_graph.aget_state(self.thread)
+        return {}
+
+    async def resume(self, responses: Dict[str, dict]) -> bool:
+        """Resume every paused task whose requests all have responses; returns whether any did."""
+        snapshot = await main_builder_graph.aget_state(self.thread)
+        resume = {}
+        for pending in snapshot.interrupts:
+            ids = [_custom_id(self.thread_id, pending.id, i) for i in range(len(pending.value[BATCH_REQUESTS]))]
+            if all(custom_id in responses for custom_id in ids):
+                resume[pending.id] = [responses[custom_id] for custom_id in ids]
+        if resume:
+            await _drain(Command(resume=resume), self.thread)
+        return bool(resume)
+
+
+async def _wait_for_batch(client, batch_id: str, poll_seconds: float) -> Dict[str, dict]:
+    while True:
+        responses = await asyncio.to_thread(client.results, batch_id)
+        if responses is not None:
+            return responses
+        await asyncio.sleep(poll_seconds)
+
+
+async def run_batch_api(jobs: List[dict], output_dir: str, client, poll_seconds: float) -> List[dict]:
+    """
+    Research ``jobs`` with every LLM call going through ``client``'s batch API.
+
+    Each round advances all topics until they wait on LLM responses,
+    submits the requests of all of them as one batch, waits for it and
+    resumes the topics. The batch in flight is recorded in
+    ``RESEARCH_BATCH_DIR``, so a restarted run (with a durable
+    checkpointer) waits for that batch rather than submitting a new one.
+    """
+    os.makedirs(settings.batch_dir, exist_ok=True)
+    state_path = os.path.join(settings.batch_dir, BATCH_STATE_FILE)
+    state = _load_batch_state(state_path)
+    active = [BatchJob(job, state, state_path) for job in jobs]
+    await asyncio.gather(*(batch_job.discard_finished() for batch_job in active))
+    results = []
+
+    def fail(batch_job: BatchJob, error: BaseException) -> None:
+        batch_job.finish()
+        print(f"Failed '{batch_job.job['topic']}': {error!r}")
+        results.append({"topic": batch_job.job["topic"], "thread_id": batch_job.thread_id, "error": repr(error)})
+
+    while active:
+        outcomes = await asyncio.gather(*(batch_job.advance() for batch_job in active), return_exceptions=True)
+        requests, waiting = {}, []
+        for batch_job, outcome in zip(active, outcomes):
+            if isinstance(outcome, BaseException):
+                fail(batch_job, outcome)
+            elif outcome:
+                requests.update(outcome)
+                waiting.append(batch_job)
+            else:
+                report_path = await _save_outputs(batch_job.job, batch_job.thread_id, batch_job.thread, output_dir, None)
+                if report_path is None:
+                    fail(batch_job, BatchError("run finished without a report"))
+                    continue
+                batch_job.finish()
+                elapsed = time.perf_counter() - batch_job.start
+                print(f"Finished '{batch_job.job['topic']}' in {elapsed:.1f}s")
+                results.append({"topic": batch_job.job["topic"], "thread_id": batch_job.thread_id,
+                                "report": report_path, "elapsed_s": elapsed})
+        active = waiting
+        if not active:
+            break
+
+        if state["batch_id"] and sorted(requests) == state["requests"]:
+            print(f"Waiting for batch {state['batch_id']} submitted by an earlier run")
+        else:
+            state["batch_id"] = await asyncio.to_thread(client.submit, requests)
+            state["requests"] = sorted(requests)
+            _save_batch_state(state_path, state)
+            print(f"Submitted batch {state['batch_id']}: {len(requests)} requests from {len(active)} topics")
+        responses = await _wait_for_batch(client, state["batch_id"], poll_seconds)
+        state["batch_id"], state["requests"] = None, []
+        _save_batch_state(state_path, state)
+
+        resumed = await asyncio.gather(*(batch_job.resume(responses) for batch_job in active), return_exceptions=True)
+        progressed, waiting = False, []
+        for batch_job, outcome in zip(active, resumed):
+            if isinstance(outcome, BaseException):
+                fail(batch_job, outcome)
+            else:
+                progressed = progressed or outcome
+                waiting.append(batch_job)
+        active = waiting
+        if active and not progressed:
+            raise BatchError("the batch returned no usable responses")
+
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> List[dict]:
+    """Parse arguments and run the batch."""
+    parser = argparse.ArgumentParser(description="Research every topic in a JSONL file concurrently.")
+    parser.add_argument("path", help="JSONL file of topics")
+    parser.add_argument("--workers", type=int, default=4, help="Topics run concurrently")
+    parser.add_argument("--max-concurrency", type=int, default=settings.max_concurrency,
+                        help="In-flight LLM and search calls across all topics")
+    parser.add_argument("--output-dir", default=settings.output_directory, help="Where reports are written")
+    parser.add_argument("--batch-api", choices=["openai", "local"], default=None,
+                        help="Send LLM calls through the OpenAI Batch API or the local stand-in endpoint")
+    parser.add_argument("--poll-seconds", type=float, default=settings.batch_poll_seconds,
+                        help="How often to check a submitted batch")
+    args = parser.parse_args(argv)
+
+    set_concurrency_limit(args.max_concurrency)
+    jobs = load_jobs(args.path)
+    start = time.perf_counter()
+    if args.batch_api:
+        if settings.interview_workers:
+            parser.error("--batch-api needs in-process interviews; unset RESEARCH_INTERVIEW_WORKERS")
+        settings.batch_llm = True
+        client = OpenAIBatchClient() if args.batch_api == "openai" else LocalBatchEndpoint(os.path.join(settings.batch_dir, "local"))
+        results = asyncio.run(run_batch_api(jobs, args.output_dir, client, args.poll_seconds))
+    else:
+        results = asyncio.run(run_batch(jobs, args.workers, args.output_dir))
+
+    failed = [result for result in results if "error" in result]
+    print(f"Batch complete: {len(results) - len(failed)}/{len(results)} topics in {time.perf_counter() - start:.1f}s")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+"""Deterministic offline stand-ins for the LLM and search backends."""
+import asyncio
+import contextlib
+import hashlib
+import json
+import random
+import time
+import typing
+from dataclasses import dataclass
+from typing import Any, Iterator, List, Optional
+
+from langchain_core.documents import Document
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from pydantic import BaseModel
+
+_WORDS = (
+    "agent graph state node edge memory tool retrieval planning latency throughput "
+    "workflow checkpoint model prompt context citation research analyst interview "
+    "framework orchestration parallel reducer stream evaluation deployment"
+).split()
+
+
+@dataclass(frozen=True)
+class Distribution:
+    """Lognormal distribution described by its median and spread (``sigma`` of the log)."""
+    median: float
+    sigma: float = 0.0
+
+    def sample(self, rng: random.Random) -> float:
+        if self.median <= 0:
+            return 0.0
+        if not self.sigma:
+            return self.median
+        return rng.lognormvariate(0.0, self.sigma) * self.median
+
+
+def _rng(*parts: Any) -> random.Random:
+    """Return a random generator seeded from ``parts`` so identical requests get identical output."""
+    digest = hashlib.sha256("\x00".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+    return random.Random(int(digest[:16], 16))
+
+
+def _text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(max(1, words)))
+
+
+def _fake_value(annotation: Any, rng: random.Random, name: str, list_items: Optional[int]) -> Any:
+    """Build a plausible value for a pydantic field annotation."""
+    origin = typing.get_origin(annotation)
+    if origin in (list, List):
+        (inner,) = typing.get_args(annotation) or (str,)
+        count = list_items if list_items is not None else rng.randint(2, 4)
+        return [_fake_value(inner, rng, name, list_items) for _ in range(count)]
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return fake_structured_args(annotation, rng, list_items)
+    if annotation is int:
+        return rng.randint(0, 10)
+    if annotation is bool:
+        return rng.random() < 0.5
+    return f"{name} {_text(rng, 4)}"
+
+
+def fake_structured_args(schema: type, rng: random.Random, list_items: Optional[int] = None) -> dict:
+    """Return arguments that validate against the pydantic ``schema``."""
+    return {
+        name: _fake_value(field.annotation, rng, name, list_items)
+        for name, field in schema.model_fields.items()
+    }
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    Chat model that answers locally after a simulated network delay.
+
+    Responses are derived from a hash of the prompt, so runs are
+    reproducible. Structured output works through ``bind_tools`` like the
+    real OpenAI model, so ``with_structured_output`` is exercised end to end.
+    """
+
+    model_name: str = "fake-gpt-4o"
+    latency: Distribution = Distribution(0.0)
+    completion_words: Distribution = Distribution(300, 0.3)
+    # Length of list fields in structured output (e.g. analysts); random 2-4 when None
+    list_items: Optional[int] = None
+    seed: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    def bind_tools(self, tools: list, **kwargs: Any):
+        kwargs.pop("tool_choice", None)
+        kwargs.pop("parallel_tool_calls", None)
+        return self.bind(tools=[convert_to_openai_tool(tool) for tool in tools], schemas=list(tools), **kwargs)
+
+    def _respond(self, messages: List[BaseMessage], schemas: Optional[list] = None) -> tuple:
+        prompt = "\n".join(str(message.content) for message in messages)
+        rng = _rng(self.seed, prompt)
+        prompt_tokens = len(prompt) // 4
+        if schemas:
+            schema = schemas[0]
+            args = fake_structured_args(schema, rng, self.list_items)
+            message = AIMessage(
+                content="",
+                tool_calls=[{"name": schema.__name__, "args": args, "id": f"call_{rng.getrandbits(32):x}"}],
+            )
+            completion_tokens = len(str(args)) // 4
+        else:
+            words = int(self.completion_words.sample(rng))
+            body = _text(rng, words)
+            content = f"## {_text(rng, 5).title()}\n\n{body} [1]\n\n## Sources\n[1] https://example.com/{rng.getrandbits(24):x}"
+            message = AIMessage(content=content)
+            completion_tokens = len(content) // 4
+        message.usage_metadata = {
+            "input_tokens": prompt_tokens,
+            "output_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+        message.response_metadata = {"model_name": self.model_name}
+        return message, self.latency.sample(rng)
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Any = None, schemas: Optional[list] = None, **kwargs: Any) -> ChatResult:
+        message, delay = self._respond(messages, schemas)
+        time.sleep(delay)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager: Any = None, schemas: Optional[list] = None, **kwargs: Any) -> ChatResult:
+        message, delay = self._respond(messages, schemas)
+        await asyncio.sleep(delay)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+def _fake_json(schema: dict, defs: dict, rng: random.Random, name: str, list_items: Optional[int]) -> Any:
+    """Build a value matching a JSON schema, as produced by ``model_json_schema``."""
+    if "$ref" in schema:
+        schema = defs[schema["$ref"].rsplit("/", 1)[-1]]
+    if "anyOf" in schema:
+        schema = next(option for option in schema["anyOf"] if option.get("type") != "null")
+    kind = schema.get("type")
+    if kind == "object":
+        return {key: _fake_json(value, defs, rng, key, list_items) for key, value in schema.get("properties", {}).items()}
+    if kind == "array":
+        count = list_items if list_items is not None else rng.randint(2, 4)
+        return [_fake_json(schema.get("items", {}), defs, rng, name, list_items) for _ in range(count)]
+    if kind == "integer":
+        return rng.randint(0, 10)
+    if kind == "boolean":
+        return rng.random() < 0.5
+    return f"{name} {_text(rng, 4)}"
+
+
+def fake_completion(body: dict, completion_words: Distribution = Distribution(300, 0.3),
+                    list_items: Optional[int] = None, seed: int = 0) -> dict:
+    """
+    Answer a chat-completions request body offline, e.g. as the responder of ``LocalBatchEndpoint``.
+
+    Requests with a JSON-schema ``response_format`` get JSON content that
+    validates against the schema; others get text like ``FakeChatModel``.
+    """
+    from utils.batch_api import completion_body
+
+    prompt = "\n".join(str(message["content"]) for message in body["messages"])
+    rng = _rng(seed, prompt)
+    response_format = body.get("response_format")
+    if response_format:
+        schema = response_format["json_schema"]["schema"]
+        content = json.dumps(_fake_json(schema, schema.get("$defs", {}), rng, "value", list_items))
+    else:
+        body_text = _text(rng, int(completion_words.sample(rng)))
+        content = f"## {_text(rng, 5).title()}\n\n{body_text} [1]\n\n## Sources\n[1] https://example.com/{rng.getrandbits(24):x}"
+    return completion_body(body["model"], content, len(prompt) // 4, len(content) // 4)
+
+
+@dataclass
+class SearchProfile:
+    """Latency and payload-size distributions shared by the fake search backends."""
+    latency: Distribution = Distribution(0.0)
+    snippet_words: Distribution = Distribution(40, 0.3)
+    page_words: Distribution = Distribution(1500, 0.5)
+    web_results: int = 4
+    seed: int = 0
+
+
+# Active profile used by the fake search classes; replaced by ``offline_backends``
+search_profile = SearchProfile()
+
+
+class FakeDuckDuckGoSearchResults:
+    """Stand-in for ``DuckDuckGoSearchResults`` returning ``list`` formatted results."""
+
+    def __init__(self, **kwargs: Any):
+        self.kwargs = kwargs
+
+    def _results(self, query: str) -> tuple:
+        rng = _rng(search_profile.seed, "web", query)
+        results = [
+            {
+                "title": _text(rng, 6),
+                "link": f"https://web.example.com/{rng.getrandbits(32):x}",
+                "snippet": _text(rng, int(search_profile.snippet_words.sample(rng))),
+            }
+            for _ in range(search_profile.web_results)
+        ]
+        return results, search_profile.latency.sample(rng)
+
+    def invoke(self, query: str, *args: Any, **kwargs: Any) -> list:
+        results, delay = self._results(query)
+        time.sleep(delay)
+        return results
+
+    async def ainvoke(self, query: str, *args: Any, **kwargs: Any) -> list:
+        results, delay = self._results(query)
+        await asyncio.sleep(delay)
+        return results
+
+
+class FakeWikipediaLoader:
+    """Stand-in for ``WikipediaLoader`` returning ``load_max_docs`` synthetic pages."""
+
+    def __init__(self, query: str, load_max_docs: int = 2, **kwargs: Any):
+        self.query = query
+        self.load_max_docs = load_max_docs
+
+    def _docs(self) -> tuple:
+        rng = _rng(search_profile.seed, "wikipedia", self.query)
+        docs = []
+        for _ in range(self.load_max_docs):
+            title = _text(rng, 3).title()
+            paragraphs = [_text(rng, 80) for _ in range(max(1, int(search_profile.page_words.sample(rng)) // 80))]
+            docs.append(Document(
+                page_content="\n\n".join(paragraphs),
+                metadata={"title": title, "source": f"https://en.wikipedia.org/wiki/{title.replace(' ', '_')}"},
+            ))
+        return docs, search_profile.latency.sample(rng)
+
+    def load(self) -> list:
+        docs, delay = self._docs()
+        time.sleep(delay)
+        return docs
+
+    async def aload(self) -> list:
+        docs, delay = self._docs()
+        await asyncio.sleep(delay)
+        return docs
+
+
+@contextlib.contextmanager
+def offline_backends(llm: BaseChatModel, profile: SearchProfile,
+                     fast_llm: Optional[BaseChatModel] = None) -> Iterator[None]:
+    """
+    Swap the LLM and search backends used by the graph nodes for the fakes.
+
+    The nodes bind ``llm_for`` and the search classes at import time, so the
+    patch is applied to the node modules and restored on exit. Nodes routed
+    to a model other than the primary one get ``fast_llm`` when given.
+    """
+    global search_profile
+    import init_llm
+    from config import settings
+    from graphs.analyst import analyst_nodes
+    from graphs.interview import interview_nodes
+
+    def llm_for(node: str) -> BaseChatModel:
+        if settings.batch_llm:
+            # Batch mode never calls a model in the graph; pair it with LocalBatchEndpoint(respond=fake_completion)
+            return init_llm.BatchLLM(init_llm.model_for(node))
+        model = llm
+        if fast_llm is not None and init_llm.model_for(node) != settings.openai_model:
+            model = fast_llm
+        # Keep the rate scheduler in front of the fakes, as in init_llm.llm_for
+        if init_llm.scheduler.enabled:
+            return init_llm.ScheduledLLM(model, init_llm.node_priority(node))
+        return model
+
+    patches = [
+        (init_llm, "llm", llm),
+        (analyst_nodes, "llm_for", llm_for),
+        (interview_nodes, "llm_for", llm_for),
+        (interview_nodes, "DuckDuckGoSearchResults", FakeDuckDuckGoSearchResults),
+        (interview_nodes, "WikipediaLoader", FakeWikipediaLoader),
+    ]
+    originals = [(module, name, getattr(module, name)) for module, name, _ in patches]
+    previous_profile = search_profile
+    search_profile = profile
+    for module, name, value in patches:
+        setattr(module, name, value)
+    try:
+        yield
+    finally:
+        for module, name, value in originals:
+            setattr(module, name, value)
+        search_profile = previous_profile
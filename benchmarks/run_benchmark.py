@@ -0,0 +1,228 @@
+"""
+Offline end-to-end benchmark of the research workflow.
+
+Runs the real ``main_builder_graph`` against deterministic fake LLM and
+search backends with configurable latency and payload sizes, sweeping
+``max_analysts`` and ``max_interview_turns``. For every configuration it
+reports throughput, p50/p95 end-to-end latency and peak traced memory,
+and saves the results as JSON so runs can be compared over time.
+
+Usage:
+    python -m benchmarks.run_benchmark --analysts 1,3,5 --turns 1,2 --runs 3
+    python -m benchmarks.run_benchmark --mode async --parallel 4 --baseline benchmarks/results/<file>.json
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import subprocess
+import time
+import tracemalloc
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import List, Optional
+
+from config import settings
+from graphs.analyst.analyst_graph import main_builder_graph
+from utils.concurrency import set_concurrency_limit
+from utils.search_cache import search_cache
+from utils.tracing import RunTracer
+from utils.checkpointing import prune_thread, aprune_thread
+from benchmarks.fakes import Distribution, FakeChatModel, SearchProfile, offline_backends
+
+
+TOPIC = "The benefits of adopting LangGraph as an agent framework"
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of ``values``."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def run_once(max_analysts: int, turns: int, tracer: RunTracer, review_seconds: float = 0.0) -> float:
+    """
+    Run one topic through the graph (approving the analysts unchanged) and return its latency.
+
+    ``review_seconds`` simulates the time a human spends reviewing the analysts.
+    """
+    thread = {"configurable": {"thread_id": uuid.uuid4().hex}, "callbacks": [tracer]}
+    start = time.perf_counter()
+    for _ in main_builder_graph.stream({"topic": TOPIC, "max_analysts": max_analysts, "max_interview_turns": turns}, thread, stream_mode="updates"):
+        pass
+    time.sleep(review_seconds)
+    main_builder_graph.update_state(thread, {"human_analyst_feedback": None}, as_node="human_feedback")
+    for _ in main_builder_graph.stream(None, thread, stream_mode="updates"):
+        pass
+    if not main_builder_graph.get_state(thread).values.get("final_report"):
+        raise RuntimeError("Benchmark run finished without a final report")
+    prune_thread(thread["configurable"]["thread_id"])
+    return time.perf_counter() - start
+
+
+async def arun_once(max_analysts: int, turns: int, tracer: RunTracer, review_seconds: float = 0.0) -> float:
+    """Async version of ``run_once`` driving the graph with ``astream``."""
+    thread = {"configurable": {"thread_id": uuid.uuid4().hex}, "callbacks": [tracer]}
+    start = time.perf_counter()
+    async for _ in main_builder_graph.astream({"topic": TOPIC, "max_analysts": max_analysts, "max_interview_turns": turns}, thread, stream_mode="updates"):
+        pass
+    await asyncio.sleep(review_seconds)
+    await main_builder_graph.aupdate_state(thread, {"human_analyst_feedback": None}, as_node="human_feedback")
+    async for _ in main_builder_graph.astream(None, thread, stream_mode="updates"):
+        pass
+    if not (await main_builder_graph.aget_state(thread)).values.get("final_report"):
+        raise RuntimeError("Benchmark run finished without a final report")
+    await aprune_thread(thread["configurable"]["thread_id"])
+    return time.perf_counter() - start
+
+
+async def _arun_all(max_analysts: int, turns: int, runs: int, parallel: int, tracer: RunTracer,
+                    review_seconds: float = 0.0) -> List[float]:
+    semaphore = asyncio.Semaphore(parallel)
+
+    async def bounded() -> float:
+        async with semaphore:
+            return await arun_once(max_analysts, turns, tracer, review_seconds)
+
+    return await asyncio.gather(*(bounded() for _ in range(runs)))
+
+
+def bench_config(args: argparse.Namespace, max_analysts: int, turns: int) -> dict:
+    """Benchmark one (max_analysts, max_interview_turns) combination."""
+    llm = FakeChatModel(
+        latency=Distribution(args.llm_latency, args.llm_sigma),
+        completion_words=Distribution(args.completion_words, 0.3),
+        list_items=max_analysts,
+        seed=args.seed,
+    )
+    fast_llm = None
+    if args.fast_llm_latency is not None:
+        fast_llm = FakeChatModel(
+            model_name="fake-gpt-4o-mini",
+            latency=Distribution(args.fast_llm_latency, args.llm_sigma),
+            completion_words=Distribution(args.completion_words, 0.3),
+            list_items=max_analysts,
+            seed=args.seed,
+        )
+    profile = SearchProfile(
+        latency=Distribution(args.search_latency, args.search_sigma),
+        page_words=Distribution(args.page_words, 0.5),
+        seed=args.seed,
+    )
+    tracer = RunTracer()
+    search_cache.clear()
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    try:
+        with offline_backends(llm, profile, fast_llm):
+            start = time.perf_counter()
+            if args.mode == "async":
+                latencies = asyncio.run(_arun_all(max_analysts, turns, args.runs, args.parallel, tracer, args.review_seconds))
+            else:
+                with ThreadPoolExecutor(max_workers=args.parallel) as pool:
+                    latencies = list(pool.map(lambda _: run_once(max_analysts, turns, tracer, args.review_seconds), range(args.runs)))
+            wall = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    trace = tracer.to_dict()
+    totals = trace["totals"]
+    return {
+        "max_analysts": max_analysts,
+        "max_interview_turns": turns,
+        "runs": args.runs,
+        "throughput_runs_per_min": args.runs / wall * 60 if wall else 0.0,
+        "p50_s": percentile(latencies, 50),
+        "p95_s": percentile(latencies, 95),
+        "peak_memory_mb": peak / (1024 * 1024),
+        "llm_calls_per_run": totals["llm_calls"] / args.runs,
+        "prompt_tokens_per_run": totals["prompt_tokens"] / args.runs,
+        "turns_saved_per_run": trace["early_stops"]["turns_saved"] / args.runs,
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results: List[dict], baseline: Optional[dict] = None) -> None:
+    """Print a results table, with p50 change against ``baseline`` when given."""
+    previous = {}
+    if baseline:
+        previous = {(r["max_analysts"], r["max_interview_turns"]): r for r in baseline["results"]}
+    header = f"{'analysts':>8}{'turns':>6}{'runs/min':>10}{'p50 s':>9}{'p95 s':>9}{'peak MB':>9}{'llm/run':>9}{'Δp50':>9}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        before = previous.get((r["max_analysts"], r["max_interview_turns"]))
+        delta = f"{(r['p50_s'] / before['p50_s'] - 1) * 100:+.1f}%" if before and before["p50_s"] else ""
+        print(
+            f"{r['max_analysts']:>8}{r['max_interview_turns']:>6}{r['throughput_runs_per_min']:>10.1f}"
+            f"{r['p50_s']:>9.2f}{r['p95_s']:>9.2f}{r['peak_memory_mb']:>9.1f}{r['llm_calls_per_run']:>9.1f}{delta:>9}"
+        )
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--analysts", default="1,3,5", help="Comma-separated max_analysts values")
+    parser.add_argument("--turns", default="1,2", help="Comma-separated max_interview_turns values")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per configuration")
+    parser.add_argument("--parallel", type=int, default=1, help="Runs executed concurrently")
+    parser.add_argument("--mode", choices=["sync", "async"], default="sync", help="Drive the graph with stream or astream")
+    parser.add_argument("--max-concurrency", type=int, default=settings.max_concurrency, help="Async in-flight call limit")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="Median LLM latency in seconds")
+    parser.add_argument("--fast-llm-latency", type=float, help="Median latency of the model routed to planning/questioning (default: same as --llm-latency)")
+    parser.add_argument("--llm-sigma", type=float, default=0.4, help="Lognormal spread of LLM latency")
+    parser.add_argument("--search-latency", type=float, default=0.3, help="Median search latency in seconds")
+    parser.add_argument("--search-sigma", type=float, default=0.5, help="Lognormal spread of search latency")
+    parser.add_argument("--completion-words", type=int, default=300, help="Median words per LLM completion")
+    parser.add_argument("--page-words", type=int, default=1500, help="Median words per Wikipedia page")
+    parser.add_argument("--review-seconds", type=float, default=0.0, help="Simulated human review time at the analyst approval pause")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the fake backends")
+    parser.add_argument("--output-dir", default=os.path.join("benchmarks", "results"), help="Where results are saved")
+    parser.add_argument("--baseline", help="Earlier results file to compare against")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> dict:
+    """Run the parameter sweep, print the table and save the results."""
+    args = parse_args(argv)
+    set_concurrency_limit(args.max_concurrency)
+
+    results = []
+    for max_analysts in [int(value) for value in args.analysts.split(",")]:
+        for turns in [int(value) for value in args.turns.split(",")]:
+            results.append(bench_config(args, max_analysts, turns))
+
+    output = {
+        "created_at": datetime.now().isoformat(),
+        "git_commit": _git_commit(),
+        "params": {key: value for key, value in vars(args).items() if key not in ("output_dir", "baseline")},
+        "results": results,
+    }
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    output_path = os.path.join(args.output_dir, f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(output, f, indent=2)
+    print(f"Results written to {output_path}")
+    return output
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Startup-time benchmark for the research assistant CLI.
+
+Imports ``main`` in fresh interpreters and reports the median process
+wall time and in-process import time, plus the slowest top-level imports
+according to ``python -X importtime``. Results are saved as JSON next to
+the end-to-end benchmark results.
+
+Usage:
+    python -m benchmarks.startup --runs 5
+    python -m benchmarks.startup --module batch --baseline benchmarks/results/<file>.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import List, Optional
+
+from benchmarks.run_benchmark import _git_commit
+
+
+def _import_command(module: str) -> List[str]:
+    code = f"import time; start = time.perf_counter(); import {module}; print(time.perf_counter() - start)"
+    return [sys.executable, "-c", code]
+
+
+def time_startup(module: str) -> tuple:
+    """Import ``module`` in a fresh interpreter; return (process wall time, import time) in seconds."""
+    start = time.perf_counter()
+    result = subprocess.run(_import_command(module), capture_output=True, text=True, check=True)
+    return time.perf_counter() - start, float(result.stdout.strip().splitlines()[-1])
+
+
+def slowest_imports(module: str, top: int) -> List[dict]:
+    """Return the ``top`` direct imports of ``module`` with the largest cumulative import time."""
+    command = [sys.executable, "-X", "importtime", "-c", f"import {module}"]
+    stderr = subprocess.run(command, capture_output=True, text=True, check=True).stderr
+    # Children are printed before their parent: collect the second level
+    # until the measured module itself appears at the top level
+    pending, imports = [], []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        if depth == 0:
+            if name.strip() == module:
+                imports = pending
+            pending = []
+        elif depth == 1:
+            pending.append({"module": name.strip(), "cumulative_ms": int(cumulative) / 1000})
+    return sorted(imports, key=lambda item: -item["cumulative_ms"])[:top]
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--module", default="main", help="Module whose import is timed")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters to time")
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports to list")
+    parser.add_argument("--output-dir", default=os.path.join("benchmarks", "results"), help="Where results are saved")
+    parser.add_argument("--baseline", help="Earlier startup results file to compare against")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> dict:
+    """Time startup, print a summary and save the results."""
+    args = parse_args(argv)
+    timings = [time_startup(args.module) for _ in range(args.runs)]
+    result = {
+        "created_at": datetime.now().isoformat(),
+        "git_commit": _git_commit(),
+        "module": args.module,
+        "runs": args.runs,
+        "process_s": statistics.median(process for process, _ in timings),
+        "import_s": statistics.median(imported for _, imported in timings),
+        "slowest_imports": slowest_imports(args.module, args.top),
+    }
+
+    delta = ""
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("import_s"):
+            delta = f" ({(result['import_s'] / baseline['import_s'] - 1) * 100:+.1f}% vs baseline)"
+
+    print(f"import {args.module}: {result['import_s']:.3f}s median{delta}, process {result['process_s']:.3f}s")
+    for item in result["slowest_imports"]:
+        print(f"  {item['module']:<40}{item['cumulative_ms']:>10.1f} ms")
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    output_path = os.path.join(args.output_dir, f"startup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+    print(f"Results written to {output_path}")
+    return result
+
+
+if __name__ == "__main__":
+    main()
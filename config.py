@@ -1,6 +1,16 @@
 """Configuration management for the research assistant application."""
 import os
-from typing import Optional
+from typing import Dict, List, Optional
+
+
+def _parse_routes(value: str) -> Dict[str, str]:
+    """Parse ``"key=model,key=model"`` into a dict, ignoring empty entries."""
+    routes = {}
+    for item in value.split(","):
+        key, _, model = item.partition("=")
+        if key.strip() and model.strip():
+            routes[key.strip()] = model.strip()
+    return routes
 
 
 class Settings:
@@ -12,19 +22,125 @@ class Settings:
         self.openai_model: str = os.getenv("RESEARCH_OPENAI_MODEL", "gpt-4o")
         self.openai_temperature: float = float(os.getenv("RESEARCH_OPENAI_TEMPERATURE", "0.0"))
         
+        # Model Routing Configuration
+        # Cheaper, faster model used for mid-interview planning and questioning
+        self.fast_model: str = os.getenv("RESEARCH_FAST_MODEL", "gpt-4o-mini")
+        # "role_or_node=model" pairs overriding the defaults, e.g. "answering=gpt-4o-mini,write_report=o3"
+        self.model_routes: Dict[str, str] = _parse_routes(os.getenv("RESEARCH_MODEL_ROUTES", ""))
+        # Optional model used when the routed model exceeds its latency or error budget
+        self.fallback_model: Optional[str] = os.getenv("RESEARCH_FALLBACK_MODEL") or None
+        self.fallback_latency_seconds: float = float(os.getenv("RESEARCH_FALLBACK_LATENCY_SECONDS", "60"))
+        self.fallback_error_budget: int = int(os.getenv("RESEARCH_FALLBACK_ERROR_BUDGET", "3"))
+        self.fallback_reset_seconds: float = float(os.getenv("RESEARCH_FALLBACK_RESET_SECONDS", "120"))
+        
+        # LLM Cache Configuration
+        self.llm_cache_enabled: bool = os.getenv("RESEARCH_LLM_CACHE", "true").lower() == "true"
+        self.llm_cache_dir: str = os.getenv("RESEARCH_LLM_CACHE_DIR", ".cache/llm")
+        self.llm_cache_ttl_seconds: int = int(os.getenv("RESEARCH_LLM_CACHE_TTL_SECONDS", "604800"))
+        self.llm_cache_max_mb: int = int(os.getenv("RESEARCH_LLM_CACHE_MAX_MB", "256"))
+        
         # Research Configuration
         self.max_analysts: int = int(os.getenv("RESEARCH_MAX_ANALYSTS", "3"))
         self.max_interview_turns: int = int(os.getenv("RESEARCH_MAX_INTERVIEW_TURNS", "2"))
+        # Apply analyst feedback as a diff, keeping untouched analysts (and their prefetched work)
+        self.incremental_analysts: bool = os.getenv("RESEARCH_INCREMENTAL_ANALYSTS", "true").lower() == "true"
+        # Interviews end early once a turn adds less than this fraction of new material (0 disables)
+        self.min_information_gain: float = float(os.getenv("RESEARCH_MIN_INFORMATION_GAIN", "0.25"))
+        self.min_interview_turns: int = int(os.getenv("RESEARCH_MIN_INTERVIEW_TURNS", "1"))
+        # Interview transcripts above this many tokens have their older turns folded into a running summary (0 disables)
+        self.transcript_max_tokens: int = int(os.getenv("RESEARCH_TRANSCRIPT_MAX_TOKENS", "3000"))
+        self.transcript_recent_turns: int = int(os.getenv("RESEARCH_TRANSCRIPT_RECENT_TURNS", "2"))
+        
+        # Execution Configuration
+        self.async_execution: bool = os.getenv("RESEARCH_ASYNC", "false").lower() == "true"
+        self.max_concurrency: int = int(os.getenv("RESEARCH_MAX_CONCURRENCY", "16"))
+        # LLM rate budgets, split between a run and its interview workers (0 = unlimited), and the completion size assumed when charging a call
+        self.llm_requests_per_minute: int = int(os.getenv("RESEARCH_LLM_RPM", "0"))
+        self.llm_tokens_per_minute: int = int(os.getenv("RESEARCH_LLM_TPM", "0"))
+        self.llm_completion_tokens: int = int(os.getenv("RESEARCH_LLM_COMPLETION_TOKENS", "500"))
+        
+        # Batch-API execution (batch.py --batch-api): LLM calls pause the graph and are submitted as batches
+        self.batch_llm: bool = os.getenv("RESEARCH_BATCH_LLM", "false").lower() == "true"
+        self.batch_dir: str = os.getenv("RESEARCH_BATCH_DIR", ".cache/batches")
+        self.batch_poll_seconds: float = float(os.getenv("RESEARCH_BATCH_POLL_SECONDS", "60"))
+        
+        # Prefetch the first interview turn of proposed analysts while waiting for approval
+        self.prefetch: bool = os.getenv("RESEARCH_PREFETCH", "false").lower() == "true"
+        
+        # Interview Worker Processes (0 runs interviews in-process)
+        self.interview_workers: int = int(os.getenv("RESEARCH_INTERVIEW_WORKERS", "0"))
+        self.interview_queue_db: str = os.getenv("RESEARCH_INTERVIEW_QUEUE_DB", ".cache/interview_queue.sqlite")
+        self.interview_lease_seconds: float = float(os.getenv("RESEARCH_INTERVIEW_LEASE_SECONDS", "120"))
+        self.interview_max_attempts: int = int(os.getenv("RESEARCH_INTERVIEW_MAX_ATTEMPTS", "3"))
+        
+        # Server Configuration (python server.py)
+        self.server_host: str = os.getenv("RESEARCH_SERVER_HOST", "127.0.0.1")
+        self.server_port: int = int(os.getenv("RESEARCH_SERVER_PORT", "8765"))
+        self.server_workers: int = int(os.getenv("RESEARCH_SERVER_WORKERS", "2"))
+        self.server_queue_size: int = int(os.getenv("RESEARCH_SERVER_QUEUE_SIZE", "16"))
+        self.server_job_ttl_seconds: float = float(os.getenv("RESEARCH_SERVER_JOB_TTL_SECONDS", "3600"))
+        
+        # Checkpoint Configuration
+        self.checkpointer: str = os.getenv("RESEARCH_CHECKPOINTER", "memory").lower()
+        self.checkpoint_db: str = os.getenv("RESEARCH_CHECKPOINT_DB", ".cache/checkpoints.sqlite")
+        self.prune_checkpoints: bool = os.getenv("RESEARCH_PRUNE_CHECKPOINTS", "true").lower() == "true"
         
         # Output Configuration
         self.output_directory: str = os.getenv("RESEARCH_OUTPUT_DIR", "outputs")
         self.save_graph_images: bool = os.getenv("RESEARCH_SAVE_GRAPHS", "true").lower() == "true"
+        self.stream_output: bool = os.getenv("RESEARCH_STREAM_OUTPUT", "false").lower() == "true"
+        
+        # Tracing Configuration
+        self.trace_enabled: bool = os.getenv("RESEARCH_TRACE", "true").lower() == "true"
+        prompt_cost = os.getenv("RESEARCH_PROMPT_COST_PER_1M")
+        completion_cost = os.getenv("RESEARCH_COMPLETION_COST_PER_1M")
+        self.prompt_cost_per_1m: Optional[float] = float(prompt_cost) if prompt_cost else None
+        self.completion_cost_per_1m: Optional[float] = float(completion_cost) if completion_cost else None
         
         # Wikipedia Configuration
         self.wikipedia_max_docs: int = int(os.getenv("RESEARCH_WIKIPEDIA_MAX_DOCS", "2"))
         
         # DuckDuckGo Configuration
         self.duckduckgo_output_format: str = os.getenv("RESEARCH_DUCKDUCKGO_FORMAT", "list")
+        
+        # Local Corpus Configuration
+        self.local_index_dir: str = os.getenv("RESEARCH_LOCAL_INDEX", "")
+        self.local_top_k: int = int(os.getenv("RESEARCH_LOCAL_TOP_K", "5"))
+        
+        # Retrieval backends queried on every interview turn
+        default_retrievers = "web,wikipedia,local" if self.local_index_dir else "web,wikipedia"
+        self.retrievers: List[str] = [
+            name.strip() for name in os.getenv("RESEARCH_RETRIEVERS", default_retrievers).split(",") if name.strip()
+        ]
+        
+        # Interview Context Configuration
+        self.context_chunk_tokens: int = int(os.getenv("RESEARCH_CONTEXT_CHUNK_TOKENS", "200"))
+        self.context_top_k: int = int(os.getenv("RESEARCH_CONTEXT_TOP_K", "8"))
+        self.context_max_tokens: int = int(os.getenv("RESEARCH_CONTEXT_MAX_TOKENS", "3000"))
+        self.section_context_top_k: int = int(os.getenv("RESEARCH_SECTION_CONTEXT_TOP_K", "16"))
+        self.section_context_max_tokens: int = int(os.getenv("RESEARCH_SECTION_CONTEXT_MAX_TOKENS", "6000"))
+        
+        # Source Registry Configuration
+        self.source_dedup_threshold: float = float(os.getenv("RESEARCH_SOURCE_DEDUP_THRESHOLD", "0.8"))
+        
+        # Report Synthesis Configuration
+        self.fused_intro_conclusion: bool = os.getenv("RESEARCH_FUSED_INTRO_CONCLUSION", "true").lower() == "true"
+        self.synthesis_threshold_tokens: int = int(os.getenv("RESEARCH_SYNTHESIS_THRESHOLD_TOKENS", "12000"))
+        self.synthesis_group_tokens: int = int(os.getenv("RESEARCH_SYNTHESIS_GROUP_TOKENS", "6000"))
+        self.synthesis_max_depth: int = int(os.getenv("RESEARCH_SYNTHESIS_MAX_DEPTH", "3"))
+        
+        # Search Backend Resilience Configuration
+        self.http_timeout_seconds: float = float(os.getenv("RESEARCH_HTTP_TIMEOUT_SECONDS", "10"))
+        self.web_search_timeout_seconds: float = float(os.getenv("RESEARCH_WEB_SEARCH_TIMEOUT_SECONDS", "15"))
+        self.wikipedia_timeout_seconds: float = float(os.getenv("RESEARCH_WIKIPEDIA_TIMEOUT_SECONDS", "30"))
+        self.search_retries: int = int(os.getenv("RESEARCH_SEARCH_RETRIES", "2"))
+        self.search_backoff_seconds: float = float(os.getenv("RESEARCH_SEARCH_BACKOFF_SECONDS", "0.5"))
+        self.circuit_failure_threshold: int = int(os.getenv("RESEARCH_CIRCUIT_FAILURE_THRESHOLD", "5"))
+        self.circuit_reset_seconds: float = float(os.getenv("RESEARCH_CIRCUIT_RESET_SECONDS", "60"))
+        
+        # Search Cache Configuration
+        self.search_cache_ttl_seconds: int = int(os.getenv("RESEARCH_SEARCH_CACHE_TTL_SECONDS", "3600"))
+        self.search_cache_max_entries: int = int(os.getenv("RESEARCH_SEARCH_CACHE_MAX_ENTRIES", "1024"))
     
     def __repr__(self) -> str:
         """Return string representation of settings."""
@@ -2,10 +2,18 @@
 from graphs.analyst.analyst_graph import main_builder_graph
 from graphs.analyst.analyst_nodes import (
     create_analysts,
+    acreate_analysts,
     human_feedback,
+    synthesize_sections,
+    asynthesize_sections,
     write_report,
+    awrite_report,
     write_introduction,
+    awrite_introduction,
     write_conclusion,
+    awrite_conclusion,
+    write_intro_conclusion,
+    awrite_intro_conclusion,
     finalize_report,
     initiate_all_interviews,
 )
@@ -13,10 +21,18 @@ from graphs.analyst.analyst_nodes import (
 __all__ = [
     'main_builder_graph',
     'create_analysts',
+    'acreate_analysts',
     'human_feedback',
+    'synthesize_sections',
+    'asynthesize_sections',
     'write_report',
+    'awrite_report',
     'write_introduction',
+    'awrite_introduction',
     'write_conclusion',
+    'awrite_conclusion',
+    'write_intro_conclusion',
+    'awrite_intro_conclusion',
     'finalize_report',
     'initiate_all_interviews',
 ]
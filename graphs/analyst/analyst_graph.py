@@ -1,39 +1,64 @@
 """Main analyst graph definition that orchestrates the research workflow."""
 from langgraph.graph import StateGraph, END, START
-from langgraph.checkpoint.memory import MemorySaver
+from langchain_core.runnables import RunnableLambda
 
 from states.research_state import ResearchGraphState
 from graphs.analyst.analyst_nodes import (
     create_analysts,
+    acreate_analysts,
     human_feedback,
+    synthesize_sections,
+    asynthesize_sections,
     write_report,
+    awrite_report,
     write_introduction,
+    awrite_introduction,
     write_conclusion,
+    awrite_conclusion,
+    write_intro_conclusion,
+    awrite_intro_conclusion,
     finalize_report,
     initiate_all_interviews
 )
 from graphs.interview.interview_graph import interview_graph
+from graphs.interview.workers import queue_interview, aqueue_interview
+from utils.checkpointing import checkpointer
+from config import settings
+
+
+if settings.batch_llm and settings.interview_workers:
+    raise ValueError("RESEARCH_BATCH_LLM needs in-process interviews; unset RESEARCH_INTERVIEW_WORKERS")
 
 
 main_builder = StateGraph(ResearchGraphState)
-main_builder.add_node("create_analysts", create_analysts)
+main_builder.add_node("create_analysts", RunnableLambda(create_analysts, acreate_analysts, name="create_analysts"))
 main_builder.add_node("human_feedback", human_feedback)
-main_builder.add_node("conduct_interviews", interview_graph)
-main_builder.add_node("write_report", write_report)
-main_builder.add_node("write_introduction", write_introduction)
-main_builder.add_node("write_conclusion", write_conclusion)
+if settings.interview_workers:
+    # Interviews run in worker processes fed by a durable queue
+    main_builder.add_node("conduct_interviews", RunnableLambda(queue_interview, aqueue_interview, name="conduct_interviews"))
+else:
+    main_builder.add_node("conduct_interviews", interview_graph)
+main_builder.add_node("synthesize_sections", RunnableLambda(synthesize_sections, asynthesize_sections, name="synthesize_sections"))
+main_builder.add_node("write_report", RunnableLambda(write_report, awrite_report, name="write_report"))
+if settings.fused_intro_conclusion:
+    # One structured call instead of two that repeat every section in their prompts
+    main_builder.add_node("write_intro_conclusion", RunnableLambda(write_intro_conclusion, awrite_intro_conclusion, name="write_intro_conclusion"))
+    writers = ["write_report", "write_intro_conclusion"]
+else:
+    main_builder.add_node("write_introduction", RunnableLambda(write_introduction, awrite_introduction, name="write_introduction"))
+    main_builder.add_node("write_conclusion", RunnableLambda(write_conclusion, awrite_conclusion, name="write_conclusion"))
+    writers = ["write_report", "write_introduction", "write_conclusion"]
 main_builder.add_node("finalize_report", finalize_report)
 
 
 main_builder.add_edge(START, "create_analysts")
 main_builder.add_edge("create_analysts", "human_feedback")
 main_builder.add_conditional_edges("human_feedback", initiate_all_interviews, ["create_analysts", "conduct_interviews"])
-main_builder.add_edge("conduct_interviews", "write_report")
-main_builder.add_edge("conduct_interviews", "write_introduction")
-main_builder.add_edge("conduct_interviews", "write_conclusion")
-main_builder.add_edge(["write_report", "write_introduction", "write_conclusion"], "finalize_report")
+main_builder.add_edge("conduct_interviews", "synthesize_sections")
+for writer in writers:
+    main_builder.add_edge("synthesize_sections", writer)
+main_builder.add_edge(writers, "finalize_report")
 main_builder.add_edge("finalize_report", END)
 
 
-memory = MemorySaver()
-main_builder_graph = main_builder.compile(interrupt_before=['human_feedback'], checkpointer=memory)
+main_builder_graph = main_builder.compile(interrupt_before=['human_feedback'], checkpointer=checkpointer)
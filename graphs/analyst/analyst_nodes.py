@@ -1,78 +1,339 @@
 """Analyst node functions for the research assistant workflow."""
+import asyncio
+
 from langchain_core.messages import SystemMessage, HumanMessage
+from langchain_core.runnables import RunnableConfig
 from langgraph.types import Send
 
 from prompts.analyst_creation_prompt import ANALYST_CREATION_PROMPT
+from prompts.analyst_revision_prompt import ANALYST_REVISION_PROMPT
 from prompts.write_report_prompt import WRITE_REPORT_PROMPT
-from prompts.intro_conclusion_prompts import INTRO_CONCLUSION_PROMPT
-from init_llm import llm
-from states.models import Perspectives
+from prompts.intro_conclusion_prompts import INTRO_CONCLUSION_PROMPT, INTRO_CONCLUSION_SECTIONS
+from prompts.section_digest_prompt import SECTION_DIGEST_PROMPT
+from config import settings
+from init_llm import llm_for
+from states.models import Perspectives, AnalystRevision, IntroConclusion
 from states.research_state import ResearchGraphState
+from utils.concurrency import admitted, limited, concurrency_slot
+from utils.tokens import estimate_tokens
+from utils.prompt_layout import layered_messages
+from utils.report_stream import report_stream
+from utils.source_registry import cite_sections, renumber_citations, format_sources
+from graphs.interview.interview_nodes import opening_message
+from graphs.interview.prefetch import prefetcher
 
 
-def create_analysts(state: ResearchGraphState) -> dict:
-    """Create analyst personas based on the research topic."""
+def _analyst_messages(state: ResearchGraphState) -> list:
+    """Build the analyst creation prompt from the topic and any human feedback."""
     topic = state.get("topic")
     max_analysts = state.get("max_analysts")
     human_analyst_feedback = state.get("human_analyst_feedback", "")
 
-    structured_llm = llm.with_structured_output(Perspectives)
-
     system_message = ANALYST_CREATION_PROMPT.format(topic=topic,
                                              human_analyst_feedback=human_analyst_feedback,
                                              max_analysts=max_analysts)
 
-    analysts = structured_llm.invoke([SystemMessage(content=system_message)] + [HumanMessage(content="Generate the set of analysts")])
-     
-    return {"analysts": analysts.analysts}
+    return [SystemMessage(content=system_message)] + [HumanMessage(content="Generate the set of analysts")]
 
-def human_feedback(state: ResearchGraphState) -> None:
-    """No-op node to interrupt execution for human feedback."""
-    pass
 
+def _revising(state: ResearchGraphState) -> bool:
+    """Whether feedback should be applied as a diff to the current analysts."""
+    return settings.incremental_analysts and bool(state.get("analysts")) and bool(state.get("human_analyst_feedback"))
 
-def write_report(state: ResearchGraphState) -> dict:
-    """Write the main report by consolidating all sections."""
-    sections = state.get("sections")
+
+def _revision_messages(state: ResearchGraphState) -> list:
+    """Build the prompt asking only for the analysts the feedback changes."""
+    analysts = "\n".join(f"{number}.{analyst.persona}" for number, analyst in enumerate(state["analysts"], start=1))
+    system_message = ANALYST_REVISION_PROMPT.format(topic=state.get("topic"),
+                                                    analysts=analysts,
+                                                    human_analyst_feedback=state.get("human_analyst_feedback"),
+                                                    max_analysts=state.get("max_analysts"))
+
+    return [SystemMessage(content=system_message)] + [HumanMessage(content="Revise the set of analysts")]
+
+
+def _apply_revision(analysts: list, revision: AnalystRevision) -> list:
+    """
+    Apply a revision to ``analysts``.
+
+    Untouched analysts are kept as they are and in order, so their identity
+    (and any prefetched work keyed on it) carries over; additions go last.
+    """
+    changed = {edit.number: edit.analyst for edit in revision.changed}
+    removed = set(revision.removed)
+    revised = [changed.get(number, analyst) for number, analyst in enumerate(analysts, start=1) if number not in removed]
+    revised += revision.added
+    kept = sum(1 for number in range(1, len(analysts) + 1) if number not in removed and number not in changed)
+    print(f"Revised analysts: kept {kept}, changed {len(revised) - kept - len(revision.added)}, "
+          f"removed {len(analysts) - len(revised) + len(revision.added)}, added {len(revision.added)}")
+    return revised
+
+
+def _prefetching() -> bool:
+    """
+    Prefetched turns live in this process, so they are of no use to interview
+    worker processes, and they run outside the graph, so they cannot wait for a batch.
+    """
+    return settings.prefetch and not settings.interview_workers and not settings.batch_llm
+
+
+def _thread_id(config: RunnableConfig) -> str:
+    return (config or {}).get("configurable", {}).get("thread_id")
+
+
+def _report_sections(state: ResearchGraphState) -> list:
+    """Return the condensed section digests when synthesis ran, otherwise the cited (or raw) sections."""
+    return state.get("section_digests") or state.get("cited_sections") or state.get("sections")
+
+
+def _needs_synthesis(sections: list) -> bool:
+    """Whether the sections are too large to fit in a single report prompt."""
+    return len(sections) > 1 and sum(estimate_tokens(section) for section in sections) > settings.synthesis_threshold_tokens
+
+
+def _group_sections(sections: list) -> list:
+    """
+    Pack consecutive sections into groups of about ``synthesis_group_tokens``.
+
+    Every group holds at least two sections (a trailing single section
+    joins the previous group), so each level at least halves the number
+    of memos.
+    """
+    groups, current, current_tokens = [], [], 0
+    for section in sections:
+        tokens = estimate_tokens(section)
+        if len(current) >= 2 and current_tokens + tokens > settings.synthesis_group_tokens:
+            groups.append(current)
+            current, current_tokens = [], 0
+        current.append(section)
+        current_tokens += tokens
+    if len(current) == 1 and groups:
+        groups[-1].extend(current)
+    elif current:
+        groups.append(current)
+    return groups
+
+
+def _digest_messages(topic: str, group: list) -> list:
+    """Build the prompt condensing one group of sections into a single memo."""
+    memos = "\n\n---\n\n".join(group)
+    target_words = max(150, settings.synthesis_group_tokens * 3 // (4 * max(2, len(group))))
+    sys_msg = SECTION_DIGEST_PROMPT.format(topic=topic, memos=memos, target_words=target_words)
+    return [SystemMessage(content=sys_msg)] + [HumanMessage(content="Condense these memos into one memo")]
+
+
+def _report_messages(state: ResearchGraphState) -> list:
+    """Build the main report prompt from all interview sections."""
+    sections = _report_sections(state)
     topic = state.get("topic")
 
     formatted_sec_str = "\n\n".join([f"{section}" for section in sections])
 
     sys_msg = WRITE_REPORT_PROMPT.format(topic=topic, context=formatted_sec_str)
-    report = llm.invoke([SystemMessage(content=sys_msg)] + [HumanMessage(content="Write a report based upon these memos")])
+    return [SystemMessage(content=sys_msg)] + [HumanMessage(content="Write a report based upon these memos")]
 
-    return {"content": report.content}
 
+def _intro_conclusion_messages(state: ResearchGraphState, part: str) -> list:
+    """
+    Build the prompt asking for the report ``part`` ("introduction", "conclusion" or both).
 
-def write_introduction(state: ResearchGraphState) -> dict:
-    """Write the introduction section of the report."""
-    sections = state["sections"]
+    The instructions and sections form a prefix shared by every variant;
+    only the final request differs.
+    """
+    sections = _report_sections(state)
     topic = state["topic"]
 
     # Concat all sections together
     formatted_str_sections = "\n\n".join([f"{section}" for section in sections])
-    
-    # Summarize the sections into a final report
-    
-    instructions = INTRO_CONCLUSION_PROMPT.format(topic=topic, formatted_str_sections=formatted_str_sections)    
-    intro = llm.invoke([instructions]+[HumanMessage(content=f"Write the report introduction")]) 
-    return {"introduction": intro.content}
 
-def write_conclusion(state: ResearchGraphState) -> dict:
+    return layered_messages(
+        INTRO_CONCLUSION_PROMPT.format(topic=topic),
+        shared=INTRO_CONCLUSION_SECTIONS.format(formatted_str_sections=formatted_str_sections),
+        request=f"Write the report {part}"
+    )
+
+
+def _write_part(node: str, messages: list, part: str, config: RunnableConfig) -> str:
+    """Generate a report part with ``node``'s model, streaming its tokens to the run's output directory when enabled."""
+    llm = llm_for(node)
+    stream = report_stream(config)
+    if stream is None:
+        return llm.invoke(messages).content
+
+    chunks = []
+    with stream.part(part) as write:
+        for chunk in llm.stream(messages):
+            chunks.append(chunk.content)
+            write(chunk.content)
+    return "".join(chunks)
+
+
+async def _awrite_part(node: str, messages: list, part: str, config: RunnableConfig) -> str:
+    """Async version of ``_write_part``; the stream is rate-admitted first, then holds a concurrency slot throughout."""
+    llm = llm_for(node)
+    stream = report_stream(config)
+    if stream is None:
+        return (await limited(llm.ainvoke(messages))).content
+
+    chunks = []
+    tokens = llm.astream(messages)
+    await admitted(tokens)
+    async with concurrency_slot():
+        with stream.part(part) as write:
+            async for chunk in tokens:
+                chunks.append(chunk.content)
+                write(chunk.content)
+    return "".join(chunks)
+
+
+def _save_parts(config: RunnableConfig, **parts: str) -> None:
+    """Write finished report parts to the run's output directory when streaming is enabled."""
+    stream = report_stream(config)
+    if stream is not None:
+        for name, text in parts.items():
+            with stream.part(name) as write:
+                write(text)
+
+
+def create_analysts(state: ResearchGraphState, config: RunnableConfig = None) -> dict:
+    """
+    Create analyst personas based on the research topic.
+
+    With feedback on existing analysts (and ``RESEARCH_INCREMENTAL_ANALYSTS``),
+    only the changed and added personas are generated.
+    """
+    stream = report_stream(config)
+    if stream is not None:
+        stream.reset()
+
+    analysts = []
+    if _revising(state):
+        revision = llm_for("create_analysts").with_structured_output(AnalystRevision).invoke(_revision_messages(state))
+        analysts = _apply_revision(state["analysts"], revision)
+    if not analysts:
+        structured_llm = llm_for("create_analysts").with_structured_output(Perspectives)
+        analysts = structured_llm.invoke(_analyst_messages(state)).analysts
+
+    if _prefetching():
+        prefetcher.start(_thread_id(config), state["topic"], analysts)
+     
+    return {"analysts": analysts}
+
+async def acreate_analysts(state: ResearchGraphState, config: RunnableConfig = None) -> dict:
+    """Async version of ``create_analysts``."""
+    stream = report_stream(config)
+    if stream is not None:
+        stream.reset()
+
+    analysts = []
+    if _revising(state):
+        structured_llm = llm_for("create_analysts").with_structured_output(AnalystRevision)
+        revision = await limited(structured_llm.ainvoke(_revision_messages(state)))
+        analysts = _apply_revision(state["analysts"], revision)
+    if not analysts:
+        structured_llm = llm_for("create_analysts").with_structured_output(Perspectives)
+        analysts = (await limited(structured_llm.ainvoke(_analyst_messages(state)))).analysts
+
+    if _prefetching():
+        await prefetcher.astart(_thread_id(config), state["topic"], analysts)
+     
+    return {"analysts": analysts}
+
+def human_feedback(state: ResearchGraphState) -> None:
+    """No-op node to interrupt execution for human feedback."""
+    pass
+
+
+def synthesize_sections(state: ResearchGraphState) -> dict:
+    """
+    Put the interview sections on global citations, then condense them with a
+    map-reduce tree when they are too large for one prompt.
+
+    Each section's own Sources list is resolved against the source registry
+    (duplicate and near-duplicate documents collapse to one entry) and its
+    citations are rewritten to global IDs, so no LLM call has to merge
+    citations. Groups of sections are then summarized in parallel, and the
+    summaries merged level by level until they fit under the synthesis
+    threshold. Below the threshold no LLM call is made.
+    """
+    sections, citations = cite_sections(state["sections"], state.get("sources", []))
+    update = {"cited_sections": sections, "citations": citations}
+
+    digests = sections
+    depth = 0
+    while _needs_synthesis(digests) and depth < settings.synthesis_max_depth:
+        groups = _group_sections(digests)
+        results = llm_for("synthesize_sections").batch([_digest_messages(state["topic"], group) for group in groups])
+        digests = [result.content for result in results]
+        depth += 1
+
+    if depth:
+        update["section_digests"] = digests
+    return update
+
+async def asynthesize_sections(state: ResearchGraphState) -> dict:
+    """Async version of ``synthesize_sections``."""
+    sections, citations = cite_sections(state["sections"], state.get("sources", []))
+    update = {"cited_sections": sections, "citations": citations}
+
+    digests = sections
+    depth = 0
+    while _needs_synthesis(digests) and depth < settings.synthesis_max_depth:
+        groups = _group_sections(digests)
+        messages = [_digest_messages(state["topic"], group) for group in groups]
+        if settings.batch_llm:
+            # One interrupt for all groups, so they go out in the same batch
+            results = await llm_for("synthesize_sections").abatch(messages)
+        else:
+            results = await asyncio.gather(*(limited(llm_for("synthesize_sections").ainvoke(m)) for m in messages))
+        digests = [result.content for result in results]
+        depth += 1
+
+    if depth:
+        update["section_digests"] = digests
+    return update
+
+
+def write_report(state: ResearchGraphState, config: RunnableConfig = None) -> dict:
+    """Write the main report by consolidating all sections."""
+    return {"content": _write_part("write_report", _report_messages(state), "content", config)}
+
+async def awrite_report(state: ResearchGraphState, config: RunnableConfig = None) -> dict:
+    """Async version of ``write_report``."""
+    return {"content": await _awrite_part("write_report", _report_messages(state), "content", config)}
+
+
+def write_introduction(state: ResearchGraphState, config: RunnableConfig = None) -> dict:
+    """Write the introduction section of the report."""
+    return {"introduction": _write_part("write_introduction", _intro_conclusion_messages(state, "introduction"), "introduction", config)}
+
+async def awrite_introduction(state: ResearchGraphState, config: RunnableConfig = None) -> dict:
+    """Async version of ``write_introduction``."""
+    return {"introduction": await _awrite_part("write_introduction", _intro_conclusion_messages(state, "introduction"), "introduction", config)}
+
+def write_conclusion(state: ResearchGraphState, config: RunnableConfig = None) -> dict:
     """Write the conclusion section of the report."""
-    sections = state["sections"]
-    topic = state["topic"]
+    return {"conclusion": _write_part("write_conclusion", _intro_conclusion_messages(state, "conclusion"), "conclusion", config)}
 
-    # Concat all sections together
-    formatted_str_sections = "\n\n".join([f"{section}" for section in sections])
-    
-    # Summarize the sections into a final report
-    
-    instructions = INTRO_CONCLUSION_PROMPT.format(topic=topic, formatted_str_sections=formatted_str_sections)    
-    conclusion = llm.invoke([instructions]+[HumanMessage(content=f"Write the report conclusion")]) 
-    return {"conclusion": conclusion.content}
+async def awrite_conclusion(state: ResearchGraphState, config: RunnableConfig = None) -> dict:
+    """Async version of ``write_conclusion``."""
+    return {"conclusion": await _awrite_part("write_conclusion", _intro_conclusion_messages(state, "conclusion"), "conclusion", config)}
+
+def write_intro_conclusion(state: ResearchGraphState, config: RunnableConfig = None) -> dict:
+    """Write the introduction and conclusion in one structured call over the sections."""
+    structured_llm = llm_for("write_intro_conclusion").with_structured_output(IntroConclusion)
+    result = structured_llm.invoke(_intro_conclusion_messages(state, "introduction and conclusion"))
+    _save_parts(config, introduction=result.introduction, conclusion=result.conclusion)
+    return {"introduction": result.introduction, "conclusion": result.conclusion}
+
+async def awrite_intro_conclusion(state: ResearchGraphState, config: RunnableConfig = None) -> dict:
+    """Async version of ``write_intro_conclusion``."""
+    structured_llm = llm_for("write_intro_conclusion").with_structured_output(IntroConclusion)
+    result = await limited(structured_llm.ainvoke(_intro_conclusion_messages(state, "introduction and conclusion")))
+    _save_parts(config, introduction=result.introduction, conclusion=result.conclusion)
+    return {"introduction": result.introduction, "conclusion": result.conclusion}
 
-def finalize_report(state: ResearchGraphState) -> dict:
+def finalize_report(state: ResearchGraphState, config: RunnableConfig = None) -> dict:
     """Finalize the report by combining all sections with intro and conclusion."""
     content = state["content"]
     if content.startswith("## Insights"):
@@ -85,26 +346,42 @@ def finalize_report(state: ResearchGraphState) -> dict:
     else:
         sources = None
 
-    final_report = state["introduction"] + "\n\n---\n\n" + content + "\n\n---\n\n" + state["conclusion"]
+    introduction, conclusion = state["introduction"], state["conclusion"]
+    if state.get("citations"):
+        # Number sources in reading order from the global citation table
+        (introduction, content, conclusion), cited = renumber_citations(
+            [introduction, content, conclusion], state["citations"]
+        )
+        sources = format_sources(cited) if cited else None
+
+    pieces = [introduction, "\n\n---\n\n", content, "\n\n---\n\n", conclusion]
     if sources is not None:
-        final_report += "\n\n## Sources\n" + sources
-    return {"final_report": final_report}
+        pieces += ["\n\n## Sources\n", sources]
+
+    stream = report_stream(config)
+    if stream is not None:
+        stream.write_final(pieces)
+    return {"final_report": "".join(pieces)}
 
 def initiate_all_interviews(state: ResearchGraphState):
     """
     Initiate interviews for all analysts using the Send API for parallel execution.
     
-    This is the map step that dispatches interview sub-graphs.
+    This is the map step that dispatches interview sub-graphs. The approved
+    analysts are the last ones ``create_analysts`` produced, which already
+    cancelled the prefetches of any others.
     """
     if state.get("human_analyst_feedback"):
         return "create_analysts"
     else:
         topic = state.get("topic")
+        max_num_turns = state.get("max_interview_turns") or settings.max_interview_turns
         return [
             Send("conduct_interviews",
             {
                 "analyst": analyst,
                 "topic": topic,
-                "messages": [HumanMessage(content=f"So you said you were writing an article on {topic}")]
+                "max_num_turns": max_num_turns,
+                "messages": [opening_message(topic)]
             }) for analyst in state.get("analysts")
         ]
@@ -2,22 +2,54 @@
 from graphs.interview.interview_graph import interview_graph
 from graphs.interview.interview_nodes import (
     generate_question,
+    agenerate_question,
+    plan_queries,
+    aplan_queries,
     serach_web,
+    asearch_web,
     search_wikipedia,
+    asearch_wikipedia,
+    search_local,
+    asearch_local,
     generate_answer,
+    agenerate_answer,
+    summarize_transcript,
+    asummarize_transcript,
     save_interview,
     write_section,
+    awrite_section,
     route_messages,
 )
+from graphs.interview.prefetch import prefetcher, warm_start, awarm_start, route_warm_start
+from graphs.interview.workers import queue_interview, aqueue_interview, start_workers, stop_workers
 
 __all__ = [
     'interview_graph',
     'generate_question',
+    'agenerate_question',
+    'plan_queries',
+    'aplan_queries',
     'serach_web',
+    'asearch_web',
     'search_wikipedia',
+    'asearch_wikipedia',
+    'search_local',
+    'asearch_local',
     'generate_answer',
+    'agenerate_answer',
+    'summarize_transcript',
+    'asummarize_transcript',
     'save_interview',
     'write_section',
+    'awrite_section',
     'route_messages',
+    'prefetcher',
+    'warm_start',
+    'awarm_start',
+    'route_warm_start',
+    'queue_interview',
+    'aqueue_interview',
+    'start_workers',
+    'stop_workers',
 ]
 
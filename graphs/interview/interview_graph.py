@@ -1,39 +1,69 @@
 """Interview graph definition for conducting expert interviews."""
 from langgraph.graph import StateGraph, END, START
-from langgraph.checkpoint.memory import MemorySaver
+from langchain_core.runnables import RunnableLambda
 
 from states.interview_state import InterviewState
+from utils.checkpointing import checkpointer
+from config import settings
 from graphs.interview.interview_nodes import (
     generate_question,
-    serach_web,
-    search_wikipedia,
+    agenerate_question,
+    plan_queries,
+    aplan_queries,
     generate_answer,
+    agenerate_answer,
+    summarize_transcript,
+    asummarize_transcript,
     save_interview,
     write_section,
-    route_messages
+    awrite_section,
+    route_messages,
+    RETRIEVERS
 )
+from graphs.interview.prefetch import warm_start, awarm_start, route_warm_start
 
 
+_unknown = set(settings.retrievers) - set(RETRIEVERS)
+if _unknown or not settings.retrievers:
+    raise ValueError(f"RESEARCH_RETRIEVERS must name one or more of {sorted(RETRIEVERS)}, got {settings.retrievers}")
 
 
 interview_builder = StateGraph(InterviewState)
-interview_builder.add_node("ask_question", generate_question)
-interview_builder.add_node("search_web", serach_web)
-interview_builder.add_node("search_wikipedia", search_wikipedia)
-interview_builder.add_node("answer_question", generate_answer)
+# Nodes that do I/O carry both a sync and an async implementation, so the
+# same compiled graph runs under `stream` and non-blocking under `astream`
+if settings.prefetch:
+    interview_builder.add_node("warm_start", RunnableLambda(warm_start, awarm_start, name="warm_start"))
+interview_builder.add_node("ask_question", RunnableLambda(generate_question, agenerate_question, name="ask_question"))
+interview_builder.add_node("plan_queries", RunnableLambda(plan_queries, aplan_queries, name="plan_queries"))
+for retriever in settings.retrievers:
+    node_name, search, asearch = RETRIEVERS[retriever]
+    interview_builder.add_node(node_name, RunnableLambda(search, asearch, name=node_name))
+interview_builder.add_node("answer_question", RunnableLambda(generate_answer, agenerate_answer, name="answer_question"))
+if settings.transcript_max_tokens:
+    interview_builder.add_node("summarize_transcript", RunnableLambda(summarize_transcript, asummarize_transcript, name="summarize_transcript"))
 interview_builder.add_node("save_interview", save_interview)
-interview_builder.add_node("write_section", write_section)
-
-interview_builder.add_edge(START, "ask_question")
-interview_builder.add_edge("ask_question", "search_web")
-interview_builder.add_edge("ask_question", "search_wikipedia")
-interview_builder.add_edge("search_web", "answer_question")
-interview_builder.add_edge("search_wikipedia", "answer_question")
-interview_builder.add_conditional_edges("answer_question", route_messages, ["ask_question", "save_interview"])
+interview_builder.add_node("write_section", RunnableLambda(write_section, awrite_section, name="write_section"))
+
+if settings.prefetch:
+    # Interviews whose first turn was prefetched during analyst review go straight to the answer
+    interview_builder.add_edge(START, "warm_start")
+    interview_builder.add_conditional_edges("warm_start", route_warm_start, ["ask_question", "answer_question"])
+else:
+    interview_builder.add_edge(START, "ask_question")
+interview_builder.add_edge("ask_question", "plan_queries")
+for retriever in settings.retrievers:
+    node_name = RETRIEVERS[retriever][0]
+    interview_builder.add_edge("plan_queries", node_name)
+    interview_builder.add_edge(node_name, "answer_question")
+if settings.transcript_max_tokens:
+    # Bound the transcript before the next question; the summary is only rewritten once it is over its ceiling
+    interview_builder.add_conditional_edges("answer_question", route_messages, {"ask_question": "summarize_transcript", "save_interview": "save_interview"})
+    interview_builder.add_edge("summarize_transcript", "ask_question")
+else:
+    interview_builder.add_conditional_edges("answer_question", route_messages, ["ask_question", "save_interview"])
 interview_builder.add_edge("save_interview", "write_section")
 interview_builder.add_edge("write_section", END)
 
 
 
-memory = MemorySaver()
-interview_graph = interview_builder.compile(checkpointer=memory).with_config(run_name="Conduct Interviews")
\ No newline at end of file
+interview_graph = interview_builder.compile(checkpointer=checkpointer).with_config(run_name="Conduct Interviews")
\ No newline at end of file
@@ -1,94 +1,396 @@
 """Interview node functions for the research assistant workflow."""
+import asyncio
+
 from langchain_core.messages import SystemMessage, HumanMessage, AIMessage, get_buffer_string
-from langchain_community.tools import DuckDuckGoSearchResults
-from langchain_community.document_loaders import WikipediaLoader
+from langchain_core.runnables import RunnableConfig
 
 from config import settings
 from states.interview_state import InterviewState
-from states.models import SearchQuery
+from states.models import SearchQueries
 from prompts.interview_prompt import INTERVIEW_PROMPT
-from prompts.web_query_prompt import WEB_QUERY_PROMPT
-from prompts.expert_answer_prompt import EXPERT_ANSWER_PROMPT
+from prompts.query_plan_prompt import QUERY_PLAN_PROMPT
+from prompts.expert_answer_prompt import EXPERT_ANSWER_PROMPT, EXPERT_CONTEXT_PROMPT
 from prompts.section_report_prompt import SECTION_REPORT_PROMPT
-from init_llm import llm
+from prompts.transcript_summary_prompt import TRANSCRIPT_SUMMARY_PROMPT
+from init_llm import llm_for
+from utils.search_cache import search_cache
+from utils.concurrency import limited
+from utils.http_clients import BackendUnavailable, search_backend, use_shared_session_for_wikipedia
+from utils.context_store import chunk_document, document_block, select_context, format_context
+from utils.prompt_layout import layered_messages
+from utils.report_stream import report_stream
+from utils.local_index import local_index
+from utils.source_registry import source_record
+from utils.novelty import information_gain
+from utils.tracing import record_interview_decision
+from utils.tokens import estimate_tokens
 
 
-# NODE 1
-def generate_question(state: InterviewState) -> dict:
-    analyst = state.get("analyst")
+# Search backends, imported from langchain_community on first use
+DuckDuckGoSearchResults = None
+WikipediaLoader = None
+_web_search = None
+
+
+def _duckduckgo_search():
+    """Return the shared DuckDuckGo search tool, importing and building it on first use."""
+    global DuckDuckGoSearchResults, _web_search
+    if DuckDuckGoSearchResults is None:
+        from langchain_community.tools import DuckDuckGoSearchResults
+    if not isinstance(_web_search, DuckDuckGoSearchResults):
+        _web_search = DuckDuckGoSearchResults(output_format=settings.duckduckgo_output_format)
+    return _web_search
+
+
+def _wikipedia_loader(query: str):
+    """Return a Wikipedia loader for ``query``, importing it on first use."""
+    global WikipediaLoader
+    if WikipediaLoader is None:
+        from langchain_community.document_loaders import WikipediaLoader
+        use_shared_session_for_wikipedia()
+    return WikipediaLoader(query=query, load_max_docs=settings.wikipedia_max_docs)
+
+
+def warm_search_clients() -> None:
+    """Build the shared search clients ahead of the first interview (e.g. when a server starts)."""
+    if "web" in settings.retrievers:
+        _duckduckgo_search()
+    if "wikipedia" in settings.retrievers:
+        _wikipedia_loader("")
+
+
+def _skip_backend(error: BackendUnavailable) -> dict:
+    """Continue the turn without a failed backend; the other retrievers still contribute."""
+    print(f"Search backend unavailable, continuing without it: {error}")
+    return {"context": [], "sources": []}
+
+
+def opening_message(topic: str) -> HumanMessage:
+    """First message of every interview."""
+    return HumanMessage(content=f"So you said you were writing an article on {topic}")
+
+
+def _transcript(state: InterviewState) -> list:
+    """
+    Return the interview as it is sent to the LLM.
+
+    Once older turns have been folded into the running summary, this is the
+    opening message, the summary and the turns since then; otherwise it is
+    the full message history.
+    """
     messages = state.get("messages")
+    summary = state.get("summary")
+    if not summary:
+        return messages
+    recent = messages[1 + state.get("summarized", 0):]
+    return [messages[0], SystemMessage(content=f"Notes on the interview so far:\n{summary}")] + recent
+
 
+def _turns_to_fold(state: InterviewState) -> list:
+    """
+    Return the oldest unsummarized messages to fold into the summary, if the transcript is over its ceiling.
+
+    The last ``transcript_recent_turns`` question/answer pairs always stay verbatim.
+    """
+    ceiling = settings.transcript_max_tokens
+    if not ceiling:
+        return []
+    pending = state["messages"][1 + state.get("summarized", 0):]
+    fold = len(pending) - 2 * settings.transcript_recent_turns
+    fold -= fold % 2
+    size = estimate_tokens(state.get("summary", "")) + sum(estimate_tokens(m.content) for m in pending)
+    if fold <= 0 or size <= ceiling:
+        return []
+    return pending[:fold]
+
+
+def _summary_messages(state: InterviewState, turns: list) -> list:
+    # Keep the summary to about half the ceiling (~0.75 words per token)
+    return [HumanMessage(content=TRANSCRIPT_SUMMARY_PROMPT.format(
+        summary=state.get("summary", ""),
+        transcript=get_buffer_string(turns),
+        target_words=settings.transcript_max_tokens * 3 // 8
+    ))]
+
+
+def _question_messages(state: InterviewState) -> list:
+    """Build the analyst prompt for the next question."""
+    analyst = state.get("analyst")
+    messages = _transcript(state)
 
     system_msg = INTERVIEW_PROMPT.format(goals=analyst.persona)
-    qn = llm.invoke([SystemMessage(content=system_msg)] + messages)
+    return [SystemMessage(content=system_msg)] + messages
+
+
+def _web_chunks(res: list) -> list:
+    """Split DuckDuckGo results into <Document> passages."""
+    return [
+        chunk
+        for doc in res
+        for chunk in chunk_document(f'<Document href="{doc['link']} />', doc['snippet'], settings.context_chunk_tokens)
+    ]
+
+
+def _web_sources(res: list) -> list:
+    """Describe DuckDuckGo results for the cross-analyst source registry."""
+    return [source_record(doc['link'], doc['snippet']) for doc in res]
+
+
+def _wikipedia_chunks(search_docs: list) -> list:
+    """Split Wikipedia documents into <Document> passages."""
+    return [
+        chunk
+        for doc in search_docs
+        for chunk in chunk_document(
+            f'<Document href="{doc.metadata['source']} page={doc.metadata.get("page", '')}/>',
+            doc.page_content,
+            settings.context_chunk_tokens
+        )
+    ]
+
+
+def _wikipedia_sources(search_docs: list) -> list:
+    """Describe Wikipedia documents for the cross-analyst source registry."""
+    return [source_record(doc.metadata['source'], doc.page_content) for doc in search_docs]
+
+
+def _answer_messages(state: InterviewState) -> list:
+    """
+    Build the expert prompt from the passages most relevant to the latest question.
+
+    The persona prompt and the append-only interview come first and the
+    per-question context last, so consecutive turns share a cached prefix.
+    """
+    analyst = state.get("analyst")
+    messages = _transcript(state)
+    context = select_context(
+        state.get("context", []),
+        query=messages[-1].content if messages else "",
+        top_k=settings.context_top_k,
+        max_tokens=settings.context_max_tokens
+    )
+
+    return layered_messages(
+        EXPERT_ANSWER_PROMPT.format(goals=analyst.persona),
+        history=messages,
+        request=SystemMessage(content=EXPERT_CONTEXT_PROMPT.format(context=format_context(context)))
+    )
+
+
+def _section_messages(state: InterviewState) -> list:
+    """Build the section-writing prompt for the analyst's interview."""
+    analyst =  state.get("analyst")
+    context = format_context(select_context(
+        state.get("context", []),
+        query=f"{analyst.description}\n{state.get('interview', '')}",
+        top_k=settings.section_context_top_k,
+        max_tokens=settings.section_context_max_tokens
+    ))
+
+    sys_msg = SECTION_REPORT_PROMPT.format(focus=analyst.description)
+    return [SystemMessage(content=sys_msg)]+ [HumanMessage(content=f"Use this source to write your section: {context}")]
+
+
+# NODE 1
+def generate_question(state: InterviewState) -> dict:
+    qn = llm_for("generate_question").invoke(_question_messages(state))
+
+    return {"messages": [qn]}
+
+async def agenerate_question(state: InterviewState) -> dict:
+    qn = await limited(llm_for("generate_question").ainvoke(_question_messages(state)))
 
     return {"messages": [qn]}
 
+# NODE 2
+def plan_queries(state: InterviewState) -> dict:
+    """Plan the web and Wikipedia queries for the latest question in a single LLM call."""
+    structured_llm = llm_for("plan_queries").with_structured_output(SearchQueries)
+    search_queries = structured_llm.invoke([SystemMessage(content=QUERY_PLAN_PROMPT)] + _transcript(state))
+
+    return {"search_queries": search_queries}
+
+async def aplan_queries(state: InterviewState) -> dict:
+    structured_llm = llm_for("plan_queries").with_structured_output(SearchQueries)
+    search_queries = await limited(structured_llm.ainvoke([SystemMessage(content=QUERY_PLAN_PROMPT)] + _transcript(state)))
+
+    return {"search_queries": search_queries}
+
 # NODE 2.1
 def serach_web(state: InterviewState) -> dict:
-    structured_llm = llm.with_structured_output(SearchQuery)
-    search_query = structured_llm.invoke([SystemMessage(content=WEB_QUERY_PROMPT)]+ state['messages'])
+    search_queries = state.get("search_queries")
 
-    serach_docs = DuckDuckGoSearchResults(output_format=settings.duckduckgo_output_format)
-    res = serach_docs.invoke(search_query.search_query)
+    serach_docs = _duckduckgo_search()
+    backend = search_backend("duckduckgo", settings.web_search_timeout_seconds)
+    try:
+        res = search_cache.get_or_fetch(
+            "duckduckgo",
+            search_queries.web_query,
+            lambda: backend.call(lambda: serach_docs.invoke(search_queries.web_query))
+        )
+    except BackendUnavailable as e:
+        return _skip_backend(e)
 
-    formated_search_res = "\n\n ---- \n\n".join(
-        [
-            f'<Document href="{doc['link']} /> \n {doc['snippet']}  \n </Document>'
-            for doc in res
-        ]
-    )
+    return {"context": _web_chunks(res), "sources": _web_sources(res)}
+
+async def asearch_web(state: InterviewState) -> dict:
+    search_queries = state.get("search_queries")
 
-    return {"context": [formated_search_res]}
+    serach_docs = _duckduckgo_search()
+    backend = search_backend("duckduckgo", settings.web_search_timeout_seconds)
+    try:
+        res = await search_cache.aget_or_fetch(
+            "duckduckgo",
+            search_queries.web_query,
+            lambda: backend.acall(lambda: serach_docs.ainvoke(search_queries.web_query))
+        )
+    except BackendUnavailable as e:
+        return _skip_backend(e)
+
+    return {"context": _web_chunks(res), "sources": _web_sources(res)}
 
 # NODE 2.2
 def search_wikipedia(state: InterviewState) -> dict:
-    structured_llm = llm.with_structured_output(SearchQuery)
-    search_query = structured_llm.invoke([SystemMessage(content=WEB_QUERY_PROMPT)] + state['messages'])
-
-    search_docs = WikipediaLoader(
-        query=search_query.search_query,
-        load_max_docs=settings.wikipedia_max_docs
-    ).load()
-
-    formatted_search_docs = "\n\n ---- \n\n".join(
-        [
-            f'<Document href="{doc.metadata['source']} page={doc.metadata.get("page", '')}/> \n {doc.page_content}  \n </Document>'
-            for doc in search_docs
-        ]
-    )
+    search_queries = state.get("search_queries")
+
+    backend = search_backend("wikipedia", settings.wikipedia_timeout_seconds)
+    try:
+        search_docs = search_cache.get_or_fetch(
+            "wikipedia",
+            search_queries.wikipedia_query,
+            lambda: backend.call(lambda: _wikipedia_loader(search_queries.wikipedia_query).load())
+        )
+    except BackendUnavailable as e:
+        return _skip_backend(e)
+
+    return {"context": _wikipedia_chunks(search_docs), "sources": _wikipedia_sources(search_docs)}
+
+async def asearch_wikipedia(state: InterviewState) -> dict:
+    search_queries = state.get("search_queries")
+
+    backend = search_backend("wikipedia", settings.wikipedia_timeout_seconds)
+    try:
+        search_docs = await search_cache.aget_or_fetch(
+            "wikipedia",
+            search_queries.wikipedia_query,
+            lambda: backend.acall(lambda: _wikipedia_loader(search_queries.wikipedia_query).aload())
+        )
+    except BackendUnavailable as e:
+        return _skip_backend(e)
 
-    return {"context": [formatted_search_docs]}
+    return {"context": _wikipedia_chunks(search_docs), "sources": _wikipedia_sources(search_docs)}
+
+# NODE 2.3
+def search_local(state: InterviewState) -> dict:
+    search_queries = state.get("search_queries")
+
+    query = f"{search_queries.web_query} {search_queries.wikipedia_query}"
+    passages = local_index().passages(query, settings.local_top_k)
+    return {
+        "context": [document_block(f'<Document href="{href}"/>', text) for href, text in passages],
+        "sources": [source_record(href, text) for href, text in passages],
+    }
+
+async def asearch_local(state: InterviewState) -> dict:
+    # Index lookups are fast but touch disk, so keep them off the event loop
+    return await asyncio.to_thread(search_local, state)
+
+# Retrieval backends selectable through settings.retrievers: name -> (node name, sync, async)
+RETRIEVERS = {
+    "web": ("search_web", serach_web, asearch_web),
+    "wikipedia": ("search_wikipedia", search_wikipedia, asearch_wikipedia),
+    "local": ("search_local", search_local, asearch_local),
+}
 
 # NODE 3
+def _stop_early(state: InterviewState, gain: float, previous_answers: list) -> bool:
+    """Decide whether the interview ends after this answer because the turn mostly repeated earlier material."""
+    max_num_turns = state.get("max_num_turns", settings.max_interview_turns)
+    current_turns = len(previous_answers) + 1
+    if current_turns >= max_num_turns or "Thank you so much for your help" in state["messages"][-1].content:
+        # route_messages ends the interview anyway
+        return False
+
+    threshold = settings.min_information_gain
+    analyst = state["analyst"].name
+    if current_turns >= settings.min_interview_turns and gain < threshold:
+        saved = max_num_turns - current_turns
+        print(f"Ending interview with {analyst} after turn {current_turns}: "
+              f"information gain {gain:.2f} < {threshold:.2f} ({saved} turn(s) saved)")
+        record_interview_decision(analyst, current_turns, gain, "stop", saved)
+        return True
+
+    record_interview_decision(analyst, current_turns, gain, "continue", 0)
+    return False
+
+def _turn_gain(state: InterviewState, answer: AIMessage) -> dict:
+    """Score the passages retrieved this turn and the new answer against everything gathered before."""
+    context = state.get("context") or []
+    seen = state.get("context_seen", 0)
+    previous_answers = [m.content for m in state["messages"] if isinstance(m, AIMessage) and m.name == 'expert']
+    gain = information_gain(context[seen:] + [answer.content], context[:seen] + previous_answers)
+    return {
+        "information_gain": [gain],
+        "context_seen": len(context),
+        "stop_early": _stop_early(state, gain, previous_answers),
+    }
+
 def generate_answer(state: InterviewState) -> dict:
-    analyst = state.get("analyst")
-    messages = state.get("messages")
-    context = state.get("context")
+    llm_result = llm_for("generate_answer").invoke(_answer_messages(state))
 
-    sys_msg = [SystemMessage(content=EXPERT_ANSWER_PROMPT.format(goals=analyst.persona, context=context))]
-    llm_result = llm.invoke(sys_msg + messages)
+    llm_result.name = 'expert'
+
+    return {"messages": llm_result, **_turn_gain(state, llm_result)}
+
+async def agenerate_answer(state: InterviewState) -> dict:
+    llm_result = await limited(llm_for("generate_answer").ainvoke(_answer_messages(state)))
 
     llm_result.name = 'expert'
 
-    return {"messages": llm_result}
+    return {"messages": llm_result, **_turn_gain(state, llm_result)}
+
+# NODE 3.1
+def summarize_transcript(state: InterviewState) -> dict:
+    """Fold the oldest turns into the running summary once the transcript exceeds its token ceiling."""
+    turns = _turns_to_fold(state)
+    if not turns:
+        return {}
+    summary = llm_for("summarize_transcript").invoke(_summary_messages(state, turns))
+
+    return {"summary": summary.content, "summarized": state.get("summarized", 0) + len(turns)}
+
+async def asummarize_transcript(state: InterviewState) -> dict:
+    turns = _turns_to_fold(state)
+    if not turns:
+        return {}
+    summary = await limited(llm_for("summarize_transcript").ainvoke(_summary_messages(state, turns)))
+
+    return {"summary": summary.content, "summarized": state.get("summarized", 0) + len(turns)}
 
 # NODE 4
 def save_interview(state: InterviewState) -> dict:
 
-    messages = state.get("messages")
+    messages = _transcript(state)
     interview = get_buffer_string(messages)
     
     return {"interview": interview}
 
 # NODE 5
-def write_section(state: InterviewState) -> dict:
-    interview = state.get("interview")
-    context = state.get("context")
-    analyst =  state.get("analyst")
+def write_section(state: InterviewState, config: RunnableConfig = None) -> dict:
+    section = llm_for("write_section").invoke(_section_messages(state))
 
-    sys_msg = SECTION_REPORT_PROMPT.format(focus=analyst.description)
-    section = llm.invoke([SystemMessage(content=sys_msg)]+ [HumanMessage(content=f"Use this source to write your section: {context}")])
+    stream = report_stream(config)
+    if stream is not None:
+        stream.append_section(section.content)
+
+    return {"sections": [section.content]}
+
+async def awrite_section(state: InterviewState, config: RunnableConfig = None) -> dict:
+    section = await limited(llm_for("write_section").ainvoke(_section_messages(state)))
+
+    stream = report_stream(config)
+    if stream is not None:
+        stream.append_section(section.content)
 
     return {"sections": [section.content]}
 
@@ -108,5 +410,9 @@ def route_messages(state: InterviewState, name: str = 'expert') -> str:
     if "Thank you so much for your help" in last_question.content:
         return "save_interview"
 
+    # Decided (and traced) by generate_answer from the turn's information gain
+    if state.get("stop_early"):
+        return "save_interview"
+
     return "ask_question"
 
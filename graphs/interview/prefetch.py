@@ -0,0 +1,189 @@
+"""Speculative first interview turns, run while the graph waits for analyst approval."""
+import asyncio
+import contextvars
+import hashlib
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple, Union
+
+from langchain_core.runnables import RunnableConfig
+
+from config import settings
+from states.interview_state import InterviewState
+from states.models import Analyst
+from utils.context_store import merge_context
+from utils.source_registry import merge_sources
+from graphs.interview.interview_nodes import (
+    generate_question,
+    agenerate_question,
+    plan_queries,
+    aplan_queries,
+    opening_message,
+    RETRIEVERS
+)
+
+
+def analyst_key(analyst: Analyst) -> str:
+    """Identify an analyst persona by its content."""
+    return hashlib.sha1(analyst.model_dump_json().encode("utf-8")).hexdigest()[:16]
+
+
+def _thread_id(config: Optional[RunnableConfig]) -> Optional[str]:
+    return (config or {}).get("configurable", {}).get("thread_id")
+
+
+def _opening_state(topic: str, analyst: Analyst) -> dict:
+    return {"analyst": analyst, "messages": [opening_message(topic)]}
+
+
+def _turn_update(state: dict, question: list, retrieved: List[dict]) -> dict:
+    """Collect a prefetched first turn as the update ``warm_start`` applies to the interview."""
+    context, sources = [], []
+    for result in retrieved:
+        context = merge_context(context, result["context"])
+        sources = merge_sources(sources, result["sources"])
+    return {"messages": question, "search_queries": state["search_queries"], "context": context, "sources": sources}
+
+
+def _first_turn(state: dict, cancelled: threading.Event) -> Optional[dict]:
+    """Ask the first question, plan its queries and retrieve, stopping early once cancelled."""
+    question = generate_question(state)["messages"]
+    if cancelled.is_set():
+        return None
+    state = {**state, "messages": state["messages"] + question}
+    state.update(plan_queries(state))
+    retrieved = []
+    for retriever in settings.retrievers:
+        if cancelled.is_set():
+            return None
+        retrieved.append(RETRIEVERS[retriever][1](state))
+    return _turn_update(state, question, retrieved)
+
+
+async def _afirst_turn(state: dict) -> dict:
+    """Async version of ``_first_turn``; cancellation goes through the task."""
+    question = (await agenerate_question(state))["messages"]
+    state = {**state, "messages": state["messages"] + question}
+    state.update(await aplan_queries(state))
+    retrieved = await asyncio.gather(*(RETRIEVERS[retriever][2](state) for retriever in settings.retrievers))
+    return _turn_update(state, question, retrieved)
+
+
+class _Entry:
+    def __init__(self, job: Union[Future, asyncio.Task], cancelled: threading.Event):
+        self.job = job
+        self.cancelled = cancelled
+
+    def cancel(self) -> None:
+        self.cancelled.set()
+        self.job.cancel()
+
+
+class Prefetcher:
+    """
+    Background first turns of proposed analysts, keyed by thread and analyst.
+
+    ``start``/``astart`` are called when analysts are proposed; prefetches
+    of analysts that are no longer proposed are cancelled. ``retain``
+    cancels everything but the approved analysts, and ``take``/``atake``
+    hand a finished (or in-flight) first turn to its interview.
+    """
+
+    def __init__(self):
+        self._entries: Dict[Tuple[str, str], _Entry] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.stats = {"started": 0, "used": 0, "cancelled": 0}
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=settings.max_concurrency, thread_name_prefix="prefetch")
+            return self._executor
+
+    def retain(self, thread_id: str, analysts: List[Analyst]) -> None:
+        """Cancel the thread's prefetches for analysts not in ``analysts``."""
+        keep = {analyst_key(analyst) for analyst in analysts}
+        with self._lock:
+            stale = [key for key in self._entries if key[0] == thread_id and key[1] not in keep]
+            for key in stale:
+                self._entries.pop(key).cancel()
+                self.stats["cancelled"] += 1
+
+    def _missing(self, thread_id: str, analysts: List[Analyst]) -> List[Tuple[Tuple[str, str], Analyst]]:
+        self.retain(thread_id, analysts)
+        with self._lock:
+            return [((thread_id, analyst_key(a)), a) for a in analysts if (thread_id, analyst_key(a)) not in self._entries]
+
+    def _add(self, key: Tuple[str, str], entry: _Entry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self.stats["started"] += 1
+
+    def start(self, thread_id: Optional[str], topic: str, analysts: List[Analyst]) -> None:
+        """Prefetch first turns for ``analysts`` on background threads."""
+        if thread_id is None:
+            return
+        for key, analyst in self._missing(thread_id, analysts):
+            cancelled = threading.Event()
+            # Run in a copy of the caller's context so tracing callbacks still see the calls
+            job = self._pool().submit(contextvars.copy_context().run, _first_turn, _opening_state(topic, analyst), cancelled)
+            self._add(key, _Entry(job, cancelled))
+
+    async def astart(self, thread_id: Optional[str], topic: str, analysts: List[Analyst]) -> None:
+        """Prefetch first turns for ``analysts`` as tasks on the running event loop."""
+        if thread_id is None:
+            return
+        for key, analyst in self._missing(thread_id, analysts):
+            job = asyncio.create_task(_afirst_turn(_opening_state(topic, analyst)))
+            self._add(key, _Entry(job, threading.Event()))
+
+    def _pop(self, thread_id: Optional[str], analyst: Analyst) -> Optional[_Entry]:
+        with self._lock:
+            return self._entries.pop((thread_id, analyst_key(analyst)), None)
+
+    def _used(self, update: Optional[dict]) -> Optional[dict]:
+        if update is not None:
+            with self._lock:
+                self.stats["used"] += 1
+        return update
+
+    def take(self, thread_id: Optional[str], analyst: Analyst) -> Optional[dict]:
+        """Return the analyst's prefetched first turn, waiting for it if still running."""
+        entry = self._pop(thread_id, analyst)
+        if entry is None or not isinstance(entry.job, Future):
+            return None
+        try:
+            return self._used(entry.job.result())
+        except Exception as e:
+            print(f"Prefetch for {analyst.name} failed, interviewing without it: {e!r}")
+            return None
+
+    async def atake(self, thread_id: Optional[str], analyst: Analyst) -> Optional[dict]:
+        """Async version of ``take``."""
+        entry = self._pop(thread_id, analyst)
+        if entry is None:
+            return None
+        try:
+            job = entry.job if isinstance(entry.job, asyncio.Task) else asyncio.wrap_future(entry.job)
+            return self._used(await job)
+        except Exception as e:
+            print(f"Prefetch for {analyst.name} failed, interviewing without it: {e!r}")
+            return None
+
+
+prefetcher = Prefetcher()
+
+
+# NODE 0
+def warm_start(state: InterviewState, config: RunnableConfig = None) -> dict:
+    """Start the interview from its prefetched first turn, if there is one."""
+    return prefetcher.take(_thread_id(config), state["analyst"]) or {}
+
+async def awarm_start(state: InterviewState, config: RunnableConfig = None) -> dict:
+    return await prefetcher.atake(_thread_id(config), state["analyst"]) or {}
+
+
+def route_warm_start(state: InterviewState) -> str:
+    """Skip the first question and retrieval when they were prefetched."""
+    return "answer_question" if state.get("search_queries") else "ask_question"
@@ -0,0 +1,196 @@
+"""
+Interviews run by worker processes through a durable SQLite queue.
+
+With ``RESEARCH_INTERVIEW_WORKERS`` > 0 the ``conduct_interviews`` node of
+the research graph no longer runs ``interview_graph`` in-process. Each
+``Send`` payload is queued instead, and a pool of worker processes runs the
+interviews and hands back their sections and sources. CPU work such as
+parsing search results and building prompts is then spread over cores
+rather than sharing one GIL.
+
+More workers can attach to the same queue from other terminals:
+    python interview_worker.py
+"""
+import argparse
+import asyncio
+import atexit
+import hashlib
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from typing import Callable, List, Optional
+
+from langchain_core.runnables import RunnableConfig
+
+from config import settings
+from states.interview_state import InterviewState
+from utils.checkpointing import checkpointer
+from utils.report_stream import report_stream
+from utils.tracing import RunTracer, merge_trace
+from utils.work_queue import WorkQueue
+from graphs.interview.interview_graph import interview_graph
+
+
+_POLL_SECONDS = 0.2
+
+_queue: Optional[WorkQueue] = None
+_queue_lock = threading.Lock()
+
+
+def work_queue() -> WorkQueue:
+    """Return this process's connection to the interview queue."""
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                _queue = WorkQueue(settings.interview_queue_db, settings.interview_lease_seconds, settings.interview_max_attempts)
+    return _queue
+
+
+def interview_task_id(state: InterviewState, config: Optional[RunnableConfig]) -> str:
+    """Identify an interview by run and analyst, so a resumed run waits on the task it already queued."""
+    thread_id = (config or {}).get("configurable", {}).get("thread_id") or uuid.uuid4().hex
+    analyst = hashlib.sha1(state["analyst"].model_dump_json().encode("utf-8")).hexdigest()[:16]
+    return f"{thread_id}:{analyst}"
+
+
+def run_interview(task_id: str, payload: dict) -> dict:
+    """
+    Run one interview to completion and return what the research graph collects from it.
+
+    With tracing enabled the interview's own trace is returned as well, so
+    the coordinator can merge it into the run's ``RunTracer``.
+    """
+    thread_id = f"interview_{hashlib.sha1(task_id.encode('utf-8')).hexdigest()[:16]}"
+    config = {"configurable": {"thread_id": thread_id}}
+    tracer = RunTracer() if settings.trace_enabled else None
+    if tracer is not None:
+        config["callbacks"] = [tracer]
+    state = interview_graph.invoke(payload, config)
+    checkpointer.delete_thread(thread_id)
+    result = {"sections": state.get("sections", []), "sources": state.get("sources", [])}
+    if tracer is not None:
+        result["trace"] = tracer.to_dict()
+    return result
+
+
+def _keep_leased(queue: WorkQueue, task_id: str, worker: str, done: threading.Event) -> None:
+    while not done.wait(queue.lease_seconds / 3):
+        queue.renew(task_id, worker)
+
+
+def serve(worker: Optional[str] = None) -> None:
+    """Claim and run interviews from the queue until the process is stopped."""
+    worker = worker or f"{os.uname().nodename}:{os.getpid()}"
+    # The coordinator appends sections to the streamed report itself
+    settings.stream_output = False
+    queue = work_queue()
+    print(f"Interview worker {worker} serving {settings.interview_queue_db}")
+    while True:
+        task = queue.claim(worker)
+        if task is None:
+            time.sleep(_POLL_SECONDS)
+            continue
+        task_id, payload = task
+        done = threading.Event()
+        threading.Thread(target=_keep_leased, args=(queue, task_id, worker, done), daemon=True).start()
+        try:
+            queue.complete(task_id, run_interview(task_id, payload))
+        except Exception as e:
+            print(f"Interview {task_id} failed on {worker}: {e!r}")
+            queue.fail(task_id, repr(e))
+        finally:
+            done.set()
+
+
+def _worker_main(initializer: Optional[Callable[[], None]]) -> None:
+    if initializer is not None:
+        initializer()
+    try:
+        serve()
+    except KeyboardInterrupt:
+        pass
+
+
+_workers: List[multiprocessing.Process] = []
+_workers_lock = threading.Lock()
+
+
+def start_workers(count: Optional[int] = None, initializer: Optional[Callable[[], None]] = None) -> None:
+    """
+    Start the interview worker processes of this coordinator (once).
+
+    Workers are spawned rather than forked so they do not inherit the
+    coordinator's threads and open connections. ``initializer`` runs first
+    in every worker and must be picklable.
+    """
+    with _workers_lock:
+        if _workers:
+            return
+        context = multiprocessing.get_context("spawn")
+        for _ in range(count or settings.interview_workers):
+            process = context.Process(target=_worker_main, args=(initializer,), daemon=True, name="interview-worker")
+            process.start()
+            _workers.append(process)
+
+
+def stop_workers() -> None:
+    """Terminate the worker processes started by ``start_workers``."""
+    with _workers_lock:
+        for process in _workers:
+            process.terminate()
+        for process in _workers:
+            process.join(timeout=5)
+        _workers.clear()
+
+
+atexit.register(stop_workers)
+
+
+def _collect(result: dict, config: Optional[RunnableConfig]) -> dict:
+    trace = result.pop("trace", None)
+    if trace is not None:
+        merge_trace(trace)
+    stream = report_stream(config)
+    if stream is not None:
+        for section in result["sections"]:
+            stream.append_section(section)
+    return result
+
+
+# NODE
+def queue_interview(state: InterviewState, config: RunnableConfig = None) -> dict:
+    """Queue the interview for the worker processes and wait for its section."""
+    start_workers()
+    queue = work_queue()
+    task_id = interview_task_id(state, config)
+    queue.put(task_id, dict(state))
+    while True:
+        finished, result = queue.poll(task_id)
+        if finished:
+            return _collect(result, config)
+        time.sleep(_POLL_SECONDS)
+
+async def aqueue_interview(state: InterviewState, config: RunnableConfig = None) -> dict:
+    start_workers()
+    queue = work_queue()
+    task_id = interview_task_id(state, config)
+    await asyncio.to_thread(queue.put, task_id, dict(state))
+    while True:
+        finished, result = await asyncio.to_thread(queue.poll, task_id)
+        if finished:
+            return _collect(result, config)
+        await asyncio.sleep(_POLL_SECONDS)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run one interview worker attached to the configured queue."""
+    parser = argparse.ArgumentParser(description="Run interviews queued by research runs with RESEARCH_INTERVIEW_WORKERS > 0.")
+    parser.add_argument("--name", default=None, help="Worker name recorded on claimed tasks")
+    args = parser.parse_args(argv)
+    try:
+        serve(args.name)
+    except KeyboardInterrupt:
+        pass
@@ -1,13 +1,375 @@
 """LLM initialization with configuration."""
-from langchain_openai import ChatOpenAI
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
 from dotenv import load_dotenv
+from langchain_core.callbacks import BaseCallbackHandler
+
 from config import settings
+from utils.http_clients import CircuitBreaker
+from utils.llm_cache import DiskLLMCache
+from utils.rate_limiter import scheduler
+from utils.batch_api import BatchLLM
+from utils.tokens import estimate_tokens
 
 # Load environment variables from .env file
 load_dotenv()
 
-# Initialize LLM with settings from config
-llm = ChatOpenAI(
-    model=settings.openai_model,
-    temperature=settings.openai_temperature
-)
\ No newline at end of file
+# Persistent response cache shared by every call made through `llm`
+llm_cache = DiskLLMCache(
+    cache_dir=settings.llm_cache_dir,
+    ttl_seconds=settings.llm_cache_ttl_seconds,
+    max_bytes=settings.llm_cache_max_mb * 1024 * 1024
+) if settings.llm_cache_enabled else None
+
+
+# Graph nodes grouped by the kind of work their model calls do
+NODE_ROLES = {
+    "plan_queries": "planning",
+    "generate_question": "questioning",
+    "generate_answer": "answering",
+    "summarize_transcript": "summarizing",
+    "write_section": "section_writing",
+    "synthesize_sections": "synthesis",
+    "write_report": "synthesis",
+    "write_introduction": "synthesis",
+    "write_conclusion": "synthesis",
+    "write_intro_conclusion": "synthesis",
+}
+
+# Roles whose short, structured outputs do not need the primary model
+FAST_ROLES = {"planning", "questioning", "summarizing"}
+
+# Rate-limited calls are admitted lowest first: work that finishes a run
+# goes ahead of work that starts new interview turns
+ROLE_PRIORITIES = {
+    "synthesis": 0,
+    "section_writing": 1,
+    "answering": 2,
+    "summarizing": 2,
+    "planning": 3,
+    "questioning": 4,
+}
+DEFAULT_PRIORITY = 2
+
+
+def create_llm(model: str = None, **kwargs):
+    """Create a chat model from settings; imports the OpenAI client on first call."""
+    from langchain_openai import ChatOpenAI
+
+    return ChatOpenAI(
+        model=model or settings.openai_model,
+        temperature=settings.openai_temperature,
+        cache=llm_cache,
+        **kwargs
+    )
+
+
+def model_for(node: str) -> str:
+    """
+    Return the model name a graph node should use.
+
+    ``RESEARCH_MODEL_ROUTES`` entries for the node itself win over entries
+    for its role; otherwise planning and questioning use the fast model and
+    everything else the primary model.
+    """
+    role = NODE_ROLES.get(node)
+    routes = settings.model_routes
+    if node in routes:
+        return routes[node]
+    if role in routes:
+        return routes[role]
+    return settings.fast_model if role in FAST_ROLES else settings.openai_model
+
+
+class LazyLLM:
+    """
+    Stand-in for the chat model that builds it on first attribute access.
+
+    Importing ``langchain_openai`` and constructing the client dominates
+    import time, so it is deferred until a node actually calls the model.
+    """
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._model = None
+        self._lock = threading.Lock()
+
+    @property
+    def model(self):
+        """The underlying chat model, created on first use."""
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    self._model = self._factory()
+        return self._model
+
+    # Explicit delegates, so graph compilation can introspect node functions
+    # that reference ``llm.invoke`` etc. without constructing the client
+    def invoke(self, *args, **kwargs):
+        return self.model.invoke(*args, **kwargs)
+
+    async def ainvoke(self, *args, **kwargs):
+        return await self.model.ainvoke(*args, **kwargs)
+
+    def batch(self, *args, **kwargs):
+        return self.model.batch(*args, **kwargs)
+
+    async def abatch(self, *args, **kwargs):
+        return await self.model.abatch(*args, **kwargs)
+
+    def stream(self, *args, **kwargs):
+        return self.model.stream(*args, **kwargs)
+
+    def astream(self, *args, **kwargs):
+        return self.model.astream(*args, **kwargs)
+
+    def with_structured_output(self, *args, **kwargs):
+        return self.model.with_structured_output(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.model, name)
+
+
+class LatencyBudget(BaseCallbackHandler):
+    """Counts calls that fail or exceed the latency budget against a model's circuit breaker."""
+
+    run_inline = True
+
+    def __init__(self, model: str, breaker: CircuitBreaker, latency_seconds: float):
+        self.model = model
+        self.breaker = breaker
+        self.latency_seconds = latency_seconds
+        self._started: Dict = {}
+
+    def _failure(self) -> None:
+        was_allowed = self.breaker.allow()
+        self.breaker.record_failure()
+        if was_allowed and not self.breaker.allow():
+            print(f"{self.model} is over its latency/error budget; using {settings.fallback_model} "
+                  f"for {self.breaker.reset_seconds:.0f}s")
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs) -> None:
+        self._started[run_id] = time.perf_counter()
+
+    def on_llm_end(self, response, *, run_id, **kwargs) -> None:
+        started = self._started.pop(run_id, None)
+        if started is not None and time.perf_counter() - started > self.latency_seconds:
+            self._failure()
+        else:
+            self.breaker.record_success()
+
+    def on_llm_error(self, error, *, run_id, **kwargs) -> None:
+        self._started.pop(run_id, None)
+        self._failure()
+
+
+class FallbackLLM(LazyLLM):
+    """
+    ``LazyLLM`` for a model with a fallback.
+
+    Each call to the primary model is bounded by the latency budget and
+    falls back to the fallback model when it fails or times out. Once
+    ``RESEARCH_FALLBACK_ERROR_BUDGET`` calls in a row have failed or been
+    slow, calls go straight to the fallback until the breaker resets.
+    """
+
+    def __init__(self, model: str, fallback: LazyLLM):
+        self.breaker = CircuitBreaker(settings.fallback_error_budget, settings.fallback_reset_seconds)
+        self.fallback = fallback
+        budget = LatencyBudget(model, self.breaker, settings.fallback_latency_seconds)
+        super().__init__(lambda: create_llm(
+            model,
+            timeout=settings.fallback_latency_seconds,
+            max_retries=0,
+            callbacks=[budget]
+        ).with_fallbacks([fallback.model]))
+
+    @property
+    def model(self):
+        if not self.breaker.allow():
+            return self.fallback.model
+        return super().model
+
+
+def _estimate_tokens(input: Any) -> int:
+    """Estimate the tokens a call will use: its prompt plus the expected completion."""
+    if hasattr(input, "to_messages"):
+        input = input.to_messages()
+    if isinstance(input, str):
+        prompt = estimate_tokens(input)
+    else:
+        prompt = sum(estimate_tokens(str(getattr(message, "content", message))) for message in input)
+    return prompt + settings.llm_completion_tokens
+
+
+def _used_tokens(result: Any) -> Optional[int]:
+    usage = getattr(result, "usage_metadata", None)
+    return usage.get("total_tokens") if usage else None
+
+
+def _add_usage(used: Optional[int], chunk: Any) -> Optional[int]:
+    """Accumulate the usage reported by stream chunks (usually only the last one carries it)."""
+    tokens = _used_tokens(chunk)
+    return used if tokens is None else (used or 0) + tokens
+
+
+class _Admission:
+    def __init__(self, priority: int, estimate: int):
+        self.priority = priority
+        self.estimate = estimate
+        self._admitted = False
+
+    async def admit(self) -> None:
+        if not self._admitted:
+            await scheduler.aacquire(self.priority, self.estimate)
+            self._admitted = True
+
+
+class ScheduledCall(_Admission):
+    """
+    Awaitable ``ainvoke`` that is admitted by the rate scheduler before it runs.
+
+    ``utils.concurrency.limited`` awaits ``admit`` before taking a
+    concurrency slot, so calls waiting for budget do not hold slots that
+    higher-priority calls need to reach the scheduler.
+    """
+
+    def __init__(self, call, priority: int, estimate: int):
+        super().__init__(priority, estimate)
+        self._call = call
+
+    async def _run(self):
+        await self.admit()
+        result = await self._call()
+        scheduler.settle(self.estimate, _used_tokens(result))
+        return result
+
+    def __await__(self):
+        return self._run().__await__()
+
+
+class ScheduledStream(_Admission):
+    """``astream`` counterpart of ``ScheduledCall``: an async chunk iterator admitted before it starts."""
+
+    def __init__(self, stream, priority: int, estimate: int):
+        super().__init__(priority, estimate)
+        self._stream = stream
+
+    async def __aiter__(self):
+        await self.admit()
+        used = None
+        try:
+            async for chunk in self._stream():
+                used = _add_usage(used, chunk)
+                yield chunk
+        finally:
+            scheduler.settle(self.estimate, used)
+
+
+class ScheduledLLM:
+    """
+    A node's view of a shared chat model whose calls wait for the rate scheduler.
+
+    Every call is admitted by ``utils.rate_limiter.scheduler`` at the
+    priority of the node's role before it reaches the model, and the
+    estimate it was charged is settled against the reported usage.
+    """
+
+    def __init__(self, llm, priority: int):
+        self._llm = llm
+        self.priority = priority
+
+    def invoke(self, input, *args, **kwargs):
+        estimate = _estimate_tokens(input)
+        scheduler.acquire(self.priority, estimate)
+        result = self._llm.invoke(input, *args, **kwargs)
+        scheduler.settle(estimate, _used_tokens(result))
+        return result
+
+    def ainvoke(self, input, *args, **kwargs) -> "ScheduledCall":
+        return ScheduledCall(lambda: self._llm.ainvoke(input, *args, **kwargs), self.priority, _estimate_tokens(input))
+
+    @staticmethod
+    def _settle_all(estimates: List[int], results: list) -> list:
+        for estimate, result in zip(estimates, results):
+            scheduler.settle(estimate, _used_tokens(result))
+        return results
+
+    def batch(self, inputs, *args, **kwargs):
+        estimates = [_estimate_tokens(input) for input in inputs]
+        for estimate in estimates:
+            scheduler.acquire(self.priority, estimate)
+        return self._settle_all(estimates, self._llm.batch(inputs, *args, **kwargs))
+
+    async def abatch(self, inputs, *args, **kwargs):
+        estimates = [_estimate_tokens(input) for input in inputs]
+        for estimate in estimates:
+            await scheduler.aacquire(self.priority, estimate)
+        return self._settle_all(estimates, await self._llm.abatch(inputs, *args, **kwargs))
+
+    def stream(self, input, *args, **kwargs):
+        estimate = _estimate_tokens(input)
+        scheduler.acquire(self.priority, estimate)
+        used = None
+        try:
+            for chunk in self._llm.stream(input, *args, **kwargs):
+                used = _add_usage(used, chunk)
+                yield chunk
+        finally:
+            scheduler.settle(estimate, used)
+
+    def astream(self, input, *args, **kwargs) -> "ScheduledStream":
+        return ScheduledStream(lambda: self._llm.astream(input, *args, **kwargs), self.priority, _estimate_tokens(input))
+
+    def with_structured_output(self, *args, **kwargs):
+        return ScheduledLLM(self._llm.with_structured_output(*args, **kwargs), self.priority)
+
+    def __getattr__(self, name):
+        return getattr(self._llm, name)
+
+
+def node_priority(node: str) -> int:
+    """Return the scheduling priority of a node's LLM calls (lower is admitted first)."""
+    return ROLE_PRIORITIES.get(NODE_ROLES.get(node), DEFAULT_PRIORITY)
+
+
+_llms: Dict[str, LazyLLM] = {}
+_llms_lock = threading.Lock()
+
+
+def _shared_llm(model: str) -> LazyLLM:
+    """Return the process-wide instance for ``model``."""
+    with _llms_lock:
+        instance = _llms.get(model)
+        if instance is not None:
+            return instance
+    fallback = settings.fallback_model
+    if fallback and fallback != model:
+        instance = FallbackLLM(model, _shared_llm(fallback))
+    else:
+        instance = LazyLLM(lambda: create_llm(model))
+    with _llms_lock:
+        return _llms.setdefault(model, instance)
+
+
+def llm_for(node: str):
+    """
+    Return the shared chat model routed to ``node`` (see ``model_for``).
+
+    With ``RESEARCH_LLM_RPM``/``RESEARCH_LLM_TPM`` set, it comes wrapped in
+    a ``ScheduledLLM`` that waits for the node's turn under the budgets. In
+    batch mode (``RESEARCH_BATCH_LLM``) calls are collected for the batch
+    API instead (see ``utils.batch_api.BatchLLM``).
+    """
+    if settings.batch_llm:
+        return BatchLLM(model_for(node))
+    llm = _shared_llm(model_for(node))
+    if not scheduler.enabled:
+        return llm
+    return ScheduledLLM(llm, node_priority(node))
+
+
+# Default LLM with settings from config (constructed on first use)
+llm = _shared_llm(settings.openai_model)
@@ -0,0 +1,12 @@
+"""
+Run an interview worker attached to the queue of research runs with
+``RESEARCH_INTERVIEW_WORKERS`` > 0 (see ``graphs/interview/workers.py``).
+
+Usage:
+    python interview_worker.py [--name NAME]
+"""
+from graphs.interview.workers import main
+
+
+if __name__ == "__main__":
+    main()
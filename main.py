@@ -1,16 +1,90 @@
 """Main entry point for the research assistant application."""
+import asyncio
+import os
+from typing import Optional
+
 from config import settings
+from init_llm import llm_cache
+from utils.search_cache import search_cache
+from utils.concurrency import set_concurrency_limit
+from utils.rate_limiter import scheduler
 from graphs.analyst.analyst_graph import main_builder_graph
-from utils.file_utils import save_graph_image, save_report
+from graphs.interview.prefetch import prefetcher
+from utils.file_utils import save_graph_image, save_report, save_trace
+from utils.tracing import RunTracer
+from utils.checkpointing import run_thread_id, is_resumable, discard_thread, adiscard_thread, prune_thread, aprune_thread
+from utils.report_stream import FINAL_REPORT_FILE, stream_directory
+
+
+DEFAULT_TOPIC = "The benefits of adopting LangGraph as an agent framework"
+DEFAULT_FEEDBACK = "Add in the CEO of gen ai native startup"
+
+
+def print_analysts(event: dict) -> None:
+    """Print the analyst personas contained in a stream event, if any."""
+    analysts = event.get('analysts', '')
+    if analysts:
+        for analyst in analysts:
+            print(f"Name: {analyst.name}")
+            print(f"Affiliation: {analyst.affiliation}")
+            print(f"Role: {analyst.role}")
+            print(f"Description: {analyst.description}")
+            print("-" * 50)
+
+
+def print_cache_stats() -> None:
+    """Print LLM cache, search cache, rate scheduler and prefetch counters for the current process."""
+    if llm_cache is not None:
+        print(f"LLM cache: {llm_cache.stats}")
+    print(f"Search cache: {search_cache.stats}")
+    if scheduler.enabled:
+        print(f"Rate scheduler: {scheduler.stats}")
+    if settings.prefetch:
+        print(f"Prefetch: {prefetcher.stats}")
+
+
+def build_thread(thread_id: str, tracer: RunTracer = None) -> dict:
+    """Build the run config for a thread, attaching the tracer if one is given."""
+    thread = {"configurable": {"thread_id": thread_id}}
+    if tracer is not None:
+        thread["callbacks"] = [tracer]
+    return thread
+
+
+def announce_stream(thread_id: str) -> None:
+    """Tell the user where streamed output appears, if streaming output is enabled."""
+    if settings.stream_output:
+        print(f"Streaming sections and report to {stream_directory(thread_id)}")
+
+
+def save_final_report(report: str, thread_id: str) -> Optional[str]:
+    """Save the final report, or point at the copy already assembled on disk when streaming."""
+    if settings.stream_output and report:
+        path = os.path.join(stream_directory(thread_id), FINAL_REPORT_FILE)
+        print(f"Report written to {path}")
+        return path
+    return save_report(report)
 
 
-def main(topic: str = None, max_analysts: int = None):
+def report_trace(tracer: RunTracer = None) -> None:
+    """Print the per-node summary table and save the JSON trace."""
+    if tracer is not None:
+        print(tracer.summary_table())
+        save_trace(tracer, settings.output_directory)
+
+
+def main(topic: str = None, max_analysts: int = None, thread_id: str = None):
     """
     Run the research assistant workflow.
-    
+
+    If the thread already has a checkpoint past analyst approval (e.g. the
+    previous run crashed during interviews), the run resumes from it and
+    only the unfinished interviews are executed again.
+
     Args:
         topic: Research topic to investigate
         max_analysts: Maximum number of analyst personas to create
+        thread_id: Checkpoint thread to use (defaults to one derived from the topic)
     """
     # Save graph visualization if enabled
     if settings.save_graph_images:
@@ -18,47 +92,45 @@ def main(topic: str = None, max_analysts: int = None):
 
     # Use provided values or defaults from config
     if topic is None:
-        topic = "The benefits of adopting LangGraph as an agent framework"
+        topic = DEFAULT_TOPIC
     if max_analysts is None:
         max_analysts = settings.max_analysts
-    
-    thread = {"configurable": {"thread_id": "1"}}
-
-    # Run the graph until the first interruption
-    for event in main_builder_graph.stream({"topic":topic,
-                            "max_analysts":max_analysts}, 
-                            thread, 
-                            stream_mode="values"):
-        
-        analysts = event.get('analysts', '')
-        if analysts:
-            for analyst in analysts:
-                print(f"Name: {analyst.name}")
-                print(f"Affiliation: {analyst.affiliation}")
-                print(f"Role: {analyst.role}")
-                print(f"Description: {analyst.description}")
-                print("-" * 50)
-
-
-    # We now update the state as if we are the human_feedback node
-    main_builder_graph.update_state(thread, {"human_analyst_feedback": 
-                                    "Add in the CEO of gen ai native startup"}, as_node="human_feedback")
-
-
-    # Check
-    for event in main_builder_graph.stream(None, thread, stream_mode="values"):
-        analysts = event.get('analysts', '')
-        if analysts:
-            for analyst in analysts:
-                print(f"Name: {analyst.name}")
-                print(f"Affiliation: {analyst.affiliation}")
-                print(f"Role: {analyst.role}")
-                print(f"Description: {analyst.description}")
-                print("-" * 50)  
-
-    # Confirm we are happy
-    main_builder_graph.update_state(thread, {"human_analyst_feedback": 
-                                None}, as_node="human_feedback")
+
+    if thread_id is None:
+        thread_id = run_thread_id(topic, max_analysts)
+
+    tracer = RunTracer() if settings.trace_enabled else None
+    thread = build_thread(thread_id, tracer)
+    announce_stream(thread_id)
+
+    snapshot = main_builder_graph.get_state(thread)
+    if is_resumable(snapshot):
+        print(f"Resuming thread {thread_id} from its last checkpoint")
+    else:
+        if snapshot.values:
+            # A finished run that was not pruned, or one stopped before approval: start over
+            discard_thread(thread_id)
+
+        # Run the graph until the first interruption
+        for event in main_builder_graph.stream({"topic":topic,
+                                "max_analysts":max_analysts},
+                                thread,
+                                stream_mode="values"):
+            print_analysts(event)
+
+
+        # We now update the state as if we are the human_feedback node
+        main_builder_graph.update_state(thread, {"human_analyst_feedback":
+                                        DEFAULT_FEEDBACK}, as_node="human_feedback")
+
+
+        # Check
+        for event in main_builder_graph.stream(None, thread, stream_mode="values"):
+            print_analysts(event)
+
+        # Confirm we are happy
+        main_builder_graph.update_state(thread, {"human_analyst_feedback":
+                                    None}, as_node="human_feedback")
 
     # Continue
     for event in main_builder_graph.stream(None, thread, stream_mode="updates"):
@@ -69,11 +141,87 @@ def main(topic: str = None, max_analysts: int = None):
     final_state = main_builder_graph.get_state(thread)
     report = final_state.values.get('final_report')
 
-    save_report(report)
+    if save_final_report(report, thread_id):
+        prune_thread(thread_id)
+
+    print_cache_stats()
+    report_trace(tracer)
+
+    print("Graph execution complete...")
+
+
+async def amain(topic: str = None, max_analysts: int = None, max_concurrency: int = None, thread_id: str = None):
+    """
+    Run the research assistant workflow on the event loop using the async node implementations.
+
+    Args:
+        topic: Research topic to investigate
+        max_analysts: Maximum number of analyst personas to create
+        max_concurrency: Maximum number of in-flight LLM and search calls across all interviews
+        thread_id: Checkpoint thread to use (defaults to one derived from the topic)
+    """
+    if settings.save_graph_images:
+        save_graph_image(main_builder_graph)
+
+    if topic is None:
+        topic = DEFAULT_TOPIC
+    if max_analysts is None:
+        max_analysts = settings.max_analysts
+    if max_concurrency is None:
+        max_concurrency = settings.max_concurrency
+    set_concurrency_limit(max_concurrency)
+
+    if thread_id is None:
+        thread_id = run_thread_id(topic, max_analysts)
+
+    tracer = RunTracer() if settings.trace_enabled else None
+    thread = build_thread(thread_id, tracer)
+    announce_stream(thread_id)
+
+    snapshot = await main_builder_graph.aget_state(thread)
+    if is_resumable(snapshot):
+        print(f"Resuming thread {thread_id} from its last checkpoint")
+    else:
+        if snapshot.values:
+            # A finished run that was not pruned, or one stopped before approval: start over
+            await adiscard_thread(thread_id)
+
+        # Run the graph until the first interruption
+        async for event in main_builder_graph.astream({"topic": topic,
+                                                       "max_analysts": max_analysts},
+                                                      thread,
+                                                      stream_mode="values"):
+            print_analysts(event)
+
+        await main_builder_graph.aupdate_state(thread, {"human_analyst_feedback":
+                                               DEFAULT_FEEDBACK}, as_node="human_feedback")
+
+        async for event in main_builder_graph.astream(None, thread, stream_mode="values"):
+            print_analysts(event)
+
+        await main_builder_graph.aupdate_state(thread, {"human_analyst_feedback":
+                                               None}, as_node="human_feedback")
+
+    async for event in main_builder_graph.astream(None, thread, stream_mode="updates"):
+        print("--Node--")
+        node_name = next(iter(event.keys()))
+        print(node_name)
+
+    final_state = await main_builder_graph.aget_state(thread)
+    report = final_state.values.get('final_report')
+
+    if save_final_report(report, thread_id):
+        await aprune_thread(thread_id)
+
+    print_cache_stats()
+    report_trace(tracer)
 
     print("Graph execution complete...")
 
 
 
 if __name__ == "__main__":
-    main()
+    if settings.async_execution:
+        asyncio.run(amain())
+    else:
+        main()
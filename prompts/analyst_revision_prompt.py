@@ -0,0 +1,26 @@
+ANALYST_REVISION_PROMPT = """ 
+
+You are revising an existing set of AI analyst personas based on editorial feedback. Follow these instructions carefully:
+ 
+1. First, review the research topic:
+ 
+{topic}
+ 
+2. Review the current analysts, numbered:
+ 
+{analysts}
+ 
+3. Examine the editorial feedback:
+ 
+{human_analyst_feedback}
+ 
+4. Change only what the feedback asks for:
+   - List the numbers of analysts the feedback asks to drop under removed.
+   - Rewrite an analyst only if the feedback is about that analyst, and list it under changed with its number.
+   - Put analysts the feedback asks for that do not replace an existing one under added.
+ 
+5. Leave every other analyst out of your answer; they are kept exactly as they are.
+ 
+6. Unless the feedback asks for more, keep the total number of analysts at {max_analysts} or fewer.
+
+"""
@@ -6,9 +6,7 @@ Here is analyst area of focus: {goals}.
  
 You goal is to answer a question posed by the interviewer.
  
-To answer question, use this context:
- 
-{context}
+After the interview so far, you will be given the context to use for answering the latest question.
  
 When answering questions, follow these guidelines:
  
@@ -27,4 +25,8 @@ When answering questions, follow these guidelines:
 [1] assistant/docs/llama3_1.pdf, page 7
  
 And skip the addition of the brackets as well as the Document source preamble in your citation.
-"""
\ No newline at end of file
+"""
+
+EXPERT_CONTEXT_PROMPT = """To answer the latest question, use this context:
+ 
+{context}"""
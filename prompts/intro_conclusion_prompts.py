@@ -4,7 +4,7 @@ You will be given all of the sections of the report.
 
 You job is to write a crisp and compelling introduction or conclusion section.
 
-The user will instruct you whether to write the introduction or conclusion.
+The user will instruct you whether to write the introduction, the conclusion, or both.
 
 Include no pre-amble for either section.
 
@@ -16,6 +16,6 @@ For your introduction, create a compelling title and use the # header for the ti
 
 For your introduction, use ## Introduction as the section header. 
 
-For your conclusion, use ## Conclusion as the section header.
+For your conclusion, use ## Conclusion as the section header."""
 
-Here are the sections to reflect on for writing: {formatted_str_sections}"""
+INTRO_CONCLUSION_SECTIONS = """Here are the sections to reflect on for writing: {formatted_str_sections}"""
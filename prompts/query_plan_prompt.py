@@ -0,0 +1,15 @@
+QUERY_PLAN_PROMPT = """
+You will be given a conversation between an analyst and an expert.
+ 
+Your goal is to plan the retrieval for the final question posed by the analyst, producing one query per source.
+ 
+First, analyze the full conversation.
+ 
+Pay particular attention to the final question posed by the analyst.
+ 
+Then write:
+ 
+1. web_query: a well-structured web search query, phrased the way a person would type it into a search engine. Include specific names, products, dates or recent events where relevant.
+ 
+2. wikipedia_query: a short encyclopedic query naming the concept, technology, organization or person that a Wikipedia article would be titled after.
+"""
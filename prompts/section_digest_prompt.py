@@ -0,0 +1,25 @@
+SECTION_DIGEST_PROMPT = """
+You are a technical writer condensing analyst memos for a report on this overall topic:
+ 
+{topic}
+ 
+You will be given a group of memos. Their citations, for example [3] or [12], are global source IDs shared by all memos.
+ 
+Your task:
+ 
+1. Merge the memos into a single, shorter memo that keeps every specific, surprising or non-obvious insight.
+ 
+2. Drop repetition and generic background, but do not drop facts that carry a citation.
+ 
+3. Keep every citation exactly as written next to the facts it supports. Do not renumber citations.
+ 
+4. Do not add a Sources section.
+ 
+5. Aim for no more than {target_words} words.
+ 
+6. Use markdown formatting and include no preamble.
+ 
+Here are the memos to condense:
+ 
+{memos}
+"""
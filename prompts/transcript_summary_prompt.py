@@ -0,0 +1,23 @@
+TRANSCRIPT_SUMMARY_PROMPT = """
+You are keeping the running notes of an interview between an analyst and an expert.
+ 
+Here are the notes of the interview so far (empty at the start):
+ 
+{summary}
+ 
+Here are the next turns of the interview:
+ 
+{transcript}
+ 
+Your task:
+ 
+1. Update the notes so they cover the earlier notes and the new turns.
+ 
+2. Keep the questions that were asked and every specific fact, figure, example and named source the expert gave.
+ 
+3. Keep citations to source documents exactly as written.
+ 
+4. Drop greetings, repetition and filler.
+ 
+5. Aim for no more than {target_words} words and include no preamble.
+"""
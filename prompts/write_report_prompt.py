@@ -31,15 +31,9 @@ To format your report:
  
 5. Do not mention any analyst names in your report.
  
-6. Preserve any citations in the memos, which will be annotated in brackets, for example [1] or [2].
+6. Preserve any citations in the memos exactly as written, for example [3] or [12]. They are global source IDs shared by all memos, so do not renumber or merge them.
  
-7. Create a final, consolidated list of sources and add to a Sources section with the ## Sources header.
- 
-8. List your sources in order and do not repeat.
- 
-[1] Source 1
- 
-[2] Source 2
+7. Do not add a Sources section; the list of sources is appended automatically.
  
 Here are the memos from your analysts to build your report from:
  
@@ -0,0 +1,381 @@
+"""
+Long-running local research service on one compiled graph.
+
+The graph, the LLM clients and the search clients are built once at
+startup and shared by every job. Jobs go through a bounded queue to a
+fixed number of workers that drive ``main_builder_graph`` on the async
+path. Node-level progress (``stream_mode="updates"``, including the
+interview subgraphs) is published as server-sent events. The
+``human_feedback`` interrupt is exposed as an API call: a job pauses in
+``awaiting_feedback`` and leaves its worker until feedback arrives.
+
+Endpoints:
+    POST /jobs                  {"topic": "...", "max_analysts": 3, "max_interview_turns": 2}
+    GET  /jobs                  list jobs
+    GET  /jobs/<id>             job status, analysts and report path
+    GET  /jobs/<id>/events      server-sent events of the job (replayed from the start)
+    POST /jobs/<id>/feedback    {"feedback": "Add in the CEO of gen ai native startup"} or {"feedback": null} to approve
+    GET  /health                queue and worker status
+
+Usage:
+    python server.py --port 8765 --workers 2
+    curl -N localhost:8765/jobs/<id>/events
+"""
+import argparse
+import asyncio
+import json
+import re
+import time
+import uuid
+from typing import Dict, List, Optional, Set, Tuple
+
+from config import settings
+from init_llm import NODE_ROLES, llm_for
+from graphs.analyst.analyst_graph import main_builder_graph
+from graphs.interview.interview_nodes import warm_search_clients
+from utils.concurrency import set_concurrency_limit
+from utils.file_utils import save_report, save_trace, slugify
+from utils.http_clients import http_session
+from utils.tracing import RunTracer
+from utils.checkpointing import adiscard_thread, aprune_thread
+
+
+TERMINAL_EVENTS = ("done", "failed")
+KEEPALIVE_SECONDS = 15
+
+_REASONS = {200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            409: "Conflict", 503: "Service Unavailable"}
+
+
+class Job:
+    """One research run, its status and the events published for it."""
+
+    def __init__(self, inputs: dict):
+        self.id = uuid.uuid4().hex[:12]
+        self.inputs = inputs
+        self.thread = {"configurable": {"thread_id": f"server_{self.id}"}}
+        self.tracer = RunTracer() if settings.trace_enabled else None
+        if self.tracer is not None:
+            self.thread["callbacks"] = [self.tracer]
+        self.status = "queued"
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.analysts: List[dict] = []
+        self.report: Optional[str] = None
+        self.error: Optional[str] = None
+        self.events: List[dict] = []
+        self._subscribers: Set[asyncio.Queue] = set()
+
+    def publish(self, event_type: str, **data) -> None:
+        """Record an event and hand it to every connected event stream."""
+        event = {"type": event_type, "time": time.time(), **data}
+        self.events.append(event)
+        for queue in self._subscribers:
+            queue.put_nowait(event)
+
+    def set_status(self, status: str, **data) -> None:
+        self.status = status
+        if status in TERMINAL_EVENTS:
+            self.finished_at = time.time()
+        self.publish(status, **data)
+
+    def subscribe(self) -> Tuple[List[dict], asyncio.Queue]:
+        """Return the events so far and a queue receiving the following ones."""
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers.add(queue)
+        return list(self.events), queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._subscribers.discard(queue)
+
+    def summary(self) -> dict:
+        return {
+            "id": self.id,
+            "topic": self.inputs["topic"],
+            "status": self.status,
+            "created_at": self.created_at,
+            "analysts": self.analysts,
+            "report": self.report,
+            "error": self.error,
+        }
+
+
+def _progress(namespace: tuple, update: dict) -> List[dict]:
+    """Describe one ``updates`` chunk as progress events (node name, subgraph path and updated keys)."""
+    events = []
+    for node, values in update.items():
+        if node.startswith("__"):
+            continue
+        event = {"node": node, "graph": "/".join(namespace), "keys": sorted(values) if isinstance(values, dict) else []}
+        if isinstance(values, dict) and values.get("analysts"):
+            event["analysts"] = [analyst.model_dump() for analyst in values["analysts"]]
+        events.append(event)
+    return events
+
+
+class ResearchService:
+    """
+    Bounded job queue served by a fixed pool of worker tasks sharing one compiled graph.
+
+    Finished jobs are kept for ``job_ttl_seconds`` so their status and
+    events can still be fetched, then dropped with their checkpoints.
+    """
+
+    def __init__(self, workers: int, queue_size: int, output_dir: str, job_ttl_seconds: float = 3600):
+        self.workers = workers
+        self.output_dir = output_dir
+        self.job_ttl_seconds = job_ttl_seconds
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.jobs: Dict[str, Job] = {}
+        self.busy = 0
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self) -> None:
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._expire_jobs()))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def submit(self, inputs: dict) -> Job:
+        """Queue a new job; raises ``asyncio.QueueFull`` when the queue is at capacity."""
+        job = Job(inputs)
+        self.queue.put_nowait((job, None))
+        self.jobs[job.id] = job
+        job.set_status("queued")
+        return job
+
+    def feedback(self, job: Job, feedback: Optional[str]) -> None:
+        """Queue a paused job with human feedback (``None`` approves the analysts)."""
+        self.queue.put_nowait((job, {"feedback": feedback}))
+        job.set_status("queued", feedback=feedback)
+
+    async def _expire_jobs(self) -> None:
+        """Periodically drop finished jobs older than the TTL, including checkpoints left by failed runs."""
+        while True:
+            await asyncio.sleep(min(self.job_ttl_seconds, 60))
+            cutoff = time.time() - self.job_ttl_seconds
+            for job in [job for job in self.jobs.values() if job.finished_at is not None and job.finished_at < cutoff]:
+                del self.jobs[job.id]
+                await adiscard_thread(job.thread["configurable"]["thread_id"])
+
+    async def _worker(self) -> None:
+        while True:
+            job, action = await self.queue.get()
+            self.busy += 1
+            try:
+                await self._advance(job, action)
+            except Exception as e:
+                job.error = repr(e)
+                job.set_status("failed", error=job.error)
+            finally:
+                self.busy -= 1
+                self.queue.task_done()
+
+    async def _advance(self, job: Job, action: Optional[dict]) -> None:
+        """Run the job until the next interrupt or the end of the graph."""
+        graph_input = job.inputs
+        if action is not None:
+            await main_builder_graph.aupdate_state(
+                job.thread, {"human_analyst_feedback": action["feedback"]}, as_node="human_feedback"
+            )
+            graph_input = None
+
+        job.set_status("running")
+        async for namespace, update in main_builder_graph.astream(
+            graph_input, job.thread, stream_mode="updates", subgraphs=True
+        ):
+            for event in _progress(namespace, update):
+                job.publish("update", **event)
+
+        state = await main_builder_graph.aget_state(job.thread)
+        if state.next:
+            # Paused before human_feedback
+            job.analysts = [analyst.model_dump() for analyst in state.values.get("analysts", [])]
+            job.set_status("awaiting_feedback", analysts=job.analysts)
+            return
+
+        name = f"{slugify(job.inputs['topic'])}_{job.id}"
+        job.report = save_report(state.values.get("final_report"), self.output_dir, filename=f"final_report_{name}.md")
+        if job.tracer is not None:
+            save_trace(job.tracer, self.output_dir, filename=f"trace_{name}.json")
+        if job.report:
+            await aprune_thread(job.thread["configurable"]["thread_id"])
+        job.set_status("done", report=job.report)
+
+    def health(self) -> dict:
+        return {"workers": self.workers, "busy": self.busy, "queued": self.queue.qsize(),
+                "queue_size": self.queue.maxsize, "jobs": len(self.jobs)}
+
+
+def warm_clients() -> None:
+    """Construct the routed chat models and search clients so the first job does not pay for it."""
+    start = time.perf_counter()
+    try:
+        for node in ["create_analysts", *NODE_ROLES]:
+            llm_for(node).model
+        http_session()
+        warm_search_clients()
+    except Exception as e:
+        print(f"Could not warm every client ({e!r}); they will be built on first use")
+    print(f"Clients warmed in {time.perf_counter() - start:.2f}s")
+
+
+async def _write_head(writer: asyncio.StreamWriter, status: int, content_type: str, length: Optional[int] = None) -> None:
+    lines = [f"HTTP/1.1 {status} {_REASONS.get(status, '')}", f"Content-Type: {content_type}", "Connection: close"]
+    if length is None:
+        lines.append("Cache-Control: no-cache")
+    else:
+        lines.append(f"Content-Length: {length}")
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("utf-8"))
+    await writer.drain()
+
+
+async def _respond(writer: asyncio.StreamWriter, status: int, payload: dict) -> None:
+    body = json.dumps(payload).encode("utf-8")
+    await _write_head(writer, status, "application/json", len(body))
+    writer.write(body)
+    await writer.drain()
+
+
+async def _stream_events(writer: asyncio.StreamWriter, job: Job) -> None:
+    """Send the job's events as server-sent events until it finishes or the client goes away."""
+    history, queue = job.subscribe()
+    try:
+        await _write_head(writer, 200, "text/event-stream")
+
+        async def send(event: dict) -> bool:
+            writer.write(f"event: {event['type']}\ndata: {json.dumps(event)}\n\n".encode("utf-8"))
+            await writer.drain()
+            return event["type"] in TERMINAL_EVENTS
+
+        for event in history:
+            if await send(event):
+                return
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                writer.write(b": keep-alive\n\n")
+                await writer.drain()
+                continue
+            if await send(event):
+                return
+    finally:
+        job.unsubscribe(queue)
+
+
+async def _read_request(reader: asyncio.StreamReader) -> Tuple[str, str, dict]:
+    """Read one request; returns (method, path, JSON body)."""
+    request_line = (await reader.readline()).decode("latin-1").strip()
+    method, target = request_line.split(" ")[:2]
+    headers = {}
+    while True:
+        line = (await reader.readline()).decode("latin-1")
+        if line in ("\r\n", "\n", ""):
+            break
+        key, _, value = line.partition(":")
+        headers[key.strip().lower()] = value.strip()
+    length = int(headers.get("content-length") or 0)
+    body = json.loads(await reader.readexactly(length)) if length else {}
+    if not isinstance(body, dict):
+        raise ValueError("body must be a JSON object")
+    return method.upper(), target.split("?", 1)[0].rstrip("/") or "/", body
+
+
+async def _route(service: ResearchService, method: str, path: str, body: dict, writer: asyncio.StreamWriter) -> None:
+    if path == "/health":
+        return await _respond(writer, 200, service.health())
+    if path == "/jobs":
+        if method == "GET":
+            return await _respond(writer, 200, {"jobs": [job.summary() for job in service.jobs.values()]})
+        if method != "POST":
+            return await _respond(writer, 405, {"error": "use GET or POST"})
+        if not body.get("topic"):
+            return await _respond(writer, 400, {"error": "missing 'topic'"})
+        if not isinstance(body["topic"], str):
+            return await _respond(writer, 400, {"error": "'topic' must be a string"})
+        try:
+            inputs = {
+                "topic": body["topic"],
+                "max_analysts": int(body.get("max_analysts", settings.max_analysts)),
+                "max_interview_turns": int(body.get("max_interview_turns", settings.max_interview_turns)),
+            }
+        except (ValueError, TypeError):
+            return await _respond(writer, 400, {"error": "'max_analysts' and 'max_interview_turns' must be integers"})
+        try:
+            job = service.submit(inputs)
+        except asyncio.QueueFull:
+            return await _respond(writer, 503, {"error": "job queue is full, retry later"})
+        return await _respond(writer, 202, job.summary())
+
+    match = re.fullmatch(r"/jobs/([0-9a-f]+)(/events|/feedback)?", path)
+    job = service.jobs.get(match.group(1)) if match else None
+    if job is None:
+        return await _respond(writer, 404, {"error": "no such job"})
+    action = match.group(2)
+    if action is None:
+        return await _respond(writer, 200, job.summary())
+    if action == "/events":
+        return await _stream_events(writer, job)
+    if method != "POST":
+        return await _respond(writer, 405, {"error": "use POST"})
+    if job.status != "awaiting_feedback":
+        return await _respond(writer, 409, {"error": f"job is {job.status}, not awaiting feedback"})
+    try:
+        service.feedback(job, body.get("feedback"))
+    except asyncio.QueueFull:
+        return await _respond(writer, 503, {"error": "job queue is full, retry later"})
+    return await _respond(writer, 202, job.summary())
+
+
+def _handler(service: ResearchService):
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            try:
+                method, path, body = await _read_request(reader)
+            except (ValueError, json.JSONDecodeError) as e:
+                await _respond(writer, 400, {"error": f"bad request: {e}"})
+                return
+            await _route(service, method, path, body, writer)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+    return handle
+
+
+async def serve(host: str, port: int, workers: int, queue_size: int, output_dir: str) -> None:
+    """Warm the clients, start the workers and serve until cancelled."""
+    set_concurrency_limit(settings.max_concurrency)
+    warm_clients()
+    service = ResearchService(workers, queue_size, output_dir, settings.server_job_ttl_seconds)
+    service.start()
+    server = await asyncio.start_server(_handler(service), host, port)
+    print(f"Research service listening on http://{host}:{port} ({workers} workers, queue of {queue_size})")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.stop()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Parse arguments and run the service."""
+    parser = argparse.ArgumentParser(description="Serve research jobs over HTTP with server-sent progress events.")
+    parser.add_argument("--host", default=settings.server_host, help="Interface to listen on")
+    parser.add_argument("--port", type=int, default=settings.server_port, help="Port to listen on")
+    parser.add_argument("--workers", type=int, default=settings.server_workers, help="Jobs advanced concurrently")
+    parser.add_argument("--queue-size", type=int, default=settings.server_queue_size, help="Queued jobs before new ones are refused")
+    parser.add_argument("--output-dir", default=settings.output_directory, help="Where reports are written")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.queue_size, args.output_dir))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,7 @@
 """State definitions for the research assistant application."""
-from states.models import Analyst, Perspectives, SearchQuery
+from states.models import (
+    Analyst, Perspectives, AnalystEdit, AnalystRevision, SearchQuery, SearchQueries, IntroConclusion
+)
 from states.analyst_state import GenerateAnalystsState
 from states.interview_state import InterviewState
 from states.research_state import ResearchGraphState
@@ -7,7 +9,11 @@ from states.research_state import ResearchGraphState
 __all__ = [
     'Analyst',
     'Perspectives',
+    'AnalystEdit',
+    'AnalystRevision',
     'SearchQuery',
+    'SearchQueries',
+    'IntroConclusion',
     'GenerateAnalystsState',
     'InterviewState',
     'ResearchGraphState',
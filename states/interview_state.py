@@ -1,14 +1,23 @@
 """State definition for interview workflow."""
+import operator
 from langgraph.graph import MessagesState
 from typing import List, Annotated
-import operator
-from states.models import Analyst
+from states.models import Analyst, SearchQueries
+from utils.context_store import merge_context
+from utils.source_registry import merge_sources
 
 
 class InterviewState(MessagesState):
     """State for the interview workflow between analyst and expert."""
     max_num_turns: int
-    context: Annotated[List, operator.add]
+    context: Annotated[List, merge_context]
+    sources: Annotated[List[dict], merge_sources]
     analyst: Analyst
+    search_queries: SearchQueries
     interview: str
-    sections: list
\ No newline at end of file
+    sections: list
+    information_gain: Annotated[List[float], operator.add]
+    stop_early: bool
+    context_seen: int
+    summary: str
+    summarized: int
\ No newline at end of file
@@ -21,7 +21,32 @@ class Perspectives(BaseModel):
     analysts: List[Analyst] = Field(description="Comprehensive list of analysts with their role and affiliations")
 
 
+class AnalystEdit(BaseModel):
+    """Replacement for one existing analyst persona."""
+    number: int = Field(description="Number of the analyst being rewritten, as listed")
+    analyst: Analyst = Field(description="The rewritten analyst")
+
+
+class AnalystRevision(BaseModel):
+    """Changes to the current analysts requested by editorial feedback."""
+    removed: List[int] = Field(description="Numbers of the analysts to drop")
+    changed: List[AnalystEdit] = Field(description="Analysts to rewrite, by number")
+    added: List[Analyst] = Field(description="New analysts to add")
+
+
 class SearchQuery(BaseModel):
     """Represents a search query for information retrieval."""
     search_query: str = Field(None, description="Search query for retrieval")
 
+
+
+class SearchQueries(BaseModel):
+    """Source-specific search queries planned once per interview turn."""
+    web_query: str = Field(description="Search engine query for web retrieval")
+    wikipedia_query: str = Field(description="Encyclopedic query naming the Wikipedia article to retrieve")
+
+
+class IntroConclusion(BaseModel):
+    """Introduction and conclusion of the final report, written in one call."""
+    introduction: str = Field(description="Markdown introduction starting with a # title, then a ## Introduction section")
+    conclusion: str = Field(description="Markdown conclusion starting with a ## Conclusion section header")
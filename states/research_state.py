@@ -2,15 +2,21 @@
 from typing import TypedDict, List, Annotated
 import operator
 from states.models import Analyst
+from utils.source_registry import merge_sources
 
 
 class ResearchGraphState(TypedDict):
     """State for the main research graph that orchestrates the entire workflow."""
     topic: str
     max_analysts: int
+    max_interview_turns: int
     human_analyst_feedback: str
     analysts: List[Analyst]
     sections: Annotated[List, operator.add]
+    sources: Annotated[List[dict], merge_sources]
+    cited_sections: List[str]
+    citations: List[dict]
+    section_digests: List[str]
     introduction: str
     content: str
     conclusion: str
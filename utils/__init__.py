@@ -1,4 +1,10 @@
-from .file_utils import save_graph_image, save_report
-
-__all__ = ["save_graph_image", "save_report"]
+from .batch_api import BatchLLM, LocalBatchEndpoint, OpenAIBatchClient
+from .file_utils import save_graph_image, save_report, save_trace, slugify
+from .llm_cache import DiskLLMCache
+from .prompt_layout import layered_messages
+from .rate_limiter import RateScheduler, scheduler
+from .search_cache import SearchCache, search_cache
+from .tracing import RunTracer
+from .work_queue import WorkQueue
 
+__all__ = ["BatchLLM", "LocalBatchEndpoint", "OpenAIBatchClient", "save_graph_image", "save_report", "save_trace", "slugify", "DiskLLMCache", "layered_messages", "RateScheduler", "scheduler", "SearchCache", "search_cache", "RunTracer", "WorkQueue"]
@@ -0,0 +1,260 @@
+"""Batch-API execution of LLM calls: request/response format, the OpenAI client and a local stand-in endpoint."""
+import json
+import os
+import threading
+import time
+import uuid
+from typing import Callable, Dict, List, Optional
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, convert_to_messages
+from pydantic import BaseModel
+
+from config import settings
+
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+
+# Key of the interrupt payload that carries a node's pending LLM requests
+BATCH_REQUESTS = "llm_batch_requests"
+
+_ROLES = {"system": "system", "human": "user", "ai": "assistant"}
+
+
+class BatchError(RuntimeError):
+    """A submitted batch failed, expired or was cancelled."""
+
+
+def _message_dict(message: BaseMessage) -> dict:
+    entry = {"role": _ROLES.get(message.type, "user"), "content": message.content}
+    if message.name:
+        entry["name"] = message.name
+    return entry
+
+
+def chat_request(model: str, input, schema: Optional[type] = None) -> dict:
+    """Return the chat-completions request body of one LLM call, with a JSON schema for structured output."""
+    messages = [HumanMessage(content=input)] if isinstance(input, str) else convert_to_messages(input)
+    body = {
+        "model": model,
+        "temperature": settings.openai_temperature,
+        "messages": [_message_dict(message) for message in messages],
+    }
+    if schema is not None:
+        body["response_format"] = {
+            "type": "json_schema",
+            "json_schema": {"name": schema.__name__, "schema": schema.model_json_schema(), "strict": False},
+        }
+    return body
+
+
+def completion_body(model: str, content: str, prompt_tokens: int, completion_tokens: int) -> dict:
+    """Build a chat-completions response body, as found in a batch output file."""
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex[:24]}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        },
+    }
+
+
+def parse_response(body: dict, schema: Optional[type] = None):
+    """Turn a chat-completions response body into an ``AIMessage``, or a ``schema`` instance for structured output."""
+    content = body["choices"][0]["message"].get("content") or ""
+    if schema is not None:
+        return schema.model_validate_json(content)
+    usage = body.get("usage") or {}
+    return AIMessage(
+        content=content,
+        usage_metadata={
+            "input_tokens": usage.get("prompt_tokens", 0),
+            "output_tokens": usage.get("completion_tokens", 0),
+            "total_tokens": usage.get("total_tokens", 0),
+        },
+        response_metadata={"model_name": body.get("model")},
+    )
+
+
+def _input_lines(requests: Dict[str, dict]) -> str:
+    return "".join(
+        json.dumps({"custom_id": custom_id, "method": "POST", "url": BATCH_ENDPOINT, "body": body}) + "\n"
+        for custom_id, body in requests.items()
+    )
+
+
+def _read_output(text: str) -> Dict[str, dict]:
+    """Map custom IDs to response bodies; requests that failed are left out so they can be submitted again."""
+    results = {}
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        entry = json.loads(line)
+        response = entry.get("response") or {}
+        if entry.get("error") or response.get("status_code") != 200:
+            print(f"Batch request {entry.get('custom_id')} failed: {entry.get('error') or response.get('body')}")
+            continue
+        results[entry["custom_id"]] = response["body"]
+    return results
+
+
+class OpenAIBatchClient:
+    """Submits requests through the OpenAI Batch API (24h completion window, discounted pricing)."""
+
+    _FAILED = ("failed", "expired", "cancelling", "cancelled")
+
+    def __init__(self):
+        from openai import OpenAI
+
+        self._client = OpenAI()
+
+    def submit(self, requests: Dict[str, dict]) -> str:
+        """Upload ``requests`` (custom ID -> request body) and start a batch; returns the batch ID."""
+        upload = self._client.files.create(file=("requests.jsonl", _input_lines(requests).encode("utf-8")), purpose="batch")
+        batch = self._client.batches.create(input_file_id=upload.id, endpoint=BATCH_ENDPOINT, completion_window="24h")
+        return batch.id
+
+    def results(self, batch_id: str) -> Optional[Dict[str, dict]]:
+        """Return the response bodies by custom ID once the batch is done, or None while it runs."""
+        batch = self._client.batches.retrieve(batch_id)
+        if batch.status in self._FAILED:
+            raise BatchError(f"batch {batch_id} {batch.status}: {batch.errors}")
+        if batch.status != "completed":
+            return None
+        results = {}
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if file_id:
+                results.update(_read_output(self._client.files.content(file_id).text))
+        return results
+
+
+def openai_completion(body: dict) -> dict:
+    """Answer one request body with a regular (non-batch) chat-completions call."""
+    from init_llm import create_llm
+
+    llm = create_llm(body["model"])
+    kwargs = {"response_format": body["response_format"]} if "response_format" in body else {}
+    message = llm.invoke(body["messages"], **kwargs)
+    usage = message.usage_metadata or {}
+    return completion_body(body["model"], message.content, usage.get("input_tokens", 0), usage.get("output_tokens", 0))
+
+
+class LocalBatchEndpoint:
+    """
+    Stand-in for the batch API that works on a local directory.
+
+    ``submit`` writes ``<id>/input.jsonl`` in the Batch API format and
+    answers the requests on a background thread with ``respond`` (by
+    default regular chat-completions calls). The results are written to
+    ``<id>/output.jsonl``, no earlier than ``delay_seconds`` after
+    submission. A batch left unfinished by an earlier process is picked up
+    again when it is polled.
+    """
+
+    def __init__(self, directory: str, respond: Callable[[dict], dict] = openai_completion, delay_seconds: float = 0.0):
+        self.directory = directory
+        self.respond = respond
+        self.delay_seconds = delay_seconds
+        self._running = set()
+        self._lock = threading.Lock()
+
+    def _path(self, batch_id: str, name: str) -> str:
+        return os.path.join(self.directory, batch_id, name)
+
+    def _start(self, batch_id: str) -> None:
+        with self._lock:
+            if batch_id in self._running:
+                return
+            self._running.add(batch_id)
+        threading.Thread(target=self._process, args=(batch_id,), daemon=True, name=f"local-batch-{batch_id}").start()
+
+    def _process(self, batch_id: str) -> None:
+        started = time.monotonic()
+        lines: List[str] = []
+        with open(self._path(batch_id, "input.jsonl"), encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                request = json.loads(line)
+                try:
+                    response = {"status_code": 200, "request_id": uuid.uuid4().hex, "body": self.respond(request["body"])}
+                    error = None
+                except Exception as e:
+                    response, error = None, {"code": "request_failed", "message": repr(e)}
+                lines.append(json.dumps({"id": f"batch_req_{uuid.uuid4().hex[:24]}", "custom_id": request["custom_id"],
+                                         "response": response, "error": error}) + "\n")
+        time.sleep(max(0.0, self.delay_seconds - (time.monotonic() - started)))
+        partial = self._path(batch_id, "output.jsonl.part")
+        with open(partial, "w", encoding="utf-8") as f:
+            f.writelines(lines)
+        os.replace(partial, self._path(batch_id, "output.jsonl"))
+        with self._lock:
+            self._running.discard(batch_id)
+
+    def submit(self, requests: Dict[str, dict]) -> str:
+        batch_id = f"batch_{uuid.uuid4().hex[:16]}"
+        os.makedirs(os.path.join(self.directory, batch_id), exist_ok=True)
+        with open(self._path(batch_id, "input.jsonl"), "w", encoding="utf-8") as f:
+            f.write(_input_lines(requests))
+        self._start(batch_id)
+        return batch_id
+
+    def results(self, batch_id: str) -> Optional[Dict[str, dict]]:
+        if not os.path.exists(self._path(batch_id, "input.jsonl")):
+            raise BatchError(f"unknown local batch {batch_id}")
+        output = self._path(batch_id, "output.jsonl")
+        if not os.path.exists(output):
+            self._start(batch_id)
+            return None
+        with open(output, encoding="utf-8") as f:
+            return _read_output(f.read())
+
+
+class BatchLLM:
+    """
+    Chat model stand-in for batch-API runs (``RESEARCH_BATCH_LLM``).
+
+    A call does not reach the API. It pauses the graph with an
+    ``interrupt`` that carries the chat-completions requests, so the run
+    is checkpointed while it waits. The batch driver (``batch.py
+    --batch-api``) submits the requests of every paused task together
+    and resumes the graph with the responses. ``batch``/``abatch`` put
+    all their inputs into a single interrupt.
+    """
+
+    def __init__(self, model: str, schema: Optional[type] = None):
+        self.model = model
+        self.schema = schema
+
+    def _call(self, inputs: list) -> list:
+        from langgraph.types import interrupt
+
+        responses = interrupt({BATCH_REQUESTS: [chat_request(self.model, input, self.schema) for input in inputs]})
+        return [parse_response(response, self.schema) for response in responses]
+
+    def invoke(self, input, *args, **kwargs):
+        return self._call([input])[0]
+
+    async def ainvoke(self, input, *args, **kwargs):
+        return self._call([input])[0]
+
+    def batch(self, inputs: list, *args, **kwargs) -> list:
+        return self._call(list(inputs))
+
+    async def abatch(self, inputs: list, *args, **kwargs) -> list:
+        return self._call(list(inputs))
+
+    def stream(self, input, *args, **kwargs):
+        yield self.invoke(input)
+
+    async def astream(self, input, *args, **kwargs):
+        yield self.invoke(input)
+
+    def with_structured_output(self, schema: type, **kwargs) -> "BatchLLM":
+        if not (isinstance(schema, type) and issubclass(schema, BaseModel)):
+            raise TypeError("batch mode supports pydantic schemas only")
+        return BatchLLM(self.model, schema)
@@ -0,0 +1,117 @@
+"""Checkpoint backend selection, run identity and pruning."""
+import asyncio
+import hashlib
+import os
+import sqlite3
+from typing import Any, AsyncIterator, Optional, Sequence
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import BaseCheckpointSaver, ChannelVersions, Checkpoint, CheckpointMetadata, CheckpointTuple
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+from config import settings
+
+
+# Application models stored in graph state that checkpoints may deserialize
+ALLOWED_STATE_MODELS = [
+    ("states.models", "Analyst"),
+    ("states.models", "Perspectives"),
+    ("states.models", "SearchQuery"),
+    ("states.models", "SearchQueries"),
+    ("states.models", "IntroConclusion"),
+]
+
+
+class ThreadedSqliteSaver(SqliteSaver):
+    """
+    ``SqliteSaver`` that also supports the async checkpoint API.
+
+    The stock ``SqliteSaver`` raises on async calls, which the ``astream``
+    path needs. Its connection is already guarded by a lock, so the async
+    methods simply run the sync implementation in a worker thread.
+    """
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(self, config: Optional[RunnableConfig], *, filter: Optional[dict] = None,
+                    before: Optional[RunnableConfig] = None, limit: Optional[int] = None) -> AsyncIterator[CheckpointTuple]:
+        items = await asyncio.to_thread(lambda: list(self.list(config, filter=filter, before=before, limit=limit)))
+        for item in items:
+            yield item
+
+    async def aput(self, config: RunnableConfig, checkpoint: Checkpoint, metadata: CheckpointMetadata,
+                   new_versions: ChannelVersions) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, config: RunnableConfig, writes: Sequence[tuple[str, Any]], task_id: str,
+                          task_path: str = "") -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+
+def create_checkpointer() -> BaseCheckpointSaver:
+    """Create the checkpoint backend selected by ``settings.checkpointer``."""
+    serde = JsonPlusSerializer(allowed_msgpack_modules=ALLOWED_STATE_MODELS)
+    if settings.checkpointer == "memory":
+        return MemorySaver(serde=serde)
+    if settings.checkpointer == "sqlite":
+        directory = os.path.dirname(settings.checkpoint_db)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(settings.checkpoint_db, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return ThreadedSqliteSaver(conn, serde=serde)
+    raise ValueError(f"Unknown checkpointer '{settings.checkpointer}', expected 'memory' or 'sqlite'")
+
+
+def run_thread_id(topic: str, max_analysts: int, *extra: Any) -> str:
+    """
+    Return a stable thread ID for a run.
+
+    Re-running the same topic with the same parameters lands on the same
+    thread, so an interrupted run resumes from its last checkpoint.
+    """
+    key = "\x00".join(str(part) for part in (topic, max_analysts) + extra)
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+
+
+def is_resumable(snapshot: Any) -> bool:
+    """
+    Whether a thread stopped after analyst approval, i.e. mid interviews or report writing.
+
+    A thread still in ``create_analysts`` (e.g. one that crashed while
+    revising the analysts) or waiting at ``human_feedback`` was not approved.
+    """
+    pending = set(snapshot.next)
+    return bool(pending) and not pending & {"create_analysts", "human_feedback"} and bool(snapshot.values.get("analysts"))
+
+
+def discard_thread(thread_id: str) -> None:
+    """Drop a thread that will not be resumed (finished, or stopped before approval), so a new run starts clean."""
+    checkpointer.delete_thread(thread_id)
+
+
+async def adiscard_thread(thread_id: str) -> None:
+    """Async version of ``discard_thread``."""
+    await checkpointer.adelete_thread(thread_id)
+
+
+def prune_thread(thread_id: str) -> None:
+    """Drop every checkpoint of a finished run once its report has been saved."""
+    if settings.prune_checkpoints:
+        checkpointer.delete_thread(thread_id)
+
+
+async def aprune_thread(thread_id: str) -> None:
+    """Async version of ``prune_thread``."""
+    if settings.prune_checkpoints:
+        await checkpointer.adelete_thread(thread_id)
+
+
+# Global checkpointer shared by the research and interview graphs
+checkpointer = create_checkpointer()
@@ -0,0 +1,60 @@
+"""Global concurrency limit for async LLM and retrieval calls."""
+import asyncio
+import time
+import weakref
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, TypeVar
+
+from config import settings
+from utils.tracing import record_queue_wait
+
+T = TypeVar("T")
+
+_limit = settings.max_concurrency
+_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+
+def set_concurrency_limit(limit: int) -> None:
+    """Set the maximum number of in-flight async LLM and retrieval calls."""
+    global _limit
+    _limit = limit
+    _semaphores.clear()
+
+
+def _semaphore() -> asyncio.Semaphore:
+    """Return the semaphore bound to the running event loop."""
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(_limit)
+        _semaphores[loop] = semaphore
+    return semaphore
+
+
+@asynccontextmanager
+async def concurrency_slot() -> AsyncIterator[None]:
+    """Hold a slot of the global concurrency limit, e.g. for the lifetime of a token stream."""
+    queued_at = time.perf_counter()
+    async with _semaphore():
+        record_queue_wait(time.perf_counter() - queued_at)
+        yield
+
+
+async def admitted(call: Any) -> None:
+    """
+    Wait until a rate-scheduled LLM call (``init_llm.ScheduledCall`` or
+    ``ScheduledStream``) is admitted; other calls pass straight through.
+
+    Await this before taking a concurrency slot, so waiting for rate
+    budget does not hold a slot.
+    """
+    admit = getattr(call, "admit", None)
+    if admit is not None:
+        await admit()
+
+
+async def limited(awaitable: Awaitable[T]) -> T:
+    """Await ``awaitable`` (once ``admitted``) while holding a slot of the global concurrency limit."""
+    await admitted(awaitable)
+    async with concurrency_slot():
+        return await awaitable
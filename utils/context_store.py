@@ -0,0 +1,168 @@
+"""Chunking, deduplication and BM25 ranking of interview context."""
+import hashlib
+import math
+import re
+from collections import Counter
+from typing import List
+
+from utils.tokens import estimate_tokens
+
+_TOKEN_RE = re.compile(r"\w+")
+_DOCUMENT_RE = re.compile(r"^\s*(<Document[^>]*>)\s*(.*?)\s*</Document>\s*$", re.DOTALL)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens used for ranking and deduplication."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _split_long(paragraph: str, max_tokens: int) -> List[str]:
+    """Split a paragraph that exceeds ``max_tokens`` into word windows."""
+    words = paragraph.split()
+    # estimate_tokens counts ~4 characters per token; average English word + space is ~6
+    words_per_chunk = max(1, max_tokens * 4 // 6)
+    return [" ".join(words[i:i + words_per_chunk]) for i in range(0, len(words), words_per_chunk)]
+
+
+def split_passages(text: str, max_tokens: int) -> List[str]:
+    """
+    Split ``text`` into passages of at most ~``max_tokens``.
+
+    Paragraphs are packed greedily so passages end on paragraph boundaries
+    where possible; paragraphs longer than the limit are split by words.
+    """
+    paragraphs = []
+    for paragraph in re.split(r"\n\s*\n|\n", text or ""):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if estimate_tokens(paragraph) > max_tokens:
+            paragraphs.extend(_split_long(paragraph, max_tokens))
+        else:
+            paragraphs.append(paragraph)
+
+    chunks, current = [], []
+    for paragraph in paragraphs:
+        if current and estimate_tokens("\n".join(current + [paragraph])) > max_tokens:
+            chunks.append("\n".join(current))
+            current = []
+        current.append(paragraph)
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+
+def document_block(header: str, body: str) -> str:
+    """Wrap a passage in the ``<Document>`` block format the prompts expect."""
+    return f"{header} \n {body}  \n </Document>"
+
+
+def chunk_document(header: str, text: str, max_tokens: int) -> List[str]:
+    """
+    Split a retrieved document into ``<Document>`` blocks of at most ~``max_tokens``.
+
+    Every chunk repeats the document ``header`` (the ``<Document href=... />``
+    tag) so it can be cited on its own.
+
+    Args:
+        header: Opening ``<Document .../>`` tag identifying the source
+        text: Document body
+        max_tokens: Approximate token size of each chunk
+    """
+    return [document_block(header, chunk) for chunk in split_passages(text, max_tokens)]
+
+
+def passage_key(chunk: str) -> str:
+    """Return a key identifying the passage body independently of its source or whitespace."""
+    match = _DOCUMENT_RE.match(chunk)
+    body = match.group(2) if match else chunk
+    return hashlib.sha1(" ".join(tokenize(body)).encode("utf-8")).hexdigest()
+
+
+def merge_context(existing: List[str], new: List[str]) -> List[str]:
+    """
+    State reducer for interview context that appends only unseen passages.
+
+    Passages already present (by normalized body text) are dropped, so the
+    same snippet returned by several searches or turns is stored once.
+    """
+    existing = existing or []
+    seen = {passage_key(chunk) for chunk in existing}
+    merged = list(existing)
+    for chunk in new or []:
+        key = passage_key(chunk)
+        if key not in seen:
+            seen.add(key)
+            merged.append(chunk)
+    return merged
+
+
+class BM25:
+    """Okapi BM25 index over a small in-memory list of passages."""
+
+    def __init__(self, passages: List[str], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.doc_terms = [Counter(tokenize(passage)) for passage in passages]
+        self.doc_lengths = [sum(terms.values()) for terms in self.doc_terms]
+        self.avg_length = (sum(self.doc_lengths) / len(self.doc_lengths)) if passages else 0.0
+        document_frequency = Counter()
+        for terms in self.doc_terms:
+            document_frequency.update(terms.keys())
+        n = len(passages)
+        self.idf = {
+            term: math.log(1 + (n - df + 0.5) / (df + 0.5))
+            for term, df in document_frequency.items()
+        }
+
+    def scores(self, query: str) -> List[float]:
+        """Return the BM25 score of every passage for ``query``."""
+        query_terms = set(tokenize(query))
+        scores = []
+        for terms, length in zip(self.doc_terms, self.doc_lengths):
+            score = 0.0
+            norm = self.k1 * (1 - self.b + self.b * length / self.avg_length) if self.avg_length else self.k1
+            for term in query_terms:
+                tf = terms.get(term)
+                if tf:
+                    score += self.idf[term] * tf * (self.k1 + 1) / (tf + norm)
+            scores.append(score)
+        return scores
+
+
+def select_context(chunks: List[str], query: str, top_k: int, max_tokens: int) -> List[str]:
+    """
+    Pick the passages most relevant to ``query`` within a token budget.
+
+    Passages are ranked by BM25 and taken in rank order until ``top_k``
+    passages are chosen. A passage that would exceed ``max_tokens`` is
+    skipped, and smaller lower-ranked ones may still fill the budget; the
+    top passage is always kept. Ties keep retrieval order, so with an
+    empty query the earliest passages win.
+
+    Args:
+        chunks: Candidate ``<Document>`` passages
+        query: Text to rank against (usually the latest question)
+        top_k: Maximum number of passages to return
+        max_tokens: Approximate token budget for the returned passages
+    """
+    if not chunks:
+        return []
+    scores = BM25(chunks).scores(query)
+    ranked = sorted(range(len(chunks)), key=lambda i: (-scores[i], i))
+
+    selected, used = [], 0
+    for i in ranked:
+        if len(selected) >= top_k:
+            break
+        cost = estimate_tokens(chunks[i])
+        if selected and used + cost > max_tokens:
+            continue
+        selected.append(chunks[i])
+        used += cost
+    return selected
+
+
+def format_context(chunks: List[str]) -> str:
+    """Join passages with the separator the prompts were written against."""
+    return "\n\n ---- \n\n".join(chunks)
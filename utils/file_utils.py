@@ -1,28 +1,76 @@
 """Utility functions for file operations."""
+import hashlib
 import os
+import re
 from datetime import datetime
+from typing import Optional
 from langgraph.graph import StateGraph
 
 from config import settings
 
 
+GRAPH_HASH_DIR = os.path.join(".cache", "graphs")
+
+
+def slugify(text: str, max_length: int = 40) -> str:
+    """Return a filesystem-friendly slug of ``text``."""
+    return re.sub(r"[^a-z0-9]+", "_", text.lower()).strip("_")[:max_length] or "topic"
+
+
+def graph_hash(graph: StateGraph) -> str:
+    """Return a hash of the graph topology (its Mermaid source, rendered locally)."""
+    return hashlib.sha256(graph.get_graph(xray=1).draw_mermaid().encode("utf-8")).hexdigest()
+
+
 def save_graph_image(graph: StateGraph, filename: str = "main_builder_graph.png") -> None:
-    """Save the graph visualization to a PNG file."""
+    """
+    Save the graph visualization to a PNG file.
+
+    Rendering the PNG needs a round trip to the Mermaid web service, so the
+    topology hash is stored in ``.cache/graphs/<filename>.sha256`` and the
+    image is only re-rendered when the graph structure changes.
+    """
+    digest = graph_hash(graph)
+    hash_path = os.path.join(GRAPH_HASH_DIR, f"{os.path.basename(filename)}.sha256")
+    if os.path.exists(filename) and os.path.exists(hash_path):
+        with open(hash_path, encoding="utf-8") as f:
+            if f.read().strip() == digest:
+                print(f"Graph image {filename} is up to date")
+                return
+
     png_data = graph.get_graph(xray=1).draw_mermaid_png()
     with open(filename, "wb") as f:
         f.write(png_data)
+    os.makedirs(GRAPH_HASH_DIR, exist_ok=True)
+    with open(hash_path, "w", encoding="utf-8") as f:
+        f.write(digest)
     print(f"Graph saved to {filename}")
 
 
-def save_report(report: str, output_dir: str = "outputs") -> None:
-    """Save the report to outputs directory with timestamp."""
+def save_report(report: str, output_dir: str = "outputs", filename: Optional[str] = None) -> Optional[str]:
+    """Save the report to outputs directory with timestamp (or ``filename``) and return its path."""
     if report:
         os.makedirs(output_dir, exist_ok=True)
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_path = os.path.join(output_dir, f"final_report_{timestamp}.md")
+        if filename is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"final_report_{timestamp}.md"
+        output_path = os.path.join(output_dir, filename)
         with open(output_path, "w", encoding="utf-8") as f:
             f.write(report)
         print(f"Report written to {output_path}")
+        return output_path
     else:
         print("No report found to write.")
+        return None
 
+
+
+def save_trace(tracer, output_dir: str = "outputs", filename: Optional[str] = None) -> None:
+    """Save a run trace as JSON to the outputs directory with timestamp (or ``filename``)."""
+    os.makedirs(output_dir, exist_ok=True)
+    if filename is None:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"trace_{timestamp}.json"
+    output_path = os.path.join(output_dir, filename)
+    tracer.save(output_path)
+    print(f"Trace written to {output_path}")
@@ -0,0 +1,220 @@
+"""Shared HTTP clients and the retry / circuit-breaker policy of the search backends."""
+import asyncio
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+
+from config import settings
+from utils.concurrency import concurrency_slot
+
+T = TypeVar("T")
+
+
+class BackendUnavailable(RuntimeError):
+    """A search backend failed after its retries, or its circuit is open."""
+
+    def __init__(self, backend: str, message: str):
+        super().__init__(f"{backend}: {message}")
+        self.backend = backend
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    After ``failure_threshold`` failures in a row the circuit opens
+    and calls are refused for ``reset_seconds``. Then it half-opens: calls
+    go through again, and a single failure reopens it while a success
+    closes it.
+    """
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            return "half-open" if time.monotonic() - self._opened_at >= self.reset_seconds else "open"
+
+    def allow(self) -> bool:
+        """Return whether a call may be attempted now."""
+        return self.state != "open"
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            half_open = self._opened_at is not None
+            if half_open or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _search_executor() -> ThreadPoolExecutor:
+    """Threads that run blocking searches so the sync path can enforce timeouts."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=settings.max_concurrency, thread_name_prefix="search")
+    return _executor
+
+
+class ResilientBackend:
+    """
+    Timeout, jittered exponential backoff and circuit breaking around one search backend.
+
+    ``call``/``acall`` take a zero-argument callable producing the result
+    (or an awaitable of it), so every attempt makes a fresh request. A call
+    whose attempts all fail counts as one failure of the circuit breaker.
+    When all attempts fail or the circuit is open, ``BackendUnavailable``
+    is raised so the caller can carry on without this backend.
+    """
+
+    def __init__(self, name: str, timeout: float, retries: int, backoff: float, breaker: CircuitBreaker):
+        self.name = name
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.breaker = breaker
+
+    def _delay(self, attempt: int) -> float:
+        """Full-jitter backoff: uniform in [0, backoff * 2^attempt]."""
+        return random.uniform(0, self.backoff * 2 ** attempt)
+
+    def _check_circuit(self) -> None:
+        if not self.breaker.allow():
+            raise BackendUnavailable(self.name, "circuit open after repeated failures")
+
+    def call(self, fetch: Callable[[], T]) -> T:
+        """Run a blocking ``fetch`` with retries; each attempt is bounded by the backend timeout."""
+        error: Optional[BaseException] = None
+        for attempt in range(self.retries + 1):
+            self._check_circuit()
+            future = _search_executor().submit(fetch)
+            try:
+                result = future.result(timeout=self.timeout)
+            except FutureTimeout:
+                future.cancel()
+                error = TimeoutError(f"no response within {self.timeout}s")
+            except Exception as e:
+                error = e
+            else:
+                self.breaker.record_success()
+                return result
+            if attempt < self.retries:
+                time.sleep(self._delay(attempt))
+        self.breaker.record_failure()
+        raise BackendUnavailable(self.name, f"{error!r} after {self.retries + 1} attempt(s)") from error
+
+    async def acall(self, fetch: Callable[[], Awaitable[T]]) -> T:
+        """
+        Async ``call``; each attempt holds a slot of the global concurrency limit.
+
+        Only the request itself is bounded by the timeout, not the wait for a
+        slot, and backoff sleeps do not hold one.
+        """
+        error: Optional[BaseException] = None
+        for attempt in range(self.retries + 1):
+            self._check_circuit()
+            try:
+                async with concurrency_slot():
+                    result = await asyncio.wait_for(fetch(), timeout=self.timeout)
+            except asyncio.TimeoutError:
+                error = TimeoutError(f"no response within {self.timeout}s")
+            except Exception as e:
+                error = e
+            else:
+                self.breaker.record_success()
+                return result
+            if attempt < self.retries:
+                await asyncio.sleep(self._delay(attempt))
+        self.breaker.record_failure()
+        raise BackendUnavailable(self.name, f"{error!r} after {self.retries + 1} attempt(s)") from error
+
+
+_backends: Dict[str, ResilientBackend] = {}
+_backends_lock = threading.Lock()
+
+
+def search_backend(name: str, timeout: float) -> ResilientBackend:
+    """Return the process-wide policy for backend ``name``, so its circuit is shared by all interviews."""
+    with _backends_lock:
+        backend = _backends.get(name)
+        if backend is None:
+            backend = ResilientBackend(
+                name,
+                timeout=timeout,
+                retries=settings.search_retries,
+                backoff=settings.search_backoff_seconds,
+                breaker=CircuitBreaker(settings.circuit_failure_threshold, settings.circuit_reset_seconds),
+            )
+            _backends[name] = backend
+        return backend
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def http_session():
+    """Return the shared keep-alive ``requests`` session, sized for the concurrency limit."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=settings.max_concurrency)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+
+class _SessionRequests:
+    """Stands in for the ``requests`` module inside a client library, routing ``get`` through the shared session."""
+
+    def __init__(self, module, timeout: float):
+        self._module = module
+        self._timeout = timeout
+
+    def get(self, url: str, **kwargs):
+        kwargs.setdefault("timeout", self._timeout)
+        return http_session().get(url, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._module, name)
+
+
+def use_shared_session_for_wikipedia() -> None:
+    """
+    Make the ``wikipedia`` package (used by ``WikipediaLoader``) reuse pooled connections.
+
+    The package calls ``requests.get`` for every API request, opening a new
+    connection each time and without a timeout; its module-level
+    ``requests`` reference is swapped for one backed by ``http_session``.
+    """
+    try:
+        from wikipedia import wikipedia
+    except ImportError:
+        return
+    if not isinstance(wikipedia.requests, _SessionRequests):
+        wikipedia.requests = _SessionRequests(wikipedia.requests, settings.http_timeout_seconds)
@@ -0,0 +1,165 @@
+"""Persistent, content-addressed disk cache for LLM responses."""
+import hashlib
+import os
+import threading
+import time
+import warnings
+from typing import Any, List, Optional, Tuple
+
+from langchain_core.caches import BaseCache, RETURN_VAL_TYPE
+from langchain_core.load import dumps, loads
+
+
+class DiskLLMCache(BaseCache):
+    """
+    LangChain cache that stores each response as a file named by the hash of its request.
+
+    The key combines the serialized messages (``prompt``) with the LangChain
+    ``llm_string``, which already captures the model, temperature and any
+    bound tools, so ``with_structured_output`` calls are cached separately
+    from plain completions.
+
+    Entries older than ``ttl_seconds`` are treated as misses and removed.
+    The cache size is tracked as a running total, seeded by one scan of the
+    directory. When it grows past ``max_bytes`` the directory is scanned
+    again, which also picks up writes by other processes, and the least
+    recently used entries are evicted down to ``_LOW_WATER`` of the limit.
+    """
+
+    # Evict below the limit so the next writes do not each trigger a scan
+    _LOW_WATER = 0.9
+
+    def __init__(self, cache_dir: str, ttl_seconds: int = 0, max_bytes: int = 0):
+        """
+        Args:
+            cache_dir: Directory where cache entries are stored
+            ttl_seconds: Maximum age of an entry in seconds (0 disables expiry)
+            max_bytes: Maximum total size of the cache in bytes (0 disables the limit)
+        """
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self._size = self._scan()[1] if max_bytes else 0
+
+    def _path(self, prompt: str, llm_string: str) -> str:
+        """Return the file path for a prompt / llm_string pair."""
+        digest = hashlib.sha256(f"{llm_string}\x00{prompt}".encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, digest[:2], f"{digest}.json")
+
+    def _is_expired(self, path: str) -> bool:
+        """Check whether the entry at ``path`` is older than the TTL."""
+        if not self.ttl_seconds:
+            return False
+        return time.time() - os.path.getmtime(path) > self.ttl_seconds
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        """Return cached generations for the request, or None on a miss."""
+        path = self._path(prompt, llm_string)
+        try:
+            if self._is_expired(path):
+                size = os.path.getsize(path)
+                os.remove(path)
+                self._grow(-size)
+                raise FileNotFoundError(path)
+            with open(path, "r", encoding="utf-8") as f:
+                payload = f.read()
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                generations = loads(payload, allowed_objects="core")
+            # Touch the file so size-based eviction is least-recently-used
+            os.utime(path, (time.time(), os.path.getmtime(path)))
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return generations
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        """Store generations for the request and enforce the size limit."""
+        path = self._path(prompt, llm_string)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(dumps(return_val))
+        try:
+            replaced = os.path.getsize(path)
+        except OSError:
+            replaced = 0
+        os.replace(tmp_path, path)
+
+        if self.max_bytes and self._grow(os.path.getsize(path) - replaced) > self.max_bytes:
+            self._evict()
+
+    def _grow(self, delta: int) -> int:
+        """Adjust the running size total by ``delta`` bytes and return it."""
+        with self._lock:
+            self._size += delta
+            return self._size
+
+    def _scan(self) -> Tuple[List[tuple], int]:
+        """Walk the cache, removing expired entries; returns ``([(atime, size, path), ...], total bytes)``."""
+        entries = []
+        total = 0
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith(".json"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                if self.ttl_seconds and time.time() - stat.st_mtime > self.ttl_seconds:
+                    self._remove(path)
+                    continue
+                entries.append((stat.st_atime, stat.st_size, path))
+                total += stat.st_size
+        return entries, total
+
+    def _evict(self) -> None:
+        """Rescan the cache and remove least recently used entries until under the low-water mark."""
+        entries, total = self._scan()
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes * self._LOW_WATER:
+                break
+            self._remove(path)
+            total -= size
+        with self._lock:
+            self._size = total
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        """Delete a cache entry, ignoring races with other processes."""
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def clear(self, **kwargs: Any) -> None:
+        """Delete every entry in the cache and reset the counters."""
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                self._remove(os.path.join(root, name))
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self._size = 0
+
+    @property
+    def stats(self) -> dict:
+        """Return hit/miss counters for the current process."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,272 @@
+"""
+On-disk inverted index over a local document corpus, queried through mmap.
+
+``build_index`` walks a directory of ``.txt``/``.md`` files and MediaWiki
+XML dumps (``.xml`` or ``.xml.bz2``), splits them into passages and writes
+an index directory:
+
+    meta.json       passage count, average length, chunk size, source hrefs
+    vocab.json      term -> [postings offset, document frequency]
+    postings.bin    per term: uint32 passage ids, then uint32 term frequencies
+    passages.bin    UTF-8 passage text, concatenated
+    offsets.bin     uint64 byte offset of every passage (plus the end offset)
+    passage_info.bin  uint32 (source id, length in terms) per passage
+
+``LocalIndex`` memory-maps the binary files, so only the term dictionary
+is loaded into memory and a query touches just the postings of its terms.
+
+Usage:
+    python -m utils.local_index build path/to/corpus .cache/local_index
+    python -m utils.local_index search .cache/local_index "agent frameworks"
+"""
+import argparse
+import bz2
+import heapq
+import json
+import math
+import mmap
+import os
+import re
+import threading
+import time
+import xml.etree.ElementTree as ElementTree
+from array import array
+from collections import Counter, defaultdict
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from config import settings
+from utils.context_store import document_block, split_passages, tokenize
+
+
+INDEX_VERSION = 1
+TEXT_EXTENSIONS = (".txt", ".md", ".markdown")
+DUMP_EXTENSIONS = (".xml", ".xml.bz2")
+
+_WIKI_MARKUP = [
+    (re.compile(r"<ref[^>]*/>|<ref[^>]*>.*?</ref>", re.DOTALL), ""),
+    (re.compile(r"\{\{[^{}]*\}\}"), ""),
+    (re.compile(r"\[\[(?:File|Image|Category):[^\]]*\]\]"), ""),
+    (re.compile(r"\[\[[^\]|]*\|([^\]]*)\]\]"), r"\1"),
+    (re.compile(r"\[\[([^\]]*)\]\]"), r"\1"),
+    (re.compile(r"\[https?://\S+ ([^\]]*)\]"), r"\1"),
+    (re.compile(r"'{2,}"), ""),
+    (re.compile(r"<[^>]+>"), ""),
+]
+
+
+def _strip_wikitext(text: str) -> str:
+    """Reduce wikitext to readable plain text (best effort, no template expansion)."""
+    for pattern, replacement in _WIKI_MARKUP:
+        text = pattern.sub(replacement, text)
+    return text
+
+
+def _dump_pages(path: str) -> Iterator[Tuple[str, str]]:
+    """Yield (href, plain text) for every article in a MediaWiki XML dump."""
+    opener = bz2.open if path.endswith(".bz2") else open
+    base_url = None
+    with opener(path, "rb") as f:
+        for _, element in ElementTree.iterparse(f):
+            tag = element.tag.rsplit("}", 1)[-1]
+            if tag == "base" and element.text:
+                base_url = element.text.rsplit("/", 1)[0]
+            elif tag == "page":
+                fields = {child.tag.rsplit("}", 1)[-1]: child for child in element}
+                title = fields["title"].text if "title" in fields else None
+                namespace = fields["ns"].text if "ns" in fields else "0"
+                revision = fields.get("revision")
+                text_element = None
+                if revision is not None:
+                    text_element = next((c for c in revision if c.tag.rsplit("}", 1)[-1] == "text"), None)
+                if title and namespace == "0" and "redirect" not in fields and text_element is not None:
+                    slug = title.replace(" ", "_")
+                    href = f"{base_url}/{slug}" if base_url else f"{os.path.basename(path)}#{slug}"
+                    yield href, _strip_wikitext(text_element.text or "")
+                element.clear()
+
+
+def _corpus_documents(corpus_dir: str) -> Iterator[Tuple[str, str]]:
+    """Yield (href, text) for every supported file under ``corpus_dir``, in a stable order."""
+    for root, dirs, files in os.walk(corpus_dir):
+        dirs.sort()
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            lower = name.lower()
+            if lower.endswith(DUMP_EXTENSIONS):
+                yield from _dump_pages(path)
+            elif lower.endswith(TEXT_EXTENSIONS):
+                with open(path, encoding="utf-8", errors="replace") as f:
+                    yield os.path.relpath(path, corpus_dir).replace(os.sep, "/"), f.read()
+
+
+def build_index(corpus_dir: str, index_dir: str, chunk_tokens: Optional[int] = None) -> dict:
+    """
+    Index every document under ``corpus_dir`` into ``index_dir`` and return the index metadata.
+
+    Postings are accumulated in memory and written once, so building needs
+    memory proportional to the corpus; querying does not.
+    """
+    chunk_tokens = chunk_tokens or settings.context_chunk_tokens
+    os.makedirs(index_dir, exist_ok=True)
+
+    sources: List[str] = []
+    postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+    offsets = array("Q", [0])
+    passage_info = array("I")
+    total_length = 0
+
+    with open(os.path.join(index_dir, "passages.bin"), "wb") as passages_file:
+        for href, text in _corpus_documents(corpus_dir):
+            source_id = len(sources)
+            sources.append(href)
+            for passage in split_passages(text, chunk_tokens):
+                passage_id = len(passage_info) // 2
+                terms = Counter(tokenize(passage))
+                for term, tf in terms.items():
+                    postings[term].append((passage_id, tf))
+                length = sum(terms.values())
+                passage_info.extend((source_id, length))
+                total_length += length
+                data = passage.encode("utf-8")
+                passages_file.write(data)
+                offsets.append(offsets[-1] + len(data))
+
+    passage_count = len(passage_info) // 2
+    if passage_count == 0:
+        raise ValueError(f"No indexable documents found in {corpus_dir}")
+
+    vocab = {}
+    with open(os.path.join(index_dir, "postings.bin"), "wb") as postings_file:
+        position = 0
+        for term in sorted(postings):
+            entries = postings[term]
+            array("I", (passage_id for passage_id, _ in entries)).tofile(postings_file)
+            array("I", (tf for _, tf in entries)).tofile(postings_file)
+            vocab[term] = [position, len(entries)]
+            position += 2 * len(entries)
+
+    with open(os.path.join(index_dir, "offsets.bin"), "wb") as f:
+        offsets.tofile(f)
+    with open(os.path.join(index_dir, "passage_info.bin"), "wb") as f:
+        passage_info.tofile(f)
+    with open(os.path.join(index_dir, "vocab.json"), "w", encoding="utf-8") as f:
+        json.dump(vocab, f, separators=(",", ":"))
+
+    meta = {
+        "version": INDEX_VERSION,
+        "passages": passage_count,
+        "terms": len(vocab),
+        "avg_length": total_length / passage_count,
+        "chunk_tokens": chunk_tokens,
+        "sources": sources,
+    }
+    with open(os.path.join(index_dir, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    return meta
+
+
+class LocalIndex:
+    """Read-only BM25 search over an index written by ``build_index``."""
+
+    def __init__(self, index_dir: str, k1: float = 1.5, b: float = 0.75):
+        self.index_dir = index_dir
+        self.k1 = k1
+        self.b = b
+        with open(os.path.join(index_dir, "meta.json"), encoding="utf-8") as f:
+            self.meta = json.load(f)
+        if self.meta.get("version") != INDEX_VERSION:
+            raise ValueError(f"{index_dir} was built by an incompatible index version; rebuild it")
+        with open(os.path.join(index_dir, "vocab.json"), encoding="utf-8") as f:
+            self.vocab: Dict[str, List[int]] = json.load(f)
+
+        self._files = []
+        self._postings = self._map("postings.bin").cast("I")
+        self._passages = self._map("passages.bin")
+        self._offsets = self._map("offsets.bin").cast("Q")
+        self._passage_info = self._map("passage_info.bin").cast("I")
+
+    def _map(self, filename: str) -> memoryview:
+        f = open(os.path.join(self.index_dir, filename), "rb")
+        self._files.append(f)
+        if os.fstat(f.fileno()).st_size == 0:
+            return memoryview(b"")
+        return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def search(self, query: str, top_k: int) -> List[Tuple[float, int]]:
+        """Return up to ``top_k`` (score, passage id) pairs ranked by BM25."""
+        n = self.meta["passages"]
+        avg_length = self.meta["avg_length"] or 1.0
+        scores: Dict[int, float] = defaultdict(float)
+        for term in set(tokenize(query)):
+            entry = self.vocab.get(term)
+            if entry is None:
+                continue
+            offset, df = entry
+            idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+            passage_ids = self._postings[offset:offset + df]
+            frequencies = self._postings[offset + df:offset + 2 * df]
+            for passage_id, tf in zip(passage_ids, frequencies):
+                length = self._passage_info[2 * passage_id + 1]
+                norm = self.k1 * (1 - self.b + self.b * length / avg_length)
+                scores[passage_id] += idf * tf * (self.k1 + 1) / (tf + norm)
+        return heapq.nlargest(top_k, ((score, passage_id) for passage_id, score in scores.items()))
+
+    def passage(self, passage_id: int) -> Tuple[str, str]:
+        """Return (source href, text) of a passage."""
+        start, end = self._offsets[passage_id], self._offsets[passage_id + 1]
+        source = self.meta["sources"][self._passage_info[2 * passage_id]]
+        return source, bytes(self._passages[start:end]).decode("utf-8")
+
+    def passages(self, query: str, top_k: int) -> List[Tuple[str, str]]:
+        """Return (source href, text) of the top passages for ``query``."""
+        return [self.passage(passage_id) for _, passage_id in self.search(query, top_k)]
+
+    def documents(self, query: str, top_k: int) -> List[str]:
+        """Return the top passages for ``query`` as ``<Document href=...>`` blocks."""
+        return [document_block(f'<Document href="{href}"/>', text) for href, text in self.passages(query, top_k)]
+
+
+_index: Optional[LocalIndex] = None
+_index_lock = threading.Lock()
+
+
+def local_index() -> LocalIndex:
+    """Return the index at ``settings.local_index_dir``, opened once per process."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                if not settings.local_index_dir:
+                    raise ValueError("RESEARCH_LOCAL_INDEX is not set; build an index and point it there")
+                _index = LocalIndex(settings.local_index_dir)
+    return _index
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Build or query a local index from the command line."""
+    parser = argparse.ArgumentParser(description="Build or query the local-corpus retrieval index.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="Index a directory of documents")
+    build.add_argument("corpus_dir")
+    build.add_argument("index_dir", nargs="?", default=settings.local_index_dir or os.path.join(".cache", "local_index"))
+    build.add_argument("--chunk-tokens", type=int, default=settings.context_chunk_tokens)
+    search = commands.add_parser("search", help="Print the top passages for a query")
+    search.add_argument("index_dir")
+    search.add_argument("query")
+    search.add_argument("--top-k", type=int, default=settings.local_top_k)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    if args.command == "build":
+        meta = build_index(args.corpus_dir, args.index_dir, args.chunk_tokens)
+        print(f"Indexed {len(meta['sources'])} documents into {meta['passages']} passages "
+              f"({meta['terms']} terms) at {args.index_dir} in {time.perf_counter() - start:.1f}s")
+    else:
+        for block in LocalIndex(args.index_dir).documents(args.query, args.top_k):
+            print(block)
+            print("-" * 50)
+        print(f"Search took {(time.perf_counter() - start) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
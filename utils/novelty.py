@@ -0,0 +1,32 @@
+"""Marginal information gain of interview turns."""
+import zlib
+from typing import Iterable, Set
+
+from utils.context_store import tokenize
+
+
+_SHINGLE_WORDS = 3
+
+
+def shingles(text: str) -> Set[int]:
+    """Return the hashed word 3-gram shingles of ``text`` (single words for very short texts)."""
+    words = tokenize(text)
+    size = min(_SHINGLE_WORDS, len(words))
+    return {
+        zlib.crc32(" ".join(words[i:i + size]).encode("utf-8"))
+        for i in range(len(words) - size + 1)
+    } if size else set()
+
+
+def information_gain(new_texts: Iterable[str], seen_texts: Iterable[str]) -> float:
+    """
+    Return the fraction of shingles in ``new_texts`` that do not occur in ``seen_texts``.
+
+    1.0 means the turn contributed only new material, 0.0 that it repeated
+    what was already gathered. A turn without any text has no gain.
+    """
+    new = set().union(*(shingles(text) for text in new_texts))
+    if not new:
+        return 0.0
+    seen = set().union(*(shingles(text) for text in seen_texts))
+    return len(new - seen) / len(new)
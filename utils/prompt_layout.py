@@ -0,0 +1,32 @@
+"""Prompt assembly that keeps shared content in a stable, cacheable prefix."""
+from typing import Optional, Sequence, Union
+
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+
+
+def layered_messages(instructions: str,
+                     shared: Optional[str] = None,
+                     history: Sequence[BaseMessage] = (),
+                     request: Union[str, BaseMessage, None] = None) -> list:
+    """
+    Build a message list ordered from most to least stable.
+
+    Provider-side prompt caching (e.g. OpenAI's automatic prefix cache)
+    only reuses the longest identical prefix of a request, so content is
+    laid out as:
+
+    1. ``instructions`` - static system prompt, identical for every call of a node
+    2. ``shared`` - large content shared by several calls (e.g. all report sections)
+    3. ``history`` - append-only conversation, whose earlier turns repeat across calls
+    4. ``request`` - the per-call part (a string becomes a human message)
+
+    Anything that changes per call therefore never invalidates the cached
+    prefix in front of it.
+    """
+    messages = [SystemMessage(content=instructions)]
+    if shared:
+        messages.append(HumanMessage(content=shared))
+    messages.extend(history)
+    if request is not None:
+        messages.append(HumanMessage(content=request) if isinstance(request, str) else request)
+    return messages
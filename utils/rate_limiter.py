@@ -0,0 +1,208 @@
+"""Process-wide LLM rate scheduler: token buckets for requests and tokens per minute, served by priority."""
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from typing import Callable, List, Optional
+
+from config import settings
+from utils.tracing import record_queue_wait
+
+
+class TokenBucket:
+    """
+    Bucket holding up to ``per_minute`` units, refilled continuously.
+
+    A single request larger than the bucket waits for a full bucket and
+    then drives it negative, so it is paid for by the requests after it.
+    A ``per_minute`` of 0 means unlimited.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.level = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.capacity / 60)
+        self._updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until ``amount`` units are available."""
+        if self.capacity <= 0:
+            return 0.0
+        self._refill(now)
+        needed = min(amount, self.capacity)
+        return 0.0 if self.level >= needed else (needed - self.level) * 60 / self.capacity
+
+    def take(self, amount: float) -> None:
+        if self.capacity > 0:
+            self.level -= amount
+
+    def give_back(self, amount: float) -> None:
+        if self.capacity > 0:
+            self.level = min(self.capacity, self.level + amount)
+
+
+class _Waiter:
+    def __init__(self, priority: int, seq: int, tokens: int, grant: Callable[[], None]):
+        self.priority = priority
+        self.seq = seq
+        self.tokens = tokens
+        self.grant = grant
+        self.granted = False
+        self.cancelled = False
+
+    def __lt__(self, other: "_Waiter") -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class RateScheduler:
+    """
+    Admits LLM calls under requests-per-minute and tokens-per-minute budgets.
+
+    Callers that do not fit the budgets wait in one queue ordered by
+    priority (lower first) and then arrival. Only the head of the queue is
+    admitted, so a waiting high-priority call is never overtaken by a
+    cheaper low-priority one. Calls are charged their estimated tokens up
+    front and ``settle`` corrects the charge once the real usage is known.
+    Sync and async callers share the same queue.
+    """
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self._queue: List[_Waiter] = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        self._timer_due = float("inf")
+        self.stats = {"calls": 0, "waited": 0, "wait_s": 0.0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.requests.capacity > 0 or self.tokens.capacity > 0
+
+    def _delay(self, tokens: int, now: float) -> float:
+        return max(self.requests.wait_time(1, now), self.tokens.wait_time(tokens, now))
+
+    def _admit(self, tokens: int) -> None:
+        self.requests.take(1)
+        self.tokens.take(tokens)
+
+    def _dispatch(self) -> None:
+        """Admit waiters from the head of the queue while they fit; must hold the lock."""
+        while self._queue:
+            head = self._queue[0]
+            if head.cancelled:
+                heapq.heappop(self._queue)
+                continue
+            now = time.monotonic()
+            delay = self._delay(head.tokens, now)
+            if delay > 0:
+                self._wake_in(delay, now)
+                return
+            heapq.heappop(self._queue)
+            self._admit(head.tokens)
+            head.granted = True
+            head.grant()
+
+    def _wake_in(self, delay: float, now: float) -> None:
+        due = now + delay
+        if self._timer is not None and self._timer_due <= due:
+            return
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = threading.Timer(delay, self._wake)
+        self._timer.daemon = True
+        self._timer_due = due
+        self._timer.start()
+
+    def _wake(self) -> None:
+        with self._lock:
+            self._timer = None
+            self._timer_due = float("inf")
+            self._dispatch()
+
+    def _try_admit(self, tokens: int) -> bool:
+        """Admit at once when nobody is waiting and the budgets allow it; must hold the lock."""
+        self.stats["calls"] += 1
+        if not self._queue and self._delay(tokens, time.monotonic()) <= 0:
+            self._admit(tokens)
+            return True
+        return False
+
+    def _record_wait(self, started: float) -> None:
+        waited = time.perf_counter() - started
+        with self._lock:
+            self.stats["waited"] += 1
+            self.stats["wait_s"] += waited
+        record_queue_wait(waited)
+
+    def acquire(self, priority: int, tokens: int) -> None:
+        """Block until a call of ``tokens`` estimated tokens may start."""
+        if not self.enabled:
+            return
+        started = time.perf_counter()
+        admitted = threading.Event()
+        with self._lock:
+            if self._try_admit(tokens):
+                return
+            heapq.heappush(self._queue, _Waiter(priority, next(self._seq), tokens, admitted.set))
+            self._dispatch()
+        admitted.wait()
+        self._record_wait(started)
+
+    async def aacquire(self, priority: int, tokens: int) -> None:
+        """Async ``acquire``; waiting does not block the event loop."""
+        if not self.enabled:
+            return
+        started = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        admitted = loop.create_future()
+
+        def grant() -> None:
+            loop.call_soon_threadsafe(lambda: admitted.done() or admitted.set_result(None))
+
+        with self._lock:
+            if self._try_admit(tokens):
+                return
+            waiter = _Waiter(priority, next(self._seq), tokens, grant)
+            heapq.heappush(self._queue, waiter)
+            self._dispatch()
+        try:
+            await admitted
+        except asyncio.CancelledError:
+            with self._lock:
+                waiter.cancelled = True
+                if waiter.granted:
+                    # Admitted just before the cancellation: return the budget
+                    self.requests.give_back(1)
+                    self.tokens.give_back(tokens)
+                self._dispatch()
+            raise
+        self._record_wait(started)
+
+    def settle(self, estimated: int, actual: Optional[int]) -> None:
+        """Charge the difference between a call's real and estimated token usage."""
+        if not self.enabled or actual is None or actual == estimated:
+            return
+        with self._lock:
+            if actual > estimated:
+                self.tokens.take(actual - estimated)
+            else:
+                self.tokens.give_back(estimated - actual)
+            self._dispatch()
+
+
+def process_share() -> int:
+    """Number of processes splitting the configured budgets: a run and its interview workers."""
+    return settings.interview_workers + 1
+
+
+# Shared by every model in the process; 0 budgets leave calls unthrottled
+scheduler = RateScheduler(
+    settings.llm_requests_per_minute / process_share(),
+    settings.llm_tokens_per_minute / process_share(),
+)
@@ -0,0 +1,80 @@
+"""Incremental on-disk assembly of a run's report."""
+import os
+import shutil
+import threading
+from contextlib import contextmanager
+from typing import Iterable, Iterator, Optional
+
+from langchain_core.runnables import RunnableConfig
+
+from config import settings
+
+
+SECTIONS_FILE = "sections.md"
+FINAL_REPORT_FILE = "final_report.md"
+
+_lock = threading.Lock()
+
+
+class ReportStream:
+    """
+    Per-run output directory that is written while the graph runs.
+
+    ``sections.md`` grows as each interview section completes, every report
+    writer streams its tokens into ``<part>.md``, and ``final_report.md`` is
+    written piece by piece once all parts exist. Each write is flushed so
+    the files can be followed (e.g. with ``tail -f``) during the run.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def path(self, filename: str) -> str:
+        return os.path.join(self.directory, filename)
+
+    def reset(self) -> None:
+        """Remove output left by an earlier run on the same thread."""
+        with _lock:
+            shutil.rmtree(self.directory, ignore_errors=True)
+            os.makedirs(self.directory, exist_ok=True)
+
+    def append_section(self, section: str) -> None:
+        """Append one finished interview section to ``sections.md``."""
+        with _lock:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(self.path(SECTIONS_FILE), "a", encoding="utf-8") as f:
+                f.write(section.rstrip() + "\n\n---\n\n")
+
+    @contextmanager
+    def part(self, name: str) -> Iterator:
+        """Open ``<name>.md`` for a writer; yields a ``write(text)`` callable that flushes each chunk."""
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.path(f"{name}.md"), "w", encoding="utf-8") as f:
+            def write(text: str) -> None:
+                f.write(text)
+                f.flush()
+            yield write
+
+    def write_final(self, pieces: Iterable[str]) -> str:
+        """Write the final report from ``pieces`` in order and return its path."""
+        path = self.path(FINAL_REPORT_FILE)
+        with open(path, "w", encoding="utf-8") as f:
+            for piece in pieces:
+                f.write(piece)
+                f.flush()
+        return path
+
+
+def stream_directory(thread_id: str, output_dir: Optional[str] = None) -> str:
+    """Return the streaming output directory of a run."""
+    return os.path.join(output_dir or settings.output_directory, f"run_{thread_id}")
+
+
+def report_stream(config: Optional[RunnableConfig]) -> Optional[ReportStream]:
+    """Return the ``ReportStream`` of the run in ``config``, or None when streaming output is disabled."""
+    if not settings.stream_output or not config:
+        return None
+    thread_id = config.get("configurable", {}).get("thread_id")
+    if thread_id is None:
+        return None
+    return ReportStream(stream_directory(thread_id))
@@ -0,0 +1,160 @@
+"""Process-wide cache for search results shared across parallel interviews."""
+import asyncio
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Tuple
+
+from config import settings
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a query so trivially different phrasings share a cache entry."""
+    return re.sub(r"\s+", " ", query or "").strip().lower()
+
+
+class SearchCache:
+    """
+    TTL cache for retrieval results keyed on ``(source, normalized query)``.
+
+    Concurrent requests for a key that is already being fetched wait for
+    that fetch instead of issuing their own, so parallel interviews that
+    plan the same query only hit the external service once. Failed
+    fetches are not cached; every waiter receives the exception.
+    """
+
+    def __init__(self, ttl_seconds: int = 3600, max_entries: int = 1024):
+        """
+        Args:
+            ttl_seconds: How long a result stays valid (0 disables expiry)
+            max_entries: Maximum number of cached results before LRU eviction
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, Any]]" = OrderedDict()
+        self._in_flight: dict = {}
+        self._lock = threading.Lock()
+
+    def _lookup(self, key: Tuple[str, str]):
+        """Return ``(True, value)`` for a fresh entry, otherwise ``(False, None)``. Caller holds the lock."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        stored_at, value = entry
+        if self.ttl_seconds and time.monotonic() - stored_at > self.ttl_seconds:
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    def _store(self, key: Tuple[str, str], value: Any) -> None:
+        """Insert a value and evict the least recently used entries. Caller holds the lock."""
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _claim(self, key: Tuple[str, str]) -> Tuple[bool, Any, Future]:
+        """
+        Resolve ``key`` against the cache and the in-flight table.
+
+        Returns ``(True, value, None)`` on a hit, ``(False, None, future)`` when
+        another caller is already fetching, and ``(False, None, None)`` after
+        registering the caller as the owner of a new fetch.
+        """
+        with self._lock:
+            found, value = self._lookup(key)
+            if found:
+                self.hits += 1
+                return True, value, None
+            future = self._in_flight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return False, None, future
+            self.misses += 1
+            self._in_flight[key] = Future()
+            return False, None, None
+
+    def _resolve(self, key: Tuple[str, str], value: Any = None, error: BaseException = None) -> None:
+        """Publish the owner's result (or error) to the cache and any waiters."""
+        with self._lock:
+            future = self._in_flight.pop(key)
+            if error is None:
+                self._store(key, value)
+        if error is None:
+            future.set_result(value)
+        else:
+            future.set_exception(error)
+
+    def get_or_fetch(self, source: str, query: str, fetch: Callable[[], Any]) -> Any:
+        """
+        Return the cached result for ``query`` on ``source``, calling ``fetch`` on a miss.
+
+        Args:
+            source: Name of the retrieval backend (e.g. "duckduckgo")
+            query: Search query as produced by the planner
+            fetch: Zero-argument callable performing the actual search
+        """
+        key = (source, normalize_query(query))
+        found, value, waiting_on = self._claim(key)
+        if found:
+            return value
+        if waiting_on is not None:
+            return waiting_on.result()
+
+        try:
+            value = fetch()
+        except BaseException as e:
+            self._resolve(key, error=e)
+            raise
+        self._resolve(key, value)
+        return value
+
+    async def aget_or_fetch(self, source: str, query: str, afetch: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Async version of ``get_or_fetch``; ``afetch`` returns an awaitable.
+
+        Async and sync callers share the same entries and in-flight table.
+        """
+        key = (source, normalize_query(query))
+        found, value, waiting_on = self._claim(key)
+        if found:
+            return value
+        if waiting_on is not None:
+            return await asyncio.wrap_future(waiting_on)
+
+        try:
+            value = await afetch()
+        except BaseException as e:
+            self._resolve(key, error=e)
+            raise
+        self._resolve(key, value)
+        return value
+
+    def clear(self) -> None:
+        """Drop all cached results."""
+        with self._lock:
+            self._entries.clear()
+
+    @property
+    def stats(self) -> dict:
+        """Return hit, miss and coalesced-wait counters."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "entries": len(self._entries),
+            }
+
+
+# Global search cache shared by every interview in the process
+search_cache = SearchCache(
+    ttl_seconds=settings.search_cache_ttl_seconds,
+    max_entries=settings.search_cache_max_entries
+)
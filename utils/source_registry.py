@@ -0,0 +1,233 @@
+"""Cross-analyst source deduplication and global citation numbering."""
+import re
+import zlib
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from config import settings
+from utils.context_store import tokenize
+
+
+_TRACKING_PREFIXES = ("utm_",)
+_TRACKING_PARAMS = {"fbclid", "gclid", "mc_cid", "mc_eid", "ref", "ref_src"}
+_URL_RE = re.compile(r"https?://[^\s<>\"')\]]+")
+# Markdown-escaped groups (``\[2024\]``) are bracketed numbers in the prose, not citations
+_CITATION_RE = re.compile(r"(?<!\\)\[(\d+(?:\s*,\s*\d+)*)\]")
+_SOURCE_LINE_RE = re.compile(r"^\s*\[(\d+)\]\s*(.+?)\s*$")
+_SOURCES_HEADING_RE = re.compile(r"^\s*#{2,4}\s*Sources\s*$", re.IGNORECASE | re.MULTILINE)
+
+# MinHash parameters: 64 signature slots split into 16 LSH bands of 4 rows
+_NUM_PERM = 64
+_BAND_ROWS = 4
+_SHINGLE_WORDS = 5
+_MAX_SIGNATURE_WORDS = 500
+
+
+def normalize_url(url: str) -> str:
+    """
+    Return a canonical form of ``url`` for exact-duplicate detection.
+
+    Lowercases scheme and host, drops ``www.``/mobile prefixes, fragments,
+    tracking parameters and trailing slashes, and sorts the query string.
+    Non-URL sources (e.g. local document paths) are returned stripped.
+    """
+    url = (url or "").strip()
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.netloc:
+        return url
+    host = parts.netloc.lower()
+    for prefix in ("www.", "m."):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+    host = host.replace(".m.wikipedia.org", ".wikipedia.org")
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith(_TRACKING_PREFIXES) and key.lower() not in _TRACKING_PARAMS
+    )
+    path = parts.path.rstrip("/") or ""
+    return urlunsplit(("https", host, path, urlencode(query), ""))
+
+
+@lru_cache(maxsize=4096)
+def minhash(text: str) -> Tuple[int, ...]:
+    """
+    Return a MinHash signature of ``text``'s word shingles.
+
+    Uses one-permutation hashing: each shingle is hashed once (CRC32, so
+    signatures are stable across processes and checkpoints), its low bits
+    pick one of ``_NUM_PERM`` slots and each slot keeps its minimum. Empty
+    slots borrow from the next filled one so short snippets stay
+    comparable. This costs one hash per shingle instead of one per
+    shingle and slot.
+    """
+    # Near-duplicates share their opening, so only the first words are signed
+    words = tokenize(text[:_MAX_SIGNATURE_WORDS * 12])[:_MAX_SIGNATURE_WORDS]
+    size = min(_SHINGLE_WORDS, len(words)) or 1
+    slots: List[Optional[int]] = [None] * _NUM_PERM
+    for i in range(max(1, len(words) - size + 1)):
+        h = zlib.crc32(" ".join(words[i:i + size]).encode("utf-8"))
+        slot, value = h % _NUM_PERM, h // _NUM_PERM
+        if slots[slot] is None or value < slots[slot]:
+            slots[slot] = value
+    if all(value is None for value in slots):
+        return (0,) * _NUM_PERM
+    signature = []
+    for slot in range(_NUM_PERM):
+        offset = 0
+        while slots[(slot + offset) % _NUM_PERM] is None:
+            offset += 1
+        signature.append(slots[(slot + offset) % _NUM_PERM] + offset * (1 << 32))
+    return tuple(signature)
+
+
+def similarity(a: Sequence[int], b: Sequence[int]) -> float:
+    """Estimate the Jaccard similarity of two documents from their signatures."""
+    return sum(x == y for x, y in zip(a, b)) / len(a) if a and b else 0.0
+
+
+def source_record(url: str, text: str) -> dict:
+    """Describe one retrieved document for the source registry."""
+    return {"url": url, "key": normalize_url(url), "signature": list(minhash(text))}
+
+
+def merge_sources(existing: List[dict], new: List[dict]) -> List[dict]:
+    """State reducer that appends source records whose normalized URL has not been seen."""
+    existing = existing or []
+    seen = {source["key"] for source in existing}
+    merged = list(existing)
+    for source in new or []:
+        if source["key"] not in seen:
+            seen.add(source["key"])
+            merged.append(source)
+    return merged
+
+
+class SourceRegistry:
+    """
+    Canonical sources across all interviews.
+
+    Records are processed in sorted key order, so the outcome does not
+    depend on which interview finished first. A record whose content is a
+    near-duplicate (MinHash similarity above the threshold, found through
+    LSH banding) of an earlier one is folded into it.
+    """
+
+    def __init__(self, sources: List[dict], threshold: Optional[float] = None):
+        threshold = settings.source_dedup_threshold if threshold is None else threshold
+        self.urls: Dict[str, str] = {}
+        self._canonical: Dict[str, str] = {}
+        buckets: Dict[Tuple[int, Tuple[int, ...]], List[dict]] = {}
+        for source in sorted(sources, key=lambda record: record["key"]):
+            key, signature = source["key"], source["signature"]
+            if key in self._canonical:
+                continue
+            bands = [(i, tuple(signature[i:i + _BAND_ROWS])) for i in range(0, len(signature), _BAND_ROWS)]
+            candidates = {c["key"]: c for band in bands for c in buckets.get(band, [])}
+            match = next(
+                (c for c in sorted(candidates.values(), key=lambda record: record["key"])
+                 if similarity(signature, c["signature"]) >= threshold),
+                None
+            )
+            if match is not None:
+                self._canonical[key] = self._canonical[match["key"]]
+                continue
+            self._canonical[key] = key
+            self.urls[key] = source["url"]
+            for band in bands:
+                buckets.setdefault(band, []).append(source)
+
+    def canonical(self, reference: str) -> str:
+        """Return the canonical key for a cited URL or document name."""
+        match = _URL_RE.search(reference)
+        key = normalize_url(match.group(0).rstrip(".,;") if match else reference)
+        return self._canonical.get(key, key)
+
+
+
+def split_sources(section: str) -> Tuple[str, Dict[int, str]]:
+    """Split a section into its body and a ``{local number: reference}`` map of its Sources list."""
+    match = _SOURCES_HEADING_RE.search(section)
+    if match is None:
+        return section, {}
+    references = {}
+    for line in section[match.end():].splitlines():
+        parsed = _SOURCE_LINE_RE.match(line)
+        if parsed:
+            references.setdefault(int(parsed.group(1)), parsed.group(2))
+    return section[:match.start()].rstrip(), references
+
+
+def _numbers(match: re.Match) -> List[int]:
+    return [int(number) for number in match.group(1).split(",")]
+
+
+def _replace_citations(text: str, mapping: Dict[int, int], escape_others: bool = False) -> str:
+    """
+    Rewrite ``[n]``/``[n, m]`` citations through ``mapping``.
+
+    Only a group whose numbers are all in ``mapping`` is a citation; any
+    other bracketed number (``[2024]``, a quoted ``[3, 4]``) keeps its text.
+    With ``escape_others`` it is Markdown-escaped, which renders the same
+    but is no longer matched as a citation when the IDs are renumbered.
+    """
+    def replace(match: re.Match) -> str:
+        numbers = _numbers(match)
+        if not all(number in mapping for number in numbers):
+            return f"\\[{match.group(1)}\\]" if escape_others else match.group(0)
+        ids = sorted(dict.fromkeys(mapping[number] for number in numbers))
+        return "".join(f"[{i}]" for i in ids)
+    return _CITATION_RE.sub(replace, text)
+
+
+def cite_sections(sections: List[str], sources: List[dict]) -> Tuple[List[str], List[dict]]:
+    """
+    Rewrite every section to global citation IDs and drop its own Sources list.
+
+    IDs are assigned in sorted order of the canonical sources actually
+    cited, so they are identical however the interviews were scheduled.
+    Returns the rewritten sections and the citation table
+    ``[{"id": 1, "url": ...}, ...]``.
+    """
+    registry = SourceRegistry(sources)
+    parsed = []
+    cited: Dict[str, str] = {}
+    for section in sections:
+        body, references = split_sources(section)
+        keys = {number: registry.canonical(reference) for number, reference in references.items()}
+        for number, key in keys.items():
+            # Retrieved URL when known, else the smallest citing text (order independent)
+            display = registry.urls.get(key) or min(cited.get(key, references[number]), references[number])
+            cited[key] = display
+        parsed.append((body, keys))
+
+    ids = {key: i for i, key in enumerate(sorted(cited), start=1)}
+    rewritten = [_replace_citations(body, {n: ids[key] for n, key in keys.items()}, escape_others=True) for body, keys in parsed]
+    table = [{"id": ids[key], "url": cited[key]} for key in sorted(cited)]
+    return rewritten, table
+
+
+def renumber_citations(texts: List[str], citations: List[dict]) -> Tuple[List[str], List[dict]]:
+    """
+    Renumber global IDs in order of first appearance across ``texts``.
+
+    Returns the rewritten texts and the table of cited sources in their new
+    order; IDs that never appear in the texts are omitted.
+    """
+    known = {citation["id"]: citation for citation in citations}
+    mapping: Dict[int, int] = {}
+    for text in texts:
+        for match in _CITATION_RE.finditer(text):
+            numbers = _numbers(match)
+            if not all(number in known for number in numbers):
+                continue
+            for number in numbers:
+                if number not in mapping:
+                    mapping[number] = len(mapping) + 1
+    ordered = [{"id": new, "url": known[old]["url"]} for old, new in sorted(mapping.items(), key=lambda item: item[1])]
+    return [_replace_citations(text, mapping) for text in texts], ordered
+
+
+def format_sources(citations: List[dict]) -> str:
+    """Render the citation table as the report's Sources list."""
+    return "\n".join(f"[{citation['id']}] {citation['url']}  " for citation in citations)
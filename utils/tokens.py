@@ -0,0 +1,6 @@
+"""Lightweight token accounting helpers."""
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of model tokens in ``text`` (~4 characters per token for English)."""
+    return (len(text or "") + 3) // 4
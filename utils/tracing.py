@@ -0,0 +1,282 @@
+"""Per-node latency, token and cost instrumentation for graph runs."""
+import json
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from langchain_core.runnables.config import var_child_runnable_config
+
+from config import settings
+
+
+# USD per 1M (prompt, completion) tokens, matched by longest model-name prefix
+MODEL_PRICES = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4.1-nano": (0.10, 0.40),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1": (2.00, 8.00),
+    "o4-mini": (1.10, 4.40),
+    "o3": (2.00, 8.00),
+}
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    """Estimate the USD cost of a call, honouring price overrides from settings."""
+    if settings.prompt_cost_per_1m is not None and settings.completion_cost_per_1m is not None:
+        prompt_price, completion_price = settings.prompt_cost_per_1m, settings.completion_cost_per_1m
+    else:
+        matches = [prefix for prefix in MODEL_PRICES if (model or "").startswith(prefix)]
+        if not matches:
+            return 0.0
+        prompt_price, completion_price = MODEL_PRICES[max(matches, key=len)]
+    return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1_000_000
+
+
+class RunTracer(BaseCallbackHandler):
+    """
+    Callback handler that records one entry per graph node invocation.
+
+    Pass it in the run config (``{"callbacks": [tracer], ...}``) of
+    ``main_builder_graph``; callbacks propagate into the interview subgraph.
+    Each entry records wall time, time spent waiting for a concurrency
+    slot (async path only), prompt/completion tokens and estimated cost,
+    attributed to the node and to the analyst whose interview it ran in.
+    """
+
+    run_inline = True
+
+    def __init__(self):
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+        self._parents: Dict[UUID, Optional[UUID]] = {}
+        self._analysts: Dict[UUID, str] = {}
+        self._nodes: Dict[UUID, dict] = {}
+        self._node_order: list = []
+        self._decisions: list = []
+
+    def _node_for(self, run_id: Optional[UUID]) -> Optional[dict]:
+        """Return the closest enclosing node entry of ``run_id``. Caller holds the lock."""
+        while run_id is not None:
+            node = self._nodes.get(run_id)
+            if node is not None:
+                return node
+            run_id = self._parents.get(run_id)
+        return None
+
+    def _analyst_for(self, run_id: Optional[UUID]) -> Optional[str]:
+        """Return the analyst name of the closest enclosing interview. Caller holds the lock."""
+        while run_id is not None:
+            if run_id in self._analysts:
+                return self._analysts[run_id]
+            run_id = self._parents.get(run_id)
+        return None
+
+    def on_chain_start(self, serialized: Dict[str, Any], inputs: Any, *, run_id: UUID,
+                       parent_run_id: Optional[UUID] = None, metadata: Optional[Dict[str, Any]] = None,
+                       **kwargs: Any) -> None:
+        node_name = (metadata or {}).get("langgraph_node")
+        with self._lock:
+            self._parents[run_id] = parent_run_id
+            analyst = inputs.get("analyst") if isinstance(inputs, dict) else None
+            if analyst is not None and hasattr(analyst, "name"):
+                self._analysts[run_id] = analyst.name
+
+            if node_name is None or kwargs.get("name") != node_name:
+                return
+            # The node's own runnable reports a second start nested in the task run
+            parent = self._nodes.get(parent_run_id)
+            if parent is not None and parent["node"] == node_name:
+                return
+
+            entry = {
+                "node": node_name,
+                "analyst": self._analyst_for(run_id),
+                "start_s": time.perf_counter() - self._start,
+                "wall_time_s": None,
+                "queue_wait_s": 0.0,
+                "llm_calls": 0,
+                "prompt_tokens": 0,
+                "completion_tokens": 0,
+                "cost_usd": 0.0,
+                "error": None,
+            }
+            self._nodes[run_id] = entry
+            self._node_order.append(entry)
+
+    def _finish(self, run_id: UUID, error: Optional[BaseException] = None) -> None:
+        with self._lock:
+            entry = self._nodes.get(run_id)
+            if entry is None:
+                return
+            entry["wall_time_s"] = time.perf_counter() - self._start - entry["start_s"]
+            if error is not None:
+                entry["error"] = repr(error)
+
+    def on_chain_end(self, outputs: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish(run_id)
+
+    def on_chain_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        # GraphInterrupt is raised through the tree on purpose; it is not a failure
+        self._finish(run_id, None if type(error).__name__ == "GraphInterrupt" else error)
+
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages: Any, *, run_id: UUID,
+                            parent_run_id: Optional[UUID] = None, **kwargs: Any) -> None:
+        with self._lock:
+            self._parents[run_id] = parent_run_id
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        prompt_tokens = completion_tokens = 0
+        model = (response.llm_output or {}).get("model_name", settings.openai_model)
+        for generations in response.generations:
+            for generation in generations:
+                message = getattr(generation, "message", None)
+                usage = getattr(message, "usage_metadata", None) or {}
+                prompt_tokens += usage.get("input_tokens", 0)
+                completion_tokens += usage.get("output_tokens", 0)
+                model = (getattr(message, "response_metadata", None) or {}).get("model_name", model)
+
+        with self._lock:
+            entry = self._node_for(run_id)
+            if entry is None:
+                return
+            entry["llm_calls"] += 1
+            entry["prompt_tokens"] += prompt_tokens
+            entry["completion_tokens"] += completion_tokens
+            entry["cost_usd"] += estimate_cost(model, prompt_tokens, completion_tokens)
+
+    def record_queue_wait(self, run_id: Optional[UUID], seconds: float) -> None:
+        """Add time spent waiting for a concurrency slot to the node enclosing ``run_id``."""
+        with self._lock:
+            entry = self._node_for(run_id)
+            if entry is not None:
+                entry["queue_wait_s"] += seconds
+
+    def record_interview_decision(self, decision: dict) -> None:
+        """Record one adaptive-stopping decision of an interview."""
+        with self._lock:
+            self._decisions.append(decision)
+
+    def merge(self, trace: dict) -> None:
+        """Add the nodes and decisions of a trace recorded in another process (``to_dict`` output)."""
+        offset = datetime.fromisoformat(trace["started_at"]).timestamp() - self.started_at
+        with self._lock:
+            for entry in trace["nodes"]:
+                self._node_order.append(dict(entry, start_s=entry["start_s"] + offset))
+            self._decisions.extend(trace["interview_decisions"])
+
+    @staticmethod
+    def _aggregate(entries: list, key: str) -> Dict[str, dict]:
+        totals = defaultdict(lambda: {"calls": 0, "wall_time_s": 0.0, "queue_wait_s": 0.0,
+                                      "prompt_tokens": 0, "completion_tokens": 0, "cost_usd": 0.0})
+        for entry in entries:
+            group = entry[key]
+            if group is None:
+                continue
+            total = totals[group]
+            total["calls"] += 1
+            total["wall_time_s"] += entry["wall_time_s"] or 0.0
+            for field in ("queue_wait_s", "prompt_tokens", "completion_tokens", "cost_usd"):
+                total[field] += entry[field]
+        return dict(totals)
+
+    def to_dict(self) -> dict:
+        """Return the full trace with per-node and per-analyst aggregates."""
+        with self._lock:
+            entries = [dict(entry) for entry in self._node_order]
+            decisions = list(self._decisions)
+        # Nested graph nodes (e.g. conduct_interviews) would double count their children
+        leaves = [entry for entry in entries if entry["node"] != "conduct_interviews"]
+        return {
+            "started_at": datetime.fromtimestamp(self.started_at).isoformat(),
+            "wall_time_s": time.perf_counter() - self._start,
+            "model": settings.openai_model,
+            "nodes": entries,
+            "by_node": self._aggregate(entries, "node"),
+            "by_analyst": self._aggregate(leaves, "analyst"),
+            "totals": {
+                "llm_calls": sum(entry["llm_calls"] for entry in leaves),
+                "prompt_tokens": sum(entry["prompt_tokens"] for entry in leaves),
+                "completion_tokens": sum(entry["completion_tokens"] for entry in leaves),
+                "cost_usd": sum(entry["cost_usd"] for entry in leaves),
+            },
+            "interview_decisions": decisions,
+            "early_stops": {
+                "interviews": sum(decision["decision"] == "stop" for decision in decisions),
+                "turns_saved": sum(decision["turns_saved"] for decision in decisions),
+            },
+        }
+
+    def save(self, path: str) -> None:
+        """Write the trace as JSON to ``path``."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def summary_table(self) -> str:
+        """Return a plain-text table of per-node totals, slowest first."""
+        trace = self.to_dict()
+        header = f"{'node':<22}{'calls':>6}{'wall s':>10}{'wait s':>10}{'prompt':>10}{'compl':>10}{'cost $':>10}"
+        lines = [header, "-" * len(header)]
+        for node, total in sorted(trace["by_node"].items(), key=lambda item: -item[1]["wall_time_s"]):
+            lines.append(
+                f"{node:<22}{total['calls']:>6}{total['wall_time_s']:>10.2f}{total['queue_wait_s']:>10.2f}"
+                f"{total['prompt_tokens']:>10}{total['completion_tokens']:>10}{total['cost_usd']:>10.4f}"
+            )
+        totals = trace["totals"]
+        lines.append("-" * len(header))
+        lines.append(
+            f"{'total':<22}{'':>6}{trace['wall_time_s']:>10.2f}{'':>10}"
+            f"{totals['prompt_tokens']:>10}{totals['completion_tokens']:>10}{totals['cost_usd']:>10.4f}"
+        )
+        lines.append(f"LLM calls: {totals['llm_calls']}")
+        early_stops = trace["early_stops"]
+        if early_stops["interviews"]:
+            lines.append(f"Interviews ended early: {early_stops['interviews']} ({early_stops['turns_saved']} turns saved)")
+        return "\n".join(lines)
+
+
+def record_queue_wait(seconds: float) -> None:
+    """Report a concurrency-slot wait to every ``RunTracer`` attached to the current run."""
+    config = var_child_runnable_config.get()
+    if not config:
+        return
+    callbacks = config.get("callbacks")
+    handlers = getattr(callbacks, "handlers", None) or []
+    run_id = getattr(callbacks, "parent_run_id", None)
+    for handler in handlers:
+        if isinstance(handler, RunTracer):
+            handler.record_queue_wait(run_id, seconds)
+
+
+def record_interview_decision(analyst: str, turn: int, gain: Optional[float], decision: str, turns_saved: int) -> None:
+    """Report an interview stopping decision to every ``RunTracer`` attached to the current run."""
+    config = var_child_runnable_config.get()
+    if not config:
+        return
+    handlers = getattr(config.get("callbacks"), "handlers", None) or []
+    for handler in handlers:
+        if isinstance(handler, RunTracer):
+            handler.record_interview_decision({
+                "analyst": analyst,
+                "turn": turn,
+                "information_gain": gain,
+                "decision": decision,
+                "turns_saved": turns_saved,
+            })
+
+
+def merge_trace(trace: dict) -> None:
+    """Merge a trace recorded in another process into every ``RunTracer`` attached to the current run."""
+    config = var_child_runnable_config.get()
+    if not config:
+        return
+    handlers = getattr(config.get("callbacks"), "handlers", None) or []
+    for handler in handlers:
+        if isinstance(handler, RunTracer):
+            handler.merge(trace)
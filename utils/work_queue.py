@@ -0,0 +1,146 @@
+"""Durable SQLite work queue shared by a coordinator and worker processes."""
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Optional, Tuple
+
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from utils.checkpointing import ALLOWED_STATE_MODELS
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id TEXT PRIMARY KEY,
+    payload_type TEXT NOT NULL,
+    payload BLOB NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    worker TEXT,
+    lease_until REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    result_type TEXT,
+    result BLOB,
+    error TEXT,
+    created_at REAL NOT NULL
+)
+"""
+
+
+class TaskFailed(RuntimeError):
+    """A queued task failed on every allowed attempt."""
+
+
+class WorkQueue:
+    """
+    At-least-once task queue in one SQLite file.
+
+    ``put`` is idempotent on the task ID, so a coordinator that restarts
+    (e.g. a run resumed from its checkpoint) picks up the task it already
+    queued instead of running it twice. Workers ``claim`` a task under a
+    lease and keep it alive with ``renew``; a task whose worker died is
+    claimed again once its lease expires, up to ``max_attempts`` times.
+    Payloads and results are serialized like checkpoints, so messages and
+    ``Analyst`` models survive the trip.
+    """
+
+    def __init__(self, path: str, lease_seconds: float = 120, max_attempts: int = 3):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._serde = JsonPlusSerializer(allowed_msgpack_modules=ALLOWED_STATE_MODELS)
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def _execute(self, sql: str, params: tuple = ()) -> list:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def put(self, task_id: str, payload: Any) -> None:
+        """Queue ``payload`` under ``task_id`` unless a task with that ID already exists."""
+        payload_type, data = self._serde.dumps_typed(payload)
+        self._execute(
+            "INSERT OR IGNORE INTO tasks (id, payload_type, payload, created_at) VALUES (?, ?, ?, ?)",
+            (task_id, payload_type, data, time.time()),
+        )
+
+    def claim(self, worker: str) -> Optional[Tuple[str, Any]]:
+        """Lease the oldest runnable task to ``worker``; returns ``(task_id, payload)`` or None."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Tasks whose worker disappeared and that have no attempts left
+                self._conn.execute(
+                    "UPDATE tasks SET status = 'failed', error = COALESCE(error, 'worker lease expired') "
+                    "WHERE status = 'running' AND lease_until < ? AND attempts >= ?",
+                    (now, self.max_attempts),
+                )
+                row = self._conn.execute(
+                    "SELECT id, payload_type, payload FROM tasks "
+                    "WHERE status = 'pending' OR (status = 'running' AND lease_until < ?) "
+                    "ORDER BY created_at LIMIT 1",
+                    (now,),
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE tasks SET status = 'running', worker = ?, lease_until = ?, attempts = attempts + 1 WHERE id = ?",
+                        (worker, now + self.lease_seconds, row[0]),
+                    )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        if row is None:
+            return None
+        return row[0], self._serde.loads_typed((row[1], row[2]))
+
+    def renew(self, task_id: str, worker: str) -> None:
+        """Extend the lease of a task the worker is still running."""
+        self._execute(
+            "UPDATE tasks SET lease_until = ? WHERE id = ? AND worker = ? AND status = 'running'",
+            (time.time() + self.lease_seconds, task_id, worker),
+        )
+
+    def complete(self, task_id: str, result: Any) -> None:
+        result_type, data = self._serde.dumps_typed(result)
+        self._execute(
+            "UPDATE tasks SET status = 'done', result_type = ?, result = ?, lease_until = NULL WHERE id = ?",
+            (result_type, data, task_id),
+        )
+
+    def fail(self, task_id: str, error: str) -> None:
+        """Record a failed attempt; the task is retried until it runs out of attempts."""
+        self._execute(
+            "UPDATE tasks SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+            "error = ?, lease_until = NULL WHERE id = ?",
+            (self.max_attempts, error, task_id),
+        )
+
+    def poll(self, task_id: str) -> Tuple[bool, Any]:
+        """
+        Return ``(True, result)`` and remove the task once it is done, else ``(False, None)``.
+
+        Raises ``TaskFailed`` (and removes the task) when it failed for good,
+        and ``KeyError`` when no such task exists.
+        """
+        rows = self._execute("SELECT status, result_type, result, error FROM tasks WHERE id = ?", (task_id,))
+        if not rows:
+            raise KeyError(task_id)
+        status, result_type, result, error = rows[0]
+        if status == "done":
+            self._execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+            return True, self._serde.loads_typed((result_type, result))
+        if status == "failed":
+            self._execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+            raise TaskFailed(f"task {task_id} failed: {error}")
+        return False, None
+
+    def counts(self) -> dict:
+        """Number of tasks per status."""
+        return dict(self._execute("SELECT status, COUNT(*) FROM tasks GROUP BY status"))